@@ -108,9 +108,7 @@ async def legacy_process_natural_language_query(request: QueryRequest):
             financial_service, llm_model=llm_model, llm_temperature=llm_temperature
         )
 
-        response = ai_query_service.process_query(request.query)
-        response.note = "This is a legacy endpoint. Use /api/ai/query for the new API."
-        return response
+        return ai_query_service.process_query(request.query)
     except Exception as e:
         logger.error(f"Error processing query: {e}")
         raise HTTPException(status_code=500, detail="Error processing query")
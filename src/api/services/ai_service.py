@@ -56,13 +56,21 @@ async def process_ai_query(
         )
 
         # Get AI handler and process query with database-based interaction
+        # V2 queries go through the batching window to share LLM calls
         ai_handler = get_ai_handler()
-        query_response = ai_handler.process_query(
-            query=request.query,
-            chat_id=request.chat_id,
-            user_id=request.user_id,
-            use_v2=use_v2,
-        )
+        if use_v2:
+            query_response = await ai_handler.submit_query(
+                query=request.query,
+                chat_id=request.chat_id,
+                user_id=request.user_id,
+            )
+        else:
+            query_response = ai_handler.process_query(
+                query=request.query,
+                chat_id=request.chat_id,
+                user_id=request.user_id,
+                use_v2=use_v2,
+            )
 
         query_response_time = (datetime.now() - query_start_time).total_seconds()
         system_logger.log_api_request(
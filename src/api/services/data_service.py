@@ -89,7 +89,14 @@ async def list_transactions(
             language=language,
         )
 
-        return TransactionListResponse(**result)
+        # Rows come from our own store, so skip per-row validation
+        return TransactionListResponse.model_construct(
+            data=[TransactionResponse.from_trusted_row(row) for row in result["data"]],
+            total_count=result["total_count"],
+            limit=result.get("limit"),
+            offset=result.get("offset"),
+            has_more=result["has_more"],
+        )
 
     except Exception as e:
         logger.error(f"Error in list_transactions: {e}")
@@ -114,7 +121,7 @@ async def get_transaction(
         if not result["data"]:
             raise HTTPException(status_code=404, detail="Transaction not found")
 
-        return TransactionResponse(**result["data"][0])
+        return TransactionResponse.from_trusted_row(result["data"][0])
 
     except HTTPException:
         raise
@@ -214,8 +221,8 @@ async def get_enhanced_transaction_aggregate(
         else:
             enhanced_group_by = request.group_by
 
-        # Use the enhanced aggregate query method
-        result = db.query_transactions_aggregate(
+        # Use the enhanced aggregate query method (cached, with roll-up reuse)
+        result = financial_handler.query_transactions_aggregate(
             filters=parsed_filters,
             group_by=enhanced_group_by,
             aggregates=parsed_aggregates,
@@ -242,7 +249,7 @@ async def get_enhanced_transaction_aggregate(
             ),
         }
 
-        return EnhancedAggregateResponse(**enhanced_result)
+        return EnhancedAggregateResponse.model_validate(enhanced_result)
 
     except Exception as e:
         logger.error(f"Error in get_enhanced_transaction_aggregate: {e}")
@@ -330,21 +337,8 @@ async def get_grouped_metrics(request: GroupedMetricsRequest):
             limit=request.limit,
         )
 
-        # Convert to response objects
-        response_objects = []
-        for result in results:
-            response_objects.append(
-                GroupedMetricsResponse(
-                    group_value=result["group_value"],
-                    aggregation_type=result["aggregation_type"],
-                    aggregated_value=result["aggregated_value"],
-                    record_count=result["record_count"],
-                    group_by_field=result["group_by_field"],
-                )
-            )
-
-        logger.info(f"Returning {len(response_objects)} grouped metrics")
-        return response_objects
+        logger.info(f"Returning {len(results)} grouped metrics")
+        return results
 
     except ValueError as e:
         logger.error(f"Validation error in grouped metrics request: {e}")
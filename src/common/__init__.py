@@ -22,6 +22,8 @@ from .enums import (
 )
 from .constants import FileNames, Defaults
 from .enum_converter import EnumConverter, enum_converter
+from .json_codec import json_dumps, json_loads
+from .date_utils import parse_iso_datetime
 
 __all__ = [
     # Logger
@@ -46,4 +48,9 @@ __all__ = [
     # Enum Converter
     "EnumConverter",
     "enum_converter",
+    # JSON
+    "json_dumps",
+    "json_loads",
+    # Dates
+    "parse_iso_datetime",
 ]
@@ -0,0 +1,18 @@
+"""
+Date Utilities
+Shared date and timestamp parsing helpers
+"""
+
+from datetime import datetime
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4096)
+def parse_iso_datetime(value: str) -> datetime:
+    """
+    Parse an ISO 8601 timestamp string
+
+    Results are cached because the same stored chat timestamps are re-read on
+    every history fetch; datetime objects are immutable, so sharing them is safe.
+    """
+    return datetime.fromisoformat(value)
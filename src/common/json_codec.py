@@ -0,0 +1,29 @@
+"""
+JSON Codec
+Fast JSON encoding and decoding with orjson, falling back to the standard library
+"""
+
+import json
+from typing import Any, Union
+
+# orjson is optional; without it the standard library produces the same compact output
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:  # pragma: no cover - environment specific
+    ORJSON_AVAILABLE = False
+
+
+def json_dumps(obj: Any) -> str:
+    """Serialize to a compact JSON string"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON string or bytes; raises json.JSONDecodeError on invalid input"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
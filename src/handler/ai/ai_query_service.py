@@ -6,7 +6,7 @@ Implements intelligent query processing with database-backed conversation manage
 import json
 import logging
 import traceback
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass
 
@@ -17,6 +17,8 @@ from .real_llm_service import FinancialLLMService
 
 logger = logging.getLogger(__name__)
 
+SEPARATOR = "=" * 70
+
 
 @dataclass
 class ConversationContext:
@@ -191,6 +193,66 @@ class AIQueryService:
         """Get conversation history for a specific chat"""
         return self.conversation_db.get_recent_messages(chat_id, limit=20)
 
+    def get_saved_turn(self, chat_id: str, answer: str) -> Optional[ChatMessage]:
+        """
+        Get the assistant message saved for an answer, if it is the latest
+        turn of the chat
+
+        Args:
+            chat_id: Chat the answer was given in
+            answer: Answer text of the turn
+
+        Returns:
+            The assistant ChatMessage, or None if the chat has moved on
+        """
+        # A turn's two messages can share a timestamp, so look at both
+        for message in self.conversation_db.chat_store.get_messages(chat_id, limit=2):
+            if message.message_type == "assistant" and message.content == answer:
+                return message
+        return None
+
+    def record_turn(
+        self,
+        query: str,
+        answer: str,
+        data_points: List[Dict],
+        intent: Optional[str] = None,
+        summary: Optional[str] = None,
+        chat_id: str = None,
+        user_id: str = None,
+    ) -> str:
+        """
+        Save a query and an answer produced without the LLM (e.g. a cached
+        response) as a conversation turn
+
+        Args:
+            query: Natural language query from user
+            answer: Answer returned for it
+            data_points: Data points returned with the answer
+            intent: Intent of the original turn
+            summary: Context summary of the original turn
+            chat_id: Optional chat session ID; a session is created when omitted
+            user_id: Optional user ID
+
+        Returns:
+            chat_id the turn was saved to
+        """
+        chat_id = self._setup_chat_session(chat_id, user_id)
+        intent_data = {"intent": intent or "general"}
+        token_count = self._estimate_and_store_tokens(query, answer)
+        self._store_conversation_messages(
+            chat_id,
+            query,
+            answer,
+            intent_data,
+            data_points or [],
+            token_count,
+            answer,
+            summary,
+        )
+        self._update_context_summary(chat_id, intent_data, query)
+        return chat_id
+
     def clear_conversation_context(self, chat_id: str = None):
         """Clear conversation context"""
         self.conversation_db.chat_store.clear_chat_messages(chat_id)
@@ -229,96 +291,26 @@ class AIQueryService:
         try:
             logger.info(f"Processing query with Two-API architecture: {query[:50]}...")
 
-            # 1. Setup chat session
-            chat_id = self._setup_chat_session(chat_id, user_id)
-
-            # Get conversation history (get more, let query_generator manage token limits)
-            conversation_history = self.conversation_db.get_conversation_summaries(
-                chat_id, limit=20
-            )
+            # 1. Setup chat session and load conversation history
+            chat_id, conversation_history = self._prepare_query(chat_id, user_id)
 
             # 2. FIRST API CALL: Generate SQL query
-            separator = "=" * 70
-            logger.info(f"{separator}\nFIRST API CALL: Query Generation\n{separator}")
+            logger.info(f"{SEPARATOR}\nFIRST API CALL: Query Generation\n{SEPARATOR}")
 
             intent_result = self.query_generator.analyze_and_generate_query(
                 user_query=query, conversation_history=conversation_history
             )
 
-            logger.info(
-                f"Intent: {intent_result.get('intent')}\n"
-                f"Confidence: {intent_result.get('confidence')}\n"
-                f"SQL: {intent_result.get('sql_query', 'None')}"
+            # 3-5. Validate and execute the generated SQL
+            early_response, sql_query, query_results = self._execute_generated_query(
+                query, chat_id, intent_result
             )
-
-            # 3. Check if modification attempt
-            if intent_result.get("is_modification"):
-                return QueryResponse(
-                    query=query,
-                    answer="I can only retrieve and analyze data, not modify it. Please rephrase your query as a question about the financial data.",
-                    confidence=1.0,
-                    data_points=[],
-                    insights=["Data modification operations are not permitted"],
-                    timestamp=datetime.now().isoformat(),
-                    chat_id=chat_id,
-                )
-
-            # Get SQL query
-            sql_query = intent_result.get("sql_query")
-
-            if not sql_query or not intent_result.get("is_data_retrieval"):
-                return QueryResponse(
-                    query=query,
-                    answer="I couldn't generate a database query for your request. Could you please rephrase your question or provide more details?",
-                    confidence=0.5,
-                    data_points=[],
-                    insights=[],
-                    timestamp=datetime.now().isoformat(),
-                    chat_id=chat_id,
-                )
-
-            # 4. Validate SQL
-            logger.info("Validating SQL query...")
-            is_valid, error_msg = self.sql_validator.validate_query(sql_query)
-
-            if not is_valid:
-                logger.error(f"SQL validation failed: {error_msg}")
-                return QueryResponse(
-                    query=query,
-                    answer=f"The generated query failed safety validation: {error_msg}. Please try rephrasing your question.",
-                    confidence=0.5,
-                    data_points=[],
-                    insights=[],
-                    timestamp=datetime.now().isoformat(),
-                    chat_id=chat_id,
-                )
-
-            # Sanitize query (add LIMIT if missing)
-            sql_query = self.sql_validator.sanitize_query(sql_query)
-            logger.info(f"SQL validated and sanitized: {sql_query[:100]}...")
-
-            # 5. Execute query
-            logger.info("Executing SQL query...")
-            try:
-                query_results = self.query_executor.execute_read_query(sql_query)
-                logger.info(
-                    f"Query executed successfully: {len(query_results)} results"
-                )
-            except Exception as e:
-                logger.error(f"Query execution error: {e}")
-                return QueryResponse(
-                    query=query,
-                    answer=self.response_formatter.format_error_response(str(e), query),
-                    confidence=0.3,
-                    data_points=[],
-                    insights=[],
-                    timestamp=datetime.now().isoformat(),
-                    chat_id=chat_id,
-                )
+            if early_response:
+                return early_response
 
             # 6. SECOND API CALL: Format response (returns response + context summary)
             logger.info(
-                f"{separator}\nSECOND API CALL: Response Formatting\n{separator}"
+                f"{SEPARATOR}\nSECOND API CALL: Response Formatting\n{SEPARATOR}"
             )
 
             formatted_response, context_summary = (
@@ -331,69 +323,310 @@ class AIQueryService:
                 )
             )
 
-            logger.info(f"Response formatted ({len(formatted_response)} chars)")
-            logger.info(f"Context summary: {context_summary[:100]}...")
-
-            # 7. Extract insights
-            insights = self._extract_insights_from_results(
-                query_results, intent_result.get("intent")
-            )
-
-            # 8. Save to conversation history with LLM-generated context summary
-            token_count = self._estimate_and_store_tokens(query, formatted_response)
-            self._store_conversation_messages(
-                chat_id,
+            # 7-9. Store conversation and build response
+            return self._finalize_query(
                 query,
-                formatted_response,
+                chat_id,
                 intent_result,
-                query_results[:5],
-                token_count,
+                sql_query,
+                query_results,
                 formatted_response,
                 context_summary,
+                start_time,
             )
 
-            # Update context summary
-            self._update_context_summary(chat_id, intent_result, query)
+        except Exception as e:
+            return self._handle_two_api_error(query, e, chat_id, start_time)
+
+    def process_batch(
+        self, queries: List[Tuple[str, Optional[str], Optional[str]]]
+    ) -> List[QueryResponse]:
+        """
+        Process several queries with one batched LLM request per API call
 
-            # 9. Create and return response
-            response_time = (datetime.now() - start_time).total_seconds()
-            logger.info(f"Two-API query completed in {response_time:.2f} seconds")
+        Args:
+            queries: List of (query, chat_id, user_id) tuples
 
-            response = self._create_query_response(
-                query,
-                formatted_response,
-                intent_result,
-                query_results[:10],
-                insights,
-                chat_id,
+        Returns:
+            List of QueryResponse objects in the same order as queries
+        """
+        start_time = datetime.now()
+        responses: List[Optional[QueryResponse]] = [None] * len(queries)
+        states = []
+
+        logger.info(f"Processing batch of {len(queries)} queries")
+
+        # Setup sessions; a failure only affects its own query
+        for index, (query, chat_id, user_id) in enumerate(queries):
+            try:
+                chat_id, conversation_history = self._prepare_query(chat_id, user_id)
+                states.append((index, query, chat_id, conversation_history))
+            except Exception as e:
+                responses[index] = self._handle_two_api_error(
+                    query, e, chat_id, start_time
+                )
+
+        # FIRST API CALL for all queries at once
+        intent_results = self.query_generator.analyze_and_generate_queries(
+            [(query, history) for _, query, _, history in states]
+        )
+
+        pending = []
+        for (index, query, chat_id, history), intent_result in zip(
+            states, intent_results
+        ):
+            try:
+                early_response, sql_query, query_results = (
+                    self._execute_generated_query(query, chat_id, intent_result)
+                )
+                if early_response:
+                    responses[index] = early_response
+                else:
+                    pending.append(
+                        (
+                            index,
+                            query,
+                            chat_id,
+                            history,
+                            intent_result,
+                            sql_query,
+                            query_results,
+                        )
+                    )
+            except Exception as e:
+                responses[index] = self._handle_two_api_error(
+                    query, e, chat_id, start_time
+                )
+
+        # SECOND API CALL for all queries that returned data
+        formatted = self.response_formatter.format_responses(
+            [
+                (
+                    query,
+                    sql_query,
+                    query_results,
+                    intent_result.get("intent", "general"),
+                    history,
+                )
+                for _, query, _, history, intent_result, sql_query, query_results in pending
+            ]
+        )
+
+        for item, (formatted_response, context_summary) in zip(pending, formatted):
+            index, query, chat_id, _, intent_result, sql_query, query_results = item
+            try:
+                responses[index] = self._finalize_query(
+                    query,
+                    chat_id,
+                    intent_result,
+                    sql_query,
+                    query_results,
+                    formatted_response,
+                    context_summary,
+                    start_time,
+                )
+            except Exception as e:
+                responses[index] = self._handle_two_api_error(
+                    query, e, chat_id, start_time
+                )
+
+        return responses
+
+    def _prepare_query(
+        self, chat_id: str = None, user_id: str = None
+    ) -> Tuple[str, List[str]]:
+        """Setup chat session and return (chat_id, conversation_history)"""
+        chat_id = self._setup_chat_session(chat_id, user_id)
+
+        # Get conversation history (get more, let query_generator manage token limits)
+        conversation_history = self.conversation_db.get_conversation_summaries(
+            chat_id, limit=20
+        )
+        return chat_id, conversation_history
+
+    def _execute_generated_query(
+        self, query: str, chat_id: str, intent_result: Dict
+    ) -> Tuple[Optional[QueryResponse], Optional[str], List[Dict]]:
+        """
+        Validate and execute the SQL produced by the first API call
+
+        Returns:
+            Tuple of (early_response, sql_query, query_results); early_response
+            is set when the query cannot proceed to response formatting
+        """
+        logger.info(
+            f"Intent: {intent_result.get('intent')}\n"
+            f"Confidence: {intent_result.get('confidence')}\n"
+            f"SQL: {intent_result.get('sql_query', 'None')}"
+        )
+
+        # Check if modification attempt
+        if intent_result.get("is_modification"):
+            return (
+                self._create_simple_response(
+                    query,
+                    "I can only retrieve and analyze data, not modify it. Please rephrase your query as a question about the financial data.",
+                    1.0,
+                    chat_id,
+                    insights=["Data modification operations are not permitted"],
+                ),
+                None,
+                [],
             )
 
-            system_logger.log_api_request(
-                method="TWO_API",
-                endpoint="/api/ai/query/v2",
-                status_code=200,
-                response_time=response_time,
-                extra={
-                    "intent": intent_result.get("intent"),
-                    "sql_query": sql_query[:100],
-                    "result_count": len(query_results),
-                    "confidence": intent_result.get("confidence"),
-                },
+        # Get SQL query
+        sql_query = intent_result.get("sql_query")
+
+        if not sql_query or not intent_result.get("is_data_retrieval"):
+            return (
+                self._create_simple_response(
+                    query,
+                    "I couldn't generate a database query for your request. Could you please rephrase your question or provide more details?",
+                    0.5,
+                    chat_id,
+                ),
+                None,
+                [],
             )
 
-            return response
+        # Validate SQL
+        logger.info("Validating SQL query...")
+        is_valid, error_msg = self.sql_validator.validate_query(sql_query)
+
+        if not is_valid:
+            logger.error(f"SQL validation failed: {error_msg}")
+            return (
+                self._create_simple_response(
+                    query,
+                    f"The generated query failed safety validation: {error_msg}. Please try rephrasing your question.",
+                    0.5,
+                    chat_id,
+                ),
+                None,
+                [],
+            )
 
-        except Exception as e:
-            response_time = (datetime.now() - start_time).total_seconds()
-            logger.error(f"Error in Two-API query processing: {e}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
+        # Sanitize query (add LIMIT if missing)
+        sql_query = self.sql_validator.sanitize_query(sql_query)
+        logger.info(f"SQL validated and sanitized: {sql_query[:100]}...")
 
-            system_logger.api_error(
-                f"Two-API query error: {e}",
-                {"query": query, "response_time": response_time, "error": str(e)},
+        # Execute query
+        logger.info("Executing SQL query...")
+        try:
+            query_results = self.query_executor.execute_read_query(sql_query)
+            logger.info(f"Query executed successfully: {len(query_results)} results")
+        except Exception as e:
+            logger.error(f"Query execution error: {e}")
+            return (
+                self._create_simple_response(
+                    query,
+                    self.response_formatter.format_error_response(str(e), query),
+                    0.3,
+                    chat_id,
+                ),
+                sql_query,
+                [],
             )
 
-            return self._handle_query_error(query, e, chat_id, "two_api")
+        return None, sql_query, query_results
+
+    def _finalize_query(
+        self,
+        query: str,
+        chat_id: str,
+        intent_result: Dict,
+        sql_query: str,
+        query_results: List[Dict],
+        formatted_response: str,
+        context_summary: str,
+        start_time: datetime,
+    ) -> QueryResponse:
+        """Store the conversation turn and build the final QueryResponse"""
+        logger.info(f"Response formatted ({len(formatted_response)} chars)")
+        logger.info(f"Context summary: {context_summary[:100]}...")
+
+        # Extract insights
+        insights = self._extract_insights_from_results(
+            query_results, intent_result.get("intent")
+        )
+
+        # Save to conversation history with LLM-generated context summary
+        token_count = self._estimate_and_store_tokens(query, formatted_response)
+        self._store_conversation_messages(
+            chat_id,
+            query,
+            formatted_response,
+            intent_result,
+            query_results[:5],
+            token_count,
+            formatted_response,
+            context_summary,
+        )
+
+        # Update context summary
+        self._update_context_summary(chat_id, intent_result, query)
+
+        # Create and return response
+        response_time = (datetime.now() - start_time).total_seconds()
+        logger.info(f"Two-API query completed in {response_time:.2f} seconds")
+
+        response = self._create_query_response(
+            query,
+            formatted_response,
+            intent_result,
+            query_results[:10],
+            insights,
+            chat_id,
+        )
+
+        system_logger.log_api_request(
+            method="TWO_API",
+            endpoint="/api/ai/query/v2",
+            status_code=200,
+            response_time=response_time,
+            extra={
+                "intent": intent_result.get("intent"),
+                "sql_query": sql_query[:100],
+                "result_count": len(query_results),
+                "confidence": intent_result.get("confidence"),
+            },
+        )
+
+        return response
+
+    def _create_simple_response(
+        self,
+        query: str,
+        answer: str,
+        confidence: float,
+        chat_id: str,
+        insights: List[str] = None,
+    ) -> QueryResponse:
+        """Create a QueryResponse without data points"""
+        return QueryResponse(
+            query=query,
+            answer=answer,
+            confidence=confidence,
+            data_points=[],
+            insights=insights or [],
+            timestamp=datetime.now().isoformat(),
+            chat_id=chat_id,
+        )
+
+    def _handle_two_api_error(
+        self, query: str, error: Exception, chat_id: str, start_time: datetime
+    ) -> QueryResponse:
+        """Log a Two-API processing error and build the error response"""
+        response_time = (datetime.now() - start_time).total_seconds()
+        logger.error(f"Error in Two-API query processing: {error}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+
+        system_logger.api_error(
+            f"Two-API query error: {error}",
+            {"query": query, "response_time": response_time, "error": str(error)},
+        )
+
+        return self._handle_query_error(query, error, chat_id, "two_api")
 
     def _setup_chat_session(self, chat_id: str = None, user_id: str = None) -> str:
         """Setup chat session and return chat_id"""
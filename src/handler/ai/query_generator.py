@@ -5,13 +5,17 @@ Analyzes user intent and generates SQL query using database schema
 
 import json
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from .database_schema_provider import DatabaseSchemaProvider
 from .token_manager import TokenManager
 from .llm_templates import SQL_GENERATION_PROMPT
 
 logger = logging.getLogger(__name__)
 
+SQL_GENERATION_CONTEXT = (
+    "You are an expert SQL query generator for financial databases."
+)
+
 
 class IntentAndQueryGenerator:
     """First LLM call: Analyze intent and generate SQL query from schema"""
@@ -52,33 +56,18 @@ class IntentAndQueryGenerator:
                 f"[FIRST API CALL] Generating SQL for query: {user_query[:50]}..."
             )
 
-            # Get database schema
-            schema = self.schema_provider.get_schema_json()
-
-            # Format conversation history
-            history_context = self._format_history(conversation_history or [])
-
             # Create prompt for SQL generation
-            prompt = self._create_sql_generation_prompt(
-                user_query, schema, history_context
+            prompt = self._build_prompt(
+                user_query, self.schema_provider.get_schema_json(), conversation_history
             )
 
             # Call LLM
             logger.info("Calling LLM for SQL generation...")
             llm_response = self.llm_service.get_response(
-                prompt=prompt,
-                context="You are an expert SQL query generator for financial databases.",
+                prompt=prompt, context=SQL_GENERATION_CONTEXT
             )
 
-            logger.info(f"OK LLM Response received: {llm_response.answer[:200]}...")
-
-            # Parse LLM response
-            result = self._parse_llm_response(llm_response.answer, user_query)
-
-            logger.info(f"OK Intent detected: {result.get('intent')}")
-            logger.info(f"OK SQL generated: {result.get('sql_query', 'None')[:100]}...")
-
-            return result
+            return self._handle_llm_answer(llm_response.answer, user_query)
 
         except Exception as e:
             logger.error(f"Error in query generation: {e}")
@@ -87,14 +76,75 @@ class IntentAndQueryGenerator:
             import traceback
 
             logger.error(f"Traceback: {traceback.format_exc()}")
-            return {
-                "intent": "general",
-                "is_data_retrieval": False,
-                "is_modification": False,
-                "sql_query": None,
-                "reasoning": f"Failed to generate query: {str(e)}",
-                "confidence": 0.0,
-            }
+            return self._create_error_result(e)
+
+    def analyze_and_generate_queries(
+        self, requests: List[Tuple[str, Optional[List[str]]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Batched first API call: generate SQL for several queries in one LLM request
+
+        Args:
+            requests: List of (user_query, conversation_history) tuples
+
+        Returns:
+            List of result dictionaries in the same order as requests
+        """
+        if not requests:
+            return []
+
+        try:
+            logger.info(
+                f"[FIRST API CALL] Generating SQL for batch of {len(requests)} queries..."
+            )
+
+            schema = self.schema_provider.get_schema_json()
+            prompts = [
+                self._build_prompt(user_query, schema, history)
+                for user_query, history in requests
+            ]
+
+            llm_responses = self.llm_service.get_batch_responses(
+                prompts, context=SQL_GENERATION_CONTEXT
+            )
+
+            return [
+                self._handle_llm_answer(llm_response.answer, user_query)
+                for (user_query, _), llm_response in zip(requests, llm_responses)
+            ]
+
+        except Exception as e:
+            logger.error(f"Error in batched query generation: {e}")
+            return [self._create_error_result(e) for _ in requests]
+
+    def _build_prompt(
+        self, user_query: str, schema: str, conversation_history: List[str] = None
+    ) -> str:
+        """Format history and build the SQL generation prompt for one query"""
+        history_context = self._format_history(conversation_history or [])
+        return self._create_sql_generation_prompt(user_query, schema, history_context)
+
+    def _handle_llm_answer(self, llm_answer: str, user_query: str) -> Dict[str, Any]:
+        """Parse a raw LLM answer into the generation result"""
+        logger.info(f"OK LLM Response received: {llm_answer[:200]}...")
+
+        result = self._parse_llm_response(llm_answer, user_query)
+
+        logger.info(f"OK Intent detected: {result.get('intent')}")
+        logger.info(f"OK SQL generated: {str(result.get('sql_query'))[:100]}...")
+
+        return result
+
+    def _create_error_result(self, error: Exception) -> Dict[str, Any]:
+        """Result returned when query generation fails"""
+        return {
+            "intent": "general",
+            "is_data_retrieval": False,
+            "is_modification": False,
+            "sql_query": None,
+            "reasoning": f"Failed to generate query: {str(error)}",
+            "confidence": 0.0,
+        }
 
     def _create_sql_generation_prompt(
         self, user_query: str, schema: str, history_context: str
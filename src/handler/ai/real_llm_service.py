@@ -9,7 +9,7 @@ from dataclasses import dataclass
 from abc import ABC, abstractmethod
 
 try:
-    from langchain_openai import AzureChatOpenAI
+    from langchain_openai import AzureChatOpenAI, AzureOpenAIEmbeddings
 
     AZURE_AVAILABLE = True
 except ImportError:
@@ -102,6 +102,12 @@ class BaseLLMService(ABC):
     def get_response(self, prompt: str, context: str = "") -> LLMResponse:
         pass
 
+    def get_batch_responses(
+        self, prompts: List[str], context: str = ""
+    ) -> List[LLMResponse]:
+        """Get responses for several prompts sharing the same context"""
+        return [self.get_response(prompt, context) for prompt in prompts]
+
     def _calculate_confidence(self, logprobs: List[float] = None) -> float:
         """Calculate confidence from logprobs"""
         if not logprobs:
@@ -206,17 +212,110 @@ class AzureOpenAIService(BaseLLMService):
                 confidence=confidence,
                 reasoning=f"Generated by Azure OpenAI {self.model_name}",
                 model_used=self.model_name,
-                tokens_used=getattr(response, "usage", {}).get("total_tokens", 0),
+                tokens_used=self._get_token_usage(response),
             )
 
         except Exception as e:
             logger.error(f"Error getting Azure OpenAI response: {e}")
-            return LLMResponse(
-                answer=f"I encountered an error processing your request: {str(e)}",
-                confidence=0.0,
-                reasoning=f"Error from Azure OpenAI: {str(e)}",
-                model_used=self.model_name,
+            return self._create_error_response(e)
+
+    def get_batch_responses(
+        self, prompts: List[str], context: str = ""
+    ) -> List[LLMResponse]:
+        """Send all prompts as one batched request instead of one call per prompt"""
+        try:
+            if not self.llm:
+                raise ValueError("Azure OpenAI model not initialized")
+
+            full_prompts = [
+                f"{context}\n\n{prompt}" if context else prompt for prompt in prompts
+            ]
+            results = self.llm.batch(full_prompts, return_exceptions=True)
+
+            responses = []
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Error in batched Azure OpenAI response: {result}")
+                    responses.append(self._create_error_response(result))
+                    continue
+
+                logprobs = getattr(result, "logprobs", None)
+                responses.append(
+                    LLMResponse(
+                        answer=result.content,
+                        confidence=self._calculate_confidence(logprobs),
+                        reasoning=f"Generated by Azure OpenAI {self.model_name}",
+                        model_used=self.model_name,
+                        tokens_used=self._get_token_usage(result),
+                    )
+                )
+            return responses
+
+        except Exception as e:
+            logger.error(f"Error getting batched Azure OpenAI responses: {e}")
+            return [self._create_error_response(e) for _ in prompts]
+
+    def _get_token_usage(self, response) -> int:
+        """Get total tokens used and log how much of the prompt prefix was cached"""
+        usage = getattr(response, "usage_metadata", None) or {}
+        cached_tokens = (usage.get("input_token_details") or {}).get("cache_read", 0)
+        if cached_tokens:
+            logger.info(
+                f"Prompt cache: {cached_tokens} of {usage.get('input_tokens', 0)} input tokens cached"
+            )
+        return usage.get("total_tokens", 0)
+
+    def _create_error_response(self, error: Exception) -> LLMResponse:
+        """Build the error response returned when a request fails"""
+        return LLMResponse(
+            answer=f"I encountered an error processing your request: {str(error)}",
+            confidence=0.0,
+            reasoning=f"Error from Azure OpenAI: {str(error)}",
+            model_used=self.model_name,
+        )
+
+
+class AzureEmbeddingService:
+    """Azure OpenAI embeddings used for semantic caching"""
+
+    DEFAULT_DEPLOYMENT = "text-embedding-3-small"
+
+    def __init__(self, keystore: KeyStore = None):
+        self.keystore = keystore or KeyStore()
+        self.embeddings = None
+        self._initialize_model()
+
+    def _initialize_model(self):
+        try:
+            # Prefer a dedicated embedding key, fall back to the default credentials
+            found, credentials = self.keystore.get_active_key_details("embedding")
+            if found:
+                deployment_name = credentials.get("deployment_name")
+            else:
+                found, credentials = self.keystore.get_active_key_details("default")
+                deployment_name = credentials.get("embedding_deployment_name")
+
+            if not found:
+                raise ValueError(
+                    "Azure credentials for embeddings not found in key store"
+                )
+
+            deployment_name = deployment_name or self.DEFAULT_DEPLOYMENT
+            self.embeddings = AzureOpenAIEmbeddings(
+                azure_deployment=deployment_name,
+                api_key=credentials.get("openai_api_key"),
+                azure_endpoint=credentials.get("azure_openai_endpoint"),
+                openai_api_version=credentials.get("openai_api_version"),
             )
+            logger.info(f"Azure OpenAI embeddings initialized: {deployment_name}")
+
+        except Exception as e:
+            logger.error(f"Failed to initialize Azure OpenAI embeddings: {e}")
+            raise
+
+    def embed(self, text: str) -> List[float]:
+        """Get the embedding vector for a text"""
+        return self.embeddings.embed_query(text)
 
 
 class LLMServiceFactory:
@@ -293,6 +392,11 @@ class FinancialLLMService:
     def get_response(self, prompt: str, context: str = "") -> LLMResponse:
         return self.llm_service.get_response(prompt, context)
 
+    def get_batch_responses(
+        self, prompts: List[str], context: str = ""
+    ) -> List[LLMResponse]:
+        return self.llm_service.get_batch_responses(prompts, context)
+
     def get_financial_analysis(self, query: str, financial_data: str) -> LLMResponse:
         context = f"""You are a senior financial analyst. Analyze the following financial data and provide insights.
         
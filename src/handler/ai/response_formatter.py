@@ -5,13 +5,17 @@ Formats query results into human-readable responses
 
 import json
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from .token_manager import TokenManager
 from .enum_mappings import EnumMappings
 from .llm_templates import RESPONSE_FORMATTING_PROMPT
 
 logger = logging.getLogger(__name__)
 
+RESPONSE_FORMATTING_CONTEXT = (
+    "You are a senior financial analyst presenting data insights to stakeholders."
+)
+
 
 class ResponseFormatter:
     """Second LLM call: Format query results into professional response"""
@@ -53,44 +57,107 @@ class ResponseFormatter:
                 f"[SECOND API CALL] Formatting response for {len(query_results)} results..."
             )
 
-            # Format conversation history
-            history_context = self._format_history(conversation_history or [])
-
-            # Format query results for prompt
-            results_json = self._format_results_for_prompt(query_results)
-
-            # Create formatting prompt
-            prompt = self._create_formatting_prompt(
-                user_query, sql_query, results_json, intent, history_context
+            prompt = self._build_prompt(
+                user_query, sql_query, query_results, intent, conversation_history
             )
 
             # Call LLM
             logger.info("Calling LLM for response formatting...")
             llm_response = self.llm_service.get_response(
-                prompt=prompt,
-                context="You are a senior financial analyst presenting data insights to stakeholders.",
+                prompt=prompt, context=RESPONSE_FORMATTING_CONTEXT
             )
 
-            full_response = llm_response.answer.strip()
+            return self._handle_llm_answer(llm_response.answer, user_query, intent)
 
-            # Extract context summary from response
-            formatted_response, context_summary = self._extract_context_summary(
-                full_response, user_query, intent
-            )
+        except Exception as e:
+            logger.error(f"Error formatting response: {e}")
+            return self._create_fallback_result(user_query, query_results, intent)
+
+    def format_responses(
+        self,
+        requests: List[Tuple[str, str, List[Dict[str, Any]], str, Optional[List[str]]]],
+    ) -> List[tuple]:
+        """
+        Batched second API call: format several result sets in one LLM request
+
+        Args:
+            requests: List of (user_query, sql_query, query_results, intent,
+                conversation_history) tuples
 
+        Returns:
+            List of (formatted_response, context_summary) tuples in request order
+        """
+        if not requests:
+            return []
+
+        try:
             logger.info(
-                f"OK Response formatted successfully ({len(formatted_response)} chars)"
+                f"[SECOND API CALL] Formatting batch of {len(requests)} responses..."
             )
-            logger.info(f"OK Context summary extracted: {context_summary[:80]}...")
 
-            return formatted_response, context_summary
+            prompts = [self._build_prompt(*request) for request in requests]
+            llm_responses = self.llm_service.get_batch_responses(
+                prompts, context=RESPONSE_FORMATTING_CONTEXT
+            )
+
+            formatted = []
+            for request, llm_response in zip(requests, llm_responses):
+                user_query, _, query_results, intent, _ = request
+                try:
+                    formatted.append(
+                        self._handle_llm_answer(llm_response.answer, user_query, intent)
+                    )
+                except Exception as e:
+                    logger.error(f"Error formatting batched response: {e}")
+                    formatted.append(
+                        self._create_fallback_result(user_query, query_results, intent)
+                    )
+            return formatted
 
         except Exception as e:
-            logger.error(f"Error formatting response: {e}")
-            # Return fallback response
-            fallback = self._create_fallback_response(user_query, query_results, intent)
-            fallback_summary = f'User asked: "{user_query[:60]}..." | Intent: {intent}'
-            return fallback, fallback_summary
+            logger.error(f"Error formatting batched responses: {e}")
+            return [
+                self._create_fallback_result(user_query, query_results, intent)
+                for user_query, _, query_results, intent, _ in requests
+            ]
+
+    def _build_prompt(
+        self,
+        user_query: str,
+        sql_query: str,
+        query_results: List[Dict[str, Any]],
+        intent: str,
+        conversation_history: List[str] = None,
+    ) -> str:
+        """Format history and results and build the formatting prompt"""
+        history_context = self._format_history(conversation_history or [])
+        results_json = self._format_results_for_prompt(query_results)
+        return self._create_formatting_prompt(
+            user_query, sql_query, results_json, intent, history_context
+        )
+
+    def _handle_llm_answer(
+        self, llm_answer: str, user_query: str, intent: str
+    ) -> tuple:
+        """Split a raw LLM answer into (formatted_response, context_summary)"""
+        formatted_response, context_summary = self._extract_context_summary(
+            llm_answer.strip(), user_query, intent
+        )
+
+        logger.info(
+            f"OK Response formatted successfully ({len(formatted_response)} chars)"
+        )
+        logger.info(f"OK Context summary extracted: {context_summary[:80]}...")
+
+        return formatted_response, context_summary
+
+    def _create_fallback_result(
+        self, user_query: str, query_results: List[Dict[str, Any]], intent: str
+    ) -> tuple:
+        """Fallback (formatted_response, context_summary) when formatting fails"""
+        fallback = self._create_fallback_response(user_query, query_results, intent)
+        fallback_summary = f'User asked: "{user_query[:60]}..." | Intent: {intent}'
+        return fallback, fallback_summary
 
     def _create_formatting_prompt(
         self,
@@ -0,0 +1,185 @@
+"""
+Semantic Cache
+Returns stored responses for repeated or near-duplicate queries using embedding similarity
+"""
+
+import logging
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class _CachePartition:
+    """Cached entries for one vary-by key"""
+
+    def __init__(self):
+        self.vectors: List[np.ndarray] = []
+        self.values: List[Any] = []
+        self.timestamps: List[float] = []
+        self._matrix: Optional[np.ndarray] = None
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Stacked embedding matrix, rebuilt only after entries change"""
+        if self._matrix is None:
+            self._matrix = np.vstack(self.vectors)
+        return self._matrix
+
+    def add(self, vector: np.ndarray, value: Any, timestamp: float):
+        self.vectors.append(vector)
+        self.values.append(value)
+        self.timestamps.append(timestamp)
+        self._matrix = None
+
+    def keep(self, indices: List[int]):
+        self.vectors = [self.vectors[i] for i in indices]
+        self.values = [self.values[i] for i in indices]
+        self.timestamps = [self.timestamps[i] for i in indices]
+        self._matrix = None
+
+
+class SemanticCache:
+    """In-memory embedding cache with cosine-similarity lookup and TTL eviction"""
+
+    def __init__(
+        self,
+        embed_fn: Callable[[str], List[float]],
+        similarity_threshold: float = 0.95,
+        ttl_seconds: int = 3600,
+        max_entries_per_partition: int = 500,
+    ):
+        """
+        Initialize cache
+
+        Args:
+            embed_fn: Callable returning the embedding vector for a text
+            similarity_threshold: Minimum cosine similarity for a cache hit
+            ttl_seconds: Time after which an entry expires (default 60 minutes)
+            max_entries_per_partition: Oldest entries are dropped beyond this size
+        """
+        self.embed_fn = embed_fn
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries_per_partition = max_entries_per_partition
+        self._partitions: Dict[Hashable, _CachePartition] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Lowercase and collapse whitespace so trivial variations share an embedding"""
+        return re.sub(r"\s+", " ", query.strip().lower())
+
+    def embed(self, query: str) -> Optional[np.ndarray]:
+        """
+        Embed a query once for use with both lookup() and store()
+
+        Returns:
+            L2-normalized vector, or None if the query cannot be embedded
+        """
+        return self._embed(query)
+
+    def lookup(
+        self,
+        query: str,
+        partition_key: Hashable = None,
+        vector: Optional[np.ndarray] = None,
+    ) -> Optional[Any]:
+        """
+        Find a cached value for a semantically similar query
+
+        Args:
+            query: Natural language query
+            partition_key: Vary-by key; entries are only matched within a partition
+            vector: The query's vector from embed(); embedded here when omitted
+
+        Returns:
+            Cached value or None on a miss
+        """
+        with self._lock:
+            partition = self._partitions.get(partition_key)
+            if partition is None:
+                return None
+            self._evict_expired(partition, time.monotonic())
+            if not partition.values:
+                return None
+
+        if vector is None:
+            vector = self._embed(query)
+            if vector is None:
+                return None
+
+        with self._lock:
+            if not partition.values:
+                return None
+            similarities = partition.matrix @ vector
+            best = int(np.argmax(similarities))
+            score = float(similarities[best])
+            if score < self.similarity_threshold:
+                logger.debug(f"Semantic cache miss (best similarity {score:.3f})")
+                return None
+
+            logger.info(f"Semantic cache hit (similarity {score:.3f})")
+            return partition.values[best]
+
+    def store(
+        self,
+        query: str,
+        value: Any,
+        partition_key: Hashable = None,
+        vector: Optional[np.ndarray] = None,
+    ):
+        """
+        Cache a value for a query
+
+        Args:
+            query: Natural language query
+            value: Value returned on later hits
+            partition_key: Vary-by key the entry belongs to
+            vector: The query's vector from embed(); embedded here when omitted
+        """
+        if vector is None:
+            vector = self._embed(query)
+            if vector is None:
+                return
+
+        now = time.monotonic()
+        with self._lock:
+            partition = self._partitions.setdefault(partition_key, _CachePartition())
+            self._evict_expired(partition, now)
+            partition.add(vector, value, now)
+
+            overflow = len(partition.values) - self.max_entries_per_partition
+            if overflow > 0:
+                partition.keep(list(range(overflow, len(partition.values))))
+
+    def clear(self):
+        """Remove all cached entries"""
+        with self._lock:
+            self._partitions.clear()
+
+    def _evict_expired(self, partition: _CachePartition, now: float):
+        """Drop entries older than the TTL"""
+        cutoff = now - self.ttl_seconds
+        if partition.timestamps and partition.timestamps[0] < cutoff:
+            partition.keep(
+                [i for i, ts in enumerate(partition.timestamps) if ts >= cutoff]
+            )
+
+    def _embed(self, query: str) -> Optional[np.ndarray]:
+        """Embed the normalized query as an L2-normalized vector"""
+        try:
+            vector = np.asarray(
+                self.embed_fn(self.normalize_query(query)), dtype=np.float32
+            )
+            norm = np.linalg.norm(vector)
+            if norm == 0:
+                return None
+            return vector / norm
+        except Exception as e:
+            logger.warning(f"Semantic cache embedding failed: {e}")
+            return None
@@ -3,17 +3,110 @@ AI Service Handler
 Handles AI query service initialization and processing logic
 """
 
+import asyncio
 import logging
 import os
-from typing import Optional
+import threading
+import time
+from dataclasses import replace
+from typing import Any, Callable, Hashable, List, Optional, Tuple
 from datetime import datetime
 
 from .financial_handler import FinancialDataHandler
 from .ai.ai_query_service import AIQueryService as ContextAwareAIQueryService
+from .ai.real_llm_service import AzureEmbeddingService
+from .ai.semantic_cache import SemanticCache
 from ..models.financial_models import QueryResponse
 
 logger = logging.getLogger(__name__)
 
+# Where a cache miss is stored: (partition key, query embedding)
+_CacheSlot = Tuple[Hashable, Any]
+
+
+class QueryBatcher:
+    """Collects queries arriving within a short window and processes them as one batch"""
+
+    def __init__(
+        self,
+        process_batch: Callable[
+            [List[Tuple[str, Optional[str], Optional[str]]]], List[QueryResponse]
+        ],
+        max_batch: int = 16,
+        max_wait_ms: int = 20,
+        max_queue_size: int = 256,
+    ):
+        """
+        Initialize batcher
+
+        Args:
+            process_batch: Synchronous callable taking a list of
+                (query, chat_id, user_id) tuples and returning responses in order
+            max_batch: Maximum number of queries dispatched together
+            max_wait_ms: Maximum time to wait for a batch to fill
+            max_queue_size: Pending query limit; submitters wait when it is full
+        """
+        self.process_batch = process_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue_size = max_queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(
+        self, query: str, chat_id: Optional[str] = None, user_id: Optional[str] = None
+    ) -> QueryResponse:
+        """Queue a query and wait for its response"""
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((query, chat_id, user_id, future))
+        return await future
+
+    def _ensure_worker(self):
+        """Start the background worker on the running event loop"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        """Drain the queue into batches until cancelled"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            await self._dispatch(batch)
+
+    async def _dispatch(self, batch: List[Tuple]):
+        """Process one batch off the event loop and fan results out to callers"""
+        logger.info(f"Dispatching batch of {len(batch)} queries")
+        try:
+            responses = await asyncio.to_thread(
+                self.process_batch,
+                [(query, chat_id, user_id) for query, chat_id, user_id, _ in batch],
+            )
+        except Exception as e:
+            logger.error(f"Error processing query batch: {e}")
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (*_, future), response in zip(batch, responses):
+            if not future.done():
+                future.set_result(response)
+
 
 class AIServiceHandler:
     """Handler class for AI service operations"""
@@ -40,6 +133,19 @@ class AIServiceHandler:
 
         # Lazy initialization of AI query service
         self._ai_query_service = None
+        self._ai_query_service_lock = threading.Lock()
+
+        # Lazy initialization of semantic response cache
+        self._semantic_cache = None
+        self._semantic_cache_initialized = False
+        self._semantic_cache_lock = threading.Lock()
+
+        # Groups concurrent v2 queries into batched LLM requests
+        self.query_batcher = QueryBatcher(
+            self._process_query_batch,
+            max_batch=int(os.getenv("AI_BATCH_MAX_SIZE", "16")),
+            max_wait_ms=int(os.getenv("AI_BATCH_MAX_WAIT_MS", "20")),
+        )
 
     @property
     def ai_query_service(self) -> ContextAwareAIQueryService:
@@ -53,22 +159,138 @@ class AIServiceHandler:
             Exception: If AI service initialization fails
         """
         if self._ai_query_service is None:
-            try:
-                logger.info(f"Initializing AI service with Azure OpenAI")
-                self._ai_query_service = ContextAwareAIQueryService(
-                    self.financial_service,
-                    llm_model=self.llm_model,
-                    llm_temperature=self.llm_temperature,
-                )
-                logger.info("AI service initialized successfully with Azure OpenAI")
-            except Exception as e:
-                logger.error(f"Failed to initialize AI service: {e}")
-                raise Exception(
-                    f"AI service unavailable: {str(e)}. Please check LLM configuration."
-                )
+            with self._ai_query_service_lock:
+                if self._ai_query_service is None:
+                    self._ai_query_service = self._create_ai_query_service()
 
         return self._ai_query_service
 
+    def _create_ai_query_service(self) -> ContextAwareAIQueryService:
+        """Create the AI query service"""
+        try:
+            logger.info(f"Initializing AI service with Azure OpenAI")
+            ai_query_service = ContextAwareAIQueryService(
+                self.financial_service,
+                llm_model=self.llm_model,
+                llm_temperature=self.llm_temperature,
+            )
+            logger.info("AI service initialized successfully with Azure OpenAI")
+            return ai_query_service
+        except Exception as e:
+            logger.error(f"Failed to initialize AI service: {e}")
+            raise Exception(
+                f"AI service unavailable: {str(e)}. Please check LLM configuration."
+            )
+
+    @property
+    def semantic_cache(self) -> Optional[SemanticCache]:
+        """
+        Get semantic response cache with lazy initialization
+
+        Returns:
+            Semantic cache, or None if embeddings are unavailable or caching is disabled
+        """
+        if not self._semantic_cache_initialized:
+            with self._semantic_cache_lock:
+                if not self._semantic_cache_initialized:
+                    self._semantic_cache = self._create_semantic_cache()
+                    self._semantic_cache_initialized = True
+
+        return self._semantic_cache
+
+    def _create_semantic_cache(self) -> Optional[SemanticCache]:
+        """Create the semantic cache, or None if it is disabled or unavailable"""
+        if os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() != "true":
+            logger.info("Semantic cache disabled")
+            return None
+        try:
+            embedding_service = AzureEmbeddingService()
+            semantic_cache = SemanticCache(
+                embedding_service.embed,
+                similarity_threshold=float(
+                    os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95")
+                ),
+                ttl_seconds=int(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "3600")),
+            )
+            logger.info("Semantic cache initialized")
+            return semantic_cache
+        except Exception as e:
+            logger.warning(f"Semantic cache unavailable: {e}")
+            return None
+
+    def _get_cached_response(
+        self, query: str, chat_id: Optional[str], user_id: Optional[str]
+    ) -> Tuple[Optional[QueryResponse], Optional[_CacheSlot]]:
+        """
+        Look up a cached response for a similar query in the caller's partition
+
+        Partitions are keyed on (user_id, chat_id, data version), so answers
+        are never shared across users and expire with every data change. On a
+        hit the turn is saved to the caller's chat like a processed query.
+
+        Returns:
+            Tuple of (response, slot): response is set on a hit; slot is where
+            _cache_response stores the answer to a miss, or None when the query
+            is not cached (anonymous calls, cache unavailable)
+        """
+        cache = self.semantic_cache
+        # Anonymous calls have no partition of their own
+        if cache is None or (user_id is None and chat_id is None):
+            return None, None
+
+        vector = cache.embed(query)
+        if vector is None:
+            return None, None
+
+        partition_key = (
+            user_id,
+            chat_id,
+            self.financial_service.db.get_data_version(),
+        )
+        cached = cache.lookup(query, partition_key=partition_key, vector=vector)
+        if cached is None:
+            return None, (partition_key, vector)
+
+        response, intent, summary = cached
+        chat_id = self.ai_query_service.record_turn(
+            query,
+            response.answer,
+            response.data_points,
+            intent=intent,
+            summary=summary,
+            chat_id=chat_id,
+            user_id=user_id,
+        )
+        return (
+            replace(
+                response,
+                query=query,
+                timestamp=datetime.now().isoformat(),
+                chat_id=chat_id,
+            ),
+            None,
+        )
+
+    def _cache_response(
+        self, query: str, response: QueryResponse, slot: Optional[_CacheSlot]
+    ):
+        """Cache successful responses; errors and low-confidence answers are not reused"""
+        if slot is None or response.confidence <= 0.5:
+            return
+
+        # Keep the turn's intent and summary so hits can be saved like it
+        turn = self.ai_query_service.get_saved_turn(response.chat_id, response.answer)
+        if turn is None:
+            return
+
+        partition_key, vector = slot
+        self.semantic_cache.store(
+            query,
+            (response, turn.query_intent, turn.summary),
+            partition_key=partition_key,
+            vector=vector,
+        )
+
     def process_query(
         self,
         query: str,
@@ -94,7 +316,13 @@ class AIServiceHandler:
         """
         try:
             logger.info(f"Processing query (v2={use_v2}): {query[:100]}...")
-            start_time = datetime.now()
+            start_time = time.perf_counter_ns()
+
+            cached_response, cache_slot = self._get_cached_response(
+                query, chat_id, user_id
+            )
+            if cached_response:
+                return cached_response
 
             # Route to appropriate processing method
             if use_v2:
@@ -108,15 +336,64 @@ class AIServiceHandler:
                     query, chat_id=chat_id, user_id=user_id
                 )
 
-            processing_time = (datetime.now() - start_time).total_seconds()
+            processing_time = (time.perf_counter_ns() - start_time) / 1e9
             logger.info(f"Query processed successfully in {processing_time:.2f}s")
 
+            self._cache_response(query, response, cache_slot)
             return response
 
         except Exception as e:
             logger.error(f"Error processing query: {e}")
             raise
 
+    async def submit_query(
+        self,
+        query: str,
+        chat_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> QueryResponse:
+        """
+        Process a query with the Two-API architecture through the batching window
+
+        Concurrent calls arriving within the window share one LLM request per
+        API call instead of paying the per-call overhead individually.
+
+        Args:
+            query: Natural language query string
+            chat_id: Optional chat session ID for context-aware conversations
+            user_id: Optional user ID for personalization
+
+        Returns:
+            QueryResponse with answer, confidence, data points, and insights
+        """
+        try:
+            cached_response, cache_slot = await asyncio.to_thread(
+                self._get_cached_response, query, chat_id, user_id
+            )
+            if cached_response:
+                return cached_response
+
+            logger.info(f"Submitting query for batching: {query[:100]}...")
+            response = await self.query_batcher.submit(query, chat_id, user_id)
+
+            await asyncio.to_thread(self._cache_response, query, response, cache_slot)
+            return response
+        except Exception as e:
+            logger.error(f"Error processing query: {e}")
+            raise
+
+    def _process_query_batch(
+        self, queries: List[Tuple[str, Optional[str], Optional[str]]]
+    ) -> List[QueryResponse]:
+        """Process a batch of (query, chat_id, user_id) tuples"""
+        start_time = time.perf_counter_ns()
+        responses = self.ai_query_service.process_batch(queries)
+        processing_time = (time.perf_counter_ns() - start_time) / 1e9
+        logger.info(
+            f"Batch of {len(queries)} queries processed in {processing_time:.2f}s"
+        )
+        return responses
+
     def get_conversation_history(self, chat_id: str):
         """
         Get conversation history for a specific chat
@@ -175,6 +452,7 @@ class AIServiceHandler:
 
 # Global singleton instance
 _ai_handler_instance = None
+_ai_handler_lock = threading.Lock()
 
 
 def get_ai_handler() -> AIServiceHandler:
@@ -186,5 +464,7 @@ def get_ai_handler() -> AIServiceHandler:
     """
     global _ai_handler_instance
     if _ai_handler_instance is None:
-        _ai_handler_instance = AIServiceHandler()
+        with _ai_handler_lock:
+            if _ai_handler_instance is None:
+                _ai_handler_instance = AIServiceHandler()
     return _ai_handler_instance
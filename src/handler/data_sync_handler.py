@@ -3,8 +3,11 @@ Data Sync Handler
 Handles all data synchronization business logic
 """
 
+import fnmatch
 import logging
-from typing import Dict, Any, List, Tuple
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
 from ..parsers import import_excel_to_database
@@ -26,23 +29,21 @@ class DataSyncHandler:
         self.financial_handler = FinancialDataHandler()
 
     def _process_excel_file(
-        self, resources_folder: Path, file_pattern: str, source_name: str
+        self, file_path: Optional[Path], file_pattern: str, source_name: str
     ) -> Dict[str, Any]:
         """
-        Helper function to process a single Excel file pattern
+        Helper function to process a single Excel file
 
         Args:
-            resources_folder: Path to resources directory
-            file_pattern: Glob pattern for file matching (e.g., "dataset1_output_*.xlsx")
+            file_path: Resolved file for the pattern, or None if no file matched
+            file_pattern: Glob pattern the file was matched by (e.g., "dataset1_output_*.xlsx")
             source_name: Human-readable source name (e.g., "P&L Report")
 
         Returns:
             Dictionary with processing results
         """
         try:
-            files = list(resources_folder.glob(file_pattern))
-            if files:
-                file_path = files[0]  # Take the first one found
+            if file_path is not None:
                 logger.info(f"Processing {source_name} Excel: {file_path.name}")
 
                 accounts_created, transactions_created = import_excel_to_database(
@@ -94,6 +95,29 @@ class DataSyncHandler:
         project_root = current_file.parent.parent.parent
         return project_root / "resources"
 
+    def _index_resource_files(
+        self, resources_folder: Path, file_patterns: List[str]
+    ) -> Dict[str, List[Path]]:
+        """
+        Match files in the resources folder against all patterns in one directory scan
+
+        Args:
+            resources_folder: Path to resources directory
+            file_patterns: Glob patterns to match file names against
+
+        Returns:
+            Dictionary mapping each pattern to its matching files, in directory order
+        """
+        matches = {pattern: [] for pattern in file_patterns}
+        with os.scandir(resources_folder) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                for pattern in file_patterns:
+                    if fnmatch.fnmatchcase(entry.name, pattern):
+                        matches[pattern].append(Path(entry.path))
+        return matches
+
     def _get_dataset_configurations(self) -> List[Tuple[str, str]]:
         """
         Get the list of dataset configurations to process
@@ -126,7 +150,6 @@ class DataSyncHandler:
 
             total_accounts = 0
             total_transactions = 0
-            files_processed = []
 
             # Get resources directory path
             resources_folder = self._get_resources_folder()
@@ -134,13 +157,27 @@ class DataSyncHandler:
             # Get dataset configurations
             datasets = self._get_dataset_configurations()
 
-            # Process each dataset
-            for file_pattern, source_name in datasets:
-                result = self._process_excel_file(
-                    resources_folder, file_pattern, source_name
-                )
-                files_processed.append(result)
+            # Resolve every dataset's file from a single directory scan
+            resource_files = self._index_resource_files(
+                resources_folder, [file_pattern for file_pattern, _ in datasets]
+            )
+
+            def process_dataset(dataset: Tuple[str, str]) -> Dict[str, Any]:
+                file_pattern, source_name = dataset
+                files = resource_files[file_pattern]
+                file_path = files[0] if files else None  # Take the first one found
+                return self._process_excel_file(file_path, file_pattern, source_name)
+
+            # Process datasets concurrently when each worker thread gets its own
+            # connection; the in-memory database shares one connection, so
+            # imports into it must not interleave
+            max_workers = (
+                1 if self.financial_handler.db.is_memory else max(1, len(datasets))
+            )
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                files_processed = list(executor.map(process_dataset, datasets))
 
+            for result in files_processed:
                 if result["success"]:
                     total_accounts += result["accounts"]
                     total_transactions += result["transactions"]
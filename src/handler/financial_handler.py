@@ -2,25 +2,190 @@
 Service layer for business logic
 """
 
+import copy
 import logging
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Iterable, List, Dict, Any, Optional, Tuple
+
+import numpy as np
 from ..stores.database_manager import (
     get_database_manager,
     FilterOperator,
     FilterCondition,
 )
 from ..config.settings import config_manager
+from ..models.filter_and_grouping_models import GroupedMetricsResponse
+
+# numba is optional; without it totals are computed with np.bincount
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - environment specific
+    NUMBA_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Account type names indexed by account type ID
+_TYPE_NAMES = ("unknown", "revenue", "cogs", "expense", "tax", "derived")
+
+_VALID_GROUP_FIELDS = frozenset(
+    [
+        "account_name",
+        "account_type",
+        "period_start",
+        "period_end",
+    ]
+)
+_VALID_AGGREGATIONS = frozenset(["SUM", "AVG", "COUNT", "MIN", "MAX"])
+
+# How partial aggregates combine when a finer grouping is rolled up to a
+# coarser one; AVG is not composable from its partial results
+_ROLLUP_COMBINERS = {
+    "SUM": lambda values: sum(values),
+    "COUNT": lambda values: sum(values),
+    "MIN": min,
+    "MAX": max,
+}
+
+
+def _freeze(value: Any) -> Any:
+    """Make a filter value hashable so it can be part of a cache key"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _null_first_key(key: Tuple) -> Tuple:
+    """Sort key matching SQLite's GROUP BY order, where NULL sorts first"""
+    return tuple((value is not None, value) for value in key)
+
+
+# Group key expressions over `account_type` and `s` (the row's period_start)
+_GROUP_KEY_EXPRESSIONS = {
+    "none": '"all"',
+    "account_type": (
+        "_TYPE_NAMES[account_type] if 0 < account_type < len(_TYPE_NAMES) "
+        'else f"type_{account_type}"'
+    ),
+    # Group by month (YYYY-MM)
+    "month": 's[:7] if len(s) >= 7 else "unknown"',
+    # Group by quarter (YYYY-Q1, Q2, Q3, Q4)
+    "quarter": 'f"{s[:4]}-Q{(int(s[5:7]) - 1) // 3 + 1}" if len(s) >= 7 else "unknown"',
+    # Group by year (YYYY)
+    "year": 's[:4] if len(s) >= 4 else "unknown"',
+}
+
+_SUMMARY_KERNEL_TEMPLATE = """
+def summary_kernel(data, filter_set):
+    grouped = {{}}
+    group_indices = {{}}
+    row_groups = []
+    row_types = []
+    row_values = []
+    for item in data:
+        account_type = item["account_type"]{filter_check}{period_start}
+        key = {group_key}
+        group_index = group_indices.get(key)
+        if group_index is None:
+            group_index = group_indices[key] = len(group_indices)
+            grouped[key] = []
+        grouped[key].append(item)
+        row_groups.append(group_index)
+        row_types.append(account_type)
+        row_values.append(item["value"])
+    return grouped, group_indices, row_groups, row_types, row_values
+"""
+
+
+def _compile_summary_kernel(group_by: str, filtered: bool) -> Callable:
+    """
+    Generate the summary row loop with the grouping and filter checks inlined
+
+    Args:
+        group_by: Grouping name; unknown names group every row under "other"
+        filtered: Whether rows are checked against an account-type filter set
+
+    Returns:
+        Function (data, filter_set) -> (grouped, group_indices, row_groups,
+        row_types, row_values)
+    """
+    group_key = _GROUP_KEY_EXPRESSIONS.get(group_by, '"other"')
+    source = _SUMMARY_KERNEL_TEMPLATE.format(
+        filter_check=(
+            "\n        if account_type not in filter_set:\n            continue"
+            if filtered
+            else ""
+        ),
+        period_start=(
+            '\n        s = item["period_start"]' if "s[" in group_key else ""
+        ),
+        group_key=group_key,
+    )
+    namespace = {"_TYPE_NAMES": _TYPE_NAMES}
+    exec(compile(source, f"<summary_kernel:{group_by}>", "exec"), namespace)
+    return namespace["summary_kernel"]
+
+
+def _sum_by_group_and_type_numpy(
+    group_ids: np.ndarray,
+    types: np.ndarray,
+    values: np.ndarray,
+    n_groups: int,
+    width: int,
+) -> np.ndarray:
+    """Sum values into an (n_groups, width) matrix indexed by group and account type"""
+    return np.bincount(
+        group_ids * width + types, weights=values, minlength=n_groups * width
+    ).reshape(-1, width)
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def _sum_by_group_and_type(group_ids, types, values, n_groups, width):
+        """Sum values into an (n_groups, width) matrix indexed by group and account type"""
+        sums = np.zeros((n_groups, width), dtype=np.float64)
+        for i in range(types.size):
+            sums[group_ids[i], types[i]] += values[i]
+        return sums
+
+else:
+    _sum_by_group_and_type = _sum_by_group_and_type_numpy
+
 
 class FinancialDataHandler:
     """Service class for financial data operations"""
 
+    # Compiled summary row loops keyed by (group_by, filtered)
+    _summary_kernels: Dict[Tuple[str, bool], Callable] = {}
+
+    _EMPTY_SUMMARY_STATS = {
+        "total_revenue": 0.0,
+        "total_cogs": 0.0,
+        "total_expenses": 0.0,
+        "total_tax": 0.0,
+        "total_gross_profit": 0.0,
+        "total_operating_profit": 0.0,
+        "total_net_profit": 0.0,
+        "total_records": 0,
+        "gross_margin_percent": 0,
+        "operating_margin_percent": 0,
+        "net_margin_percent": 0,
+    }
+
     def __init__(self):
         self.db = get_database_manager()
         self.config = config_manager.config
 
+        # Summaries keyed on their inputs and the database data version
+        self._cached_summary = lru_cache(maxsize=256)(self._compute_summary)
+
+        # Aggregate query results, plus the complete ones kept for roll-up reuse
+        self._cached_aggregate = lru_cache(maxsize=256)(self._compute_aggregate)
+        self._rollup_sources: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+
     def get_metrics_by_type(self, account_type: str, limit: int = 100) -> List[Dict]:
         """Get metrics by account type"""
         return self.db.get_metrics_by_type(account_type, limit)
@@ -58,34 +223,30 @@ class FinancialDataHandler:
                 f"Group by: {group_by}, Account types: {account_type_filter}, Derived: {calculate_derived}"
             )
 
-            # Get base data
-            base_data = self.db.get_metrics_by_period(period_start, period_end)
-
-            # Apply account type filter if specified
-            if account_type_filter:
-                base_data = [
-                    item
-                    for item in base_data
-                    if item.get("account_type") in account_type_filter
-                ]
-
-            # Group data based on group_by parameter
-            grouped_data = self._group_financial_data(base_data, group_by)
-
-            # Calculate derived metrics if requested
-            if calculate_derived:
-                grouped_data = self._calculate_derived_metrics(grouped_data)
+            # Repeated calls are served from cache until the data changes
+            summary_data = self._cached_summary(
+                period_start,
+                period_end,
+                group_by,
+                (
+                    tuple(sorted(set(account_type_filter)))
+                    if account_type_filter
+                    else None
+                ),
+                calculate_derived,
+                self.db.get_data_version(),
+            )
 
-            # Create summary response
+            # Copy the cached groups and stats so callers cannot alter the cache
             summary = {
                 "period_start": period_start,
                 "period_end": period_end,
                 "group_by": group_by,
                 "account_type_filter": account_type_filter,
                 "calculate_derived": calculate_derived,
-                "total_records": len(base_data),
-                "grouped_data": grouped_data,
-                "summary_stats": self._calculate_summary_stats(grouped_data),
+                "total_records": summary_data["total_records"],
+                "grouped_data": copy.deepcopy(summary_data["grouped_data"]),
+                "summary_stats": dict(summary_data["summary_stats"]),
             }
 
             return summary
@@ -94,150 +255,155 @@ class FinancialDataHandler:
             logger.error(f"Error in enhanced financial summary: {e}")
             raise
 
-    def _group_financial_data(self, data: List[Dict], group_by: str) -> Dict[str, Any]:
-        """Group financial data by specified criteria"""
-        if group_by == "none":
-            return {"all": data}
-
-        grouped = {}
-
-        for item in data:
-            if group_by == "month":
-                # Group by month (YYYY-MM)
-                period_start = item.get("period_start", "")
-                month_key = period_start[:7] if len(period_start) >= 7 else "unknown"
-
-            elif group_by == "quarter":
-                # Group by quarter (YYYY-Q1, Q2, Q3, Q4)
-                period_start = item.get("period_start", "")
-                if len(period_start) >= 7:
-                    year = period_start[:4]
-                    month = int(period_start[5:7])
-                    quarter = f"Q{(month-1)//3 + 1}"
-                    quarter_key = f"{year}-{quarter}"
-                else:
-                    quarter_key = "unknown"
-
-            elif group_by == "year":
-                # Group by year (YYYY)
-                period_start = item.get("period_start", "")
-                year_key = period_start[:4] if len(period_start) >= 4 else "unknown"
-
-            elif group_by == "account_type":
-                # Group by account type
-                account_type = item.get("account_type", 0)
-                type_names = {
-                    1: "revenue",
-                    2: "cogs",
-                    3: "expense",
-                    4: "tax",
-                    5: "derived",
-                }
-                type_key = type_names.get(account_type, f"type_{account_type}")
+    def _compute_summary(
+        self,
+        period_start: str,
+        period_end: str,
+        group_by: str,
+        account_types: Optional[Tuple[int, ...]],
+        calculate_derived: bool,
+        data_version: int,
+    ) -> Dict[str, Any]:
+        """Fetch and summarize data; data_version only distinguishes cache entries"""
+        rows = self.db.iter_metrics_by_period(period_start, period_end)
 
-            else:
-                # Default grouping
-                type_key = "other"
-
-            # Determine the key to use
-            if group_by in ["month", "quarter", "year"]:
-                key = locals().get(f"{group_by}_key", "unknown")
-            elif group_by == "account_type":
-                key = type_key
-            else:
-                key = "other"
+        # Filter, group, and total in a single pass over the streamed rows
+        filter_set = frozenset(account_types) if account_types else None
+        return self._build_summary(rows, group_by, filter_set, calculate_derived)
 
-            if key not in grouped:
-                grouped[key] = []
-            grouped[key].append(item)
+    def _build_summary(
+        self,
+        data: Iterable[Dict],
+        group_by: str,
+        filter_set: Optional[frozenset],
+        calculate_derived: bool,
+    ) -> Dict[str, Any]:
+        """
+        Filter, group, and total financial data in one traversal
 
-        return grouped
+        Args:
+            data: Transaction rows from the database, consumed once
+            group_by: Group by period (month, quarter, year), account_type, or none
+            filter_set: Account type IDs to keep, or None to keep all
+            calculate_derived: Whether to attach totals and derived metrics per group
 
-    def _calculate_derived_metrics(
-        self, grouped_data: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Calculate derived metrics like gross profit for each group"""
-        enhanced_groups = {}
-
-        for group_key, items in grouped_data.items():
-            # Calculate totals by account type
-            totals = {
-                1: 0,
-                2: 0,
-                3: 0,
-                4: 0,
-                5: 0,
-            }  # revenue, cogs, expense, tax, derived
-
-            for item in items:
-                account_type = item.get("account_type", 0)
-                value = float(item.get("value", 0))
-                totals[account_type] += value
-
-            # Calculate derived metrics
-            derived_metrics = {
-                "gross_profit": totals[1] - totals[2],  # revenue - cogs
-                "operating_profit": totals[1]
-                - totals[2]
-                - totals[3],  # revenue - cogs - expenses
-                "net_profit": totals[1]
-                - totals[2]
-                - totals[3]
-                - totals[4],  # revenue - cogs - expenses - tax
-                "gross_margin": (
-                    (totals[1] - totals[2]) / totals[1] * 100 if totals[1] > 0 else 0
-                ),
-                "operating_margin": (
-                    (totals[1] - totals[2] - totals[3]) / totals[1] * 100
-                    if totals[1] > 0
-                    else 0
-                ),
-                "net_margin": (
-                    (totals[1] - totals[2] - totals[3] - totals[4]) / totals[1] * 100
-                    if totals[1] > 0
-                    else 0
-                ),
-            }
+        Returns:
+            Dictionary with grouped_data, summary_stats, and total_records
+        """
+        # Row loop generated per grouping with the key and filter checks inlined;
+        # account_type and value come from NOT NULL columns, so rows are indexed
+        # directly and values are cast to float once, in bulk, by NumPy below
+        kernel = self._get_summary_kernel(group_by, filter_set is not None)
+        grouped, group_indices, row_groups, row_types, row_values = kernel(
+            data, filter_set
+        )
+
+        if not row_types:
+            return self._build_empty_summary(group_by, calculate_derived)
+
+        # Totals per (group, account type) in one compiled or vectorized group-by
+        types = np.asarray(row_types, dtype=np.int64)
+        width = max(6, int(types.max()) + 1)
+        sums = _sum_by_group_and_type(
+            np.asarray(row_groups, dtype=np.int64),
+            types,
+            np.asarray(row_values, dtype=np.float64),
+            len(group_indices),
+            width,
+        )
+        overall = sums.sum(axis=0)
+
+        if calculate_derived:
+            grouped_data = {}
+            for key, items in grouped.items():
+                group_sums = sums[group_indices[key]]
+
+                # revenue, cogs, expense, tax, derived
+                totals = {
+                    account_type: float(group_sums[account_type])
+                    for account_type in range(1, 6)
+                }
+                grouped_data[key] = {
+                    "items": items,
+                    "totals_by_type": totals,
+                    "derived_metrics": self._calculate_derived_metrics(totals),
+                }
+        else:
+            grouped_data = grouped
 
-            enhanced_groups[group_key] = {
-                "items": items,
-                "totals_by_type": totals,
-                "derived_metrics": derived_metrics,
-            }
+        return {
+            "grouped_data": grouped_data,
+            "summary_stats": self._calculate_summary_stats(overall, len(row_types)),
+            "total_records": len(row_types),
+        }
 
-        return enhanced_groups
-
-    def _calculate_summary_stats(self, grouped_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Calculate summary statistics across all groups"""
-        total_revenue = 0
-        total_cogs = 0
-        total_expenses = 0
-        total_tax = 0
-        total_records = 0
-
-        for group_key, group_data in grouped_data.items():
-            if isinstance(group_data, dict) and "totals_by_type" in group_data:
-                # Enhanced data with derived metrics
-                totals = group_data["totals_by_type"]
-                total_revenue += totals[1]
-                total_cogs += totals[2]
-                total_expenses += totals[3]
-                total_tax += totals[4]
-                total_records += len(group_data["items"])
+    def _build_empty_summary(
+        self, group_by: str, calculate_derived: bool
+    ) -> Dict[str, Any]:
+        """Summary for a period or filter with no matching rows"""
+        grouped_data = {}
+        if group_by == "none":
+            if calculate_derived:
+                totals = dict.fromkeys(range(1, 6), 0.0)
+                grouped_data["all"] = {
+                    "items": [],
+                    "totals_by_type": totals,
+                    "derived_metrics": self._calculate_derived_metrics(totals),
+                }
             else:
-                # Simple grouped data
-                for item in group_data:
-                    account_type = item.get("account_type", 0)
-                    value = float(item.get("value", 0))
-                    if account_type == 1:
-                        total_revenue += value
-                    elif account_type == 2:
-                        total_cogs += value
-                    elif account_type == 3:
-                        total_expenses += value
-                    elif account_type == 4:
-                        total_tax += value
-                    total_records += 1
+                grouped_data["all"] = []
+
+        return {
+            "grouped_data": grouped_data,
+            "summary_stats": dict(self._EMPTY_SUMMARY_STATS),
+            "total_records": 0,
+        }
+
+    @classmethod
+    def _get_summary_kernel(cls, group_by: str, filtered: bool) -> Callable:
+        """Get the compiled row loop for a grouping, compiling it on first use"""
+        kernel_key = (group_by, filtered)
+        kernel = cls._summary_kernels.get(kernel_key)
+        if kernel is None:
+            kernel = cls._summary_kernels[kernel_key] = _compile_summary_kernel(
+                group_by, filtered
+            )
+        return kernel
+
+    def _calculate_derived_metrics(self, totals: Dict[int, float]) -> Dict[str, float]:
+        """Calculate derived metrics like gross profit from totals by account type"""
+        return {
+            "gross_profit": totals[1] - totals[2],  # revenue - cogs
+            "operating_profit": totals[1]
+            - totals[2]
+            - totals[3],  # revenue - cogs - expenses
+            "net_profit": totals[1]
+            - totals[2]
+            - totals[3]
+            - totals[4],  # revenue - cogs - expenses - tax
+            "gross_margin": (
+                (totals[1] - totals[2]) / totals[1] * 100 if totals[1] > 0 else 0
+            ),
+            "operating_margin": (
+                (totals[1] - totals[2] - totals[3]) / totals[1] * 100
+                if totals[1] > 0
+                else 0
+            ),
+            "net_margin": (
+                (totals[1] - totals[2] - totals[3] - totals[4]) / totals[1] * 100
+                if totals[1] > 0
+                else 0
+            ),
+        }
+
+    def _calculate_summary_stats(
+        self, totals: np.ndarray, total_records: int
+    ) -> Dict[str, Any]:
+        """Calculate summary statistics from overall totals by account type"""
+        total_revenue = float(totals[1])
+        total_cogs = float(totals[2])
+        total_expenses = float(totals[3])
+        total_tax = float(totals[4])
 
         return {
             "total_revenue": total_revenue,
@@ -271,24 +437,181 @@ class FinancialDataHandler:
         """Get all available time periods"""
         return self.db.get_available_periods()
 
+    def query_transactions_aggregate(
+        self,
+        filters: List[Dict[str, Any]] = None,
+        group_by: List[str] = None,
+        aggregates: List[Dict[str, Any]] = None,
+        order_by: str = None,
+        limit: int = None,
+        offset: int = None,
+        language: str = "en",
+    ) -> Dict[str, Any]:
+        """
+        Query aggregated transactions, serving repeated queries from cache
+
+        A query whose grouping is a subset of a cached, complete result with
+        only SUM/COUNT/MIN/MAX aggregates is answered by rolling that result
+        up instead of querying the database again.
+
+        Args:
+            filters: List of filter conditions
+            group_by: Fields or expressions to group by
+            aggregates: Aggregate functions to apply
+            order_by: ORDER BY clause
+            limit: Maximum number of groups to return
+            offset: Number of groups to skip
+            language: Language code for localization
+
+        Returns:
+            Aggregate result in the transaction store format
+        """
+        filters_key = tuple(
+            tuple((key, _freeze(value)) for key, value in sorted(item.items()))
+            for item in filters or ()
+        )
+        aggregates_key = (
+            tuple(tuple(sorted(item.items())) for item in aggregates)
+            if aggregates
+            else None
+        )
+        group_by_key = tuple(group_by) if group_by is not None else None
+
+        result = self._cached_aggregate(
+            filters_key,
+            group_by_key,
+            aggregates_key,
+            order_by,
+            limit,
+            offset,
+            language,
+            self.db.get_data_version(),
+        )
+        # Cached results are shared with later calls and roll-ups
+        return copy.deepcopy(result)
+
+    def _compute_aggregate(
+        self,
+        filters_key: Tuple,
+        group_by_key: Optional[Tuple[str, ...]],
+        aggregates_key: Optional[Tuple],
+        order_by: Optional[str],
+        limit: Optional[int],
+        offset: Optional[int],
+        language: str,
+        data_version: int,
+    ) -> Dict[str, Any]:
+        """Roll up a cached finer result if possible, otherwise query the database"""
+        source_key = (filters_key, aggregates_key, language, data_version)
+
+        if not order_by and not offset and group_by_key is not None:
+            result = self._rollup_aggregate(source_key, group_by_key, limit)
+            if result is not None:
+                logger.info(f"Aggregate by {group_by_key} rolled up from cache")
+                return result
+
+        result = self.db.query_transactions_aggregate(
+            filters=[dict(item) for item in filters_key],
+            group_by=list(group_by_key) if group_by_key is not None else None,
+            aggregates=(
+                [dict(item) for item in aggregates_key] if aggregates_key else None
+            ),
+            order_by=order_by,
+            limit=limit,
+            offset=offset,
+            language=language,
+        )
+
+        # Only complete, grouped results can be rolled up later
+        if group_by_key and not offset and not result["has_more"] and result["groups"]:
+            sources = self._rollup_sources.setdefault(source_key, {})
+            sources[group_by_key] = result
+            self._rollup_sources.move_to_end(source_key)
+            while len(self._rollup_sources) > 256:
+                self._rollup_sources.popitem(last=False)
+
+        return result
+
+    def _rollup_aggregate(
+        self,
+        source_key: Tuple,
+        group_by_key: Tuple[str, ...],
+        limit: Optional[int],
+    ) -> Optional[Dict[str, Any]]:
+        """Re-aggregate a cached finer-grained result to a coarser grouping"""
+        sources = self._rollup_sources.get(source_key)
+        if not sources:
+            return None
+
+        requested = set(group_by_key)
+        for source_group_by, source in sources.items():
+            if not requested < set(source_group_by):
+                continue
+
+            functions = source["aggregate_functions"]
+            if not all(f.upper() in _ROLLUP_COMBINERS for f in functions):
+                return None
+            combiners = [_ROLLUP_COMBINERS[f.upper()] for f in functions]
+
+            # Group columns come first in each row, aggregate columns last
+            columns = list(source["groups"][0])
+            aggregate_columns = columns[len(columns) - len(functions) :]
+
+            partials: Dict[Tuple, List[List[Any]]] = {}
+            for row in source["groups"]:
+                key = tuple(row[field] for field in group_by_key)
+                values = partials.get(key)
+                if values is None:
+                    values = partials[key] = [[] for _ in aggregate_columns]
+                for column_values, column in zip(values, aggregate_columns):
+                    if row[column] is not None:
+                        column_values.append(row[column])
+
+            try:
+                keys = sorted(partials, key=_null_first_key)
+            except TypeError:
+                return None
+
+            groups = []
+            for key in keys:
+                group = dict(zip(group_by_key, key))
+                for column, combine, column_values in zip(
+                    aggregate_columns, combiners, partials[key]
+                ):
+                    group[column] = combine(column_values) if column_values else None
+                groups.append(group)
+
+            page = groups[:limit] if limit else groups
+            return {
+                **source,
+                "groups": page,
+                "total_groups": len(groups),
+                "limit": limit,
+                "offset": None,
+                "has_more": len(page) < len(groups),
+                "group_by_fields": list(group_by_key),
+            }
+
+        return None
+
     def get_grouped_metrics(
         self,
         group_by: str,
         filters: List[Dict[str, Any]] = None,
         aggregation: str = "SUM",
         limit: int = 100,
-    ) -> List[Dict]:
+    ) -> List[GroupedMetricsResponse]:
         """
         Get grouped/aggregated financial metrics with filters
 
         Args:
-            group_by: Field to group by (account_name, account_type, parent_account_id, period_start, period_end)
+            group_by: Field to group by (account_name, account_type, period_start, period_end)
             filters: List of filter conditions
             aggregation: Aggregation function (SUM, AVG, COUNT, MIN, MAX)
             limit: Maximum number of results
 
         Returns:
-            List of grouped metrics
+            List of grouped metric rows
         """
         try:
             logger.info(
@@ -332,40 +655,33 @@ class FinancialDataHandler:
                             continue
 
             # Validate group_by field
-            valid_group_fields = [
-                "account_name",
-                "account_type",
-                "parent_account_id",
-                "period_start",
-                "period_end",
-            ]
-            if group_by not in valid_group_fields:
+            if group_by not in _VALID_GROUP_FIELDS:
                 raise ValueError(
-                    f"Invalid group_by field. Must be one of: {valid_group_fields}"
+                    f"Invalid group_by field. Must be one of: {sorted(_VALID_GROUP_FIELDS)}"
                 )
 
             # Validate aggregation function
-            valid_aggregations = ["SUM", "AVG", "COUNT", "MIN", "MAX"]
-            if aggregation.upper() not in valid_aggregations:
+            if aggregation.upper() not in _VALID_AGGREGATIONS:
                 raise ValueError(
-                    f"Invalid aggregation. Must be one of: {valid_aggregations}"
+                    f"Invalid aggregation. Must be one of: {sorted(_VALID_AGGREGATIONS)}"
                 )
 
-            # Use the database's get_metrics_summary method
-            results = self.db.get_metrics_summary(group_by, filter_conditions)
-
-            # Apply aggregation to the results
-            aggregated_results = []
-            for result in results[:limit]:
-                aggregated_results.append(
-                    {
-                        "group_value": result.get(group_by),
-                        "aggregation_type": aggregation.upper(),
-                        "aggregated_value": result.get("total_value", 0),
-                        "record_count": result.get("record_count", 0),
-                        "group_by_field": group_by,
-                    }
+            # Aggregation, grouping and limit all run in SQL; only group rows come back
+            aggregation_type = aggregation.upper()
+            results = self.db.get_metrics_summary(
+                group_by, filter_conditions, aggregation_type, limit
+            )
+
+            aggregated_results = [
+                GroupedMetricsResponse(
+                    group_value=result.get(group_by),
+                    aggregation_type=aggregation_type,
+                    aggregated_value=result.get("total_value") or 0,
+                    record_count=result.get("record_count", 0),
+                    group_by_field=group_by,
                 )
+                for result in results
+            ]
 
             logger.info(f"Retrieved {len(aggregated_results)} grouped metrics")
             return aggregated_results
@@ -1,29 +1,34 @@
-from .account import Account
-from .finance_transaction import FinanceTransaction
-from .financial_metric import FinancialMetric
-from .financial_summary import FinancialSummary
-from .query_models import QueryRequest, QueryResponse
-from .data_ingestion_models import DataIngestionRequest, DataIngestionResponse
-from .filter_and_grouping_models import (
-    FilterRequest,
-    GroupedMetricsRequest,
-    GroupedMetricsResponse,
-)
-from .chat_session import ChatSession
-from .chat_message import ChatMessage
+import importlib
 
-__all__ = [
-    "Account",
-    "FinanceTransaction",
-    "FinancialMetric",
-    "FinancialSummary",
-    "QueryRequest",
-    "QueryResponse",
-    "DataIngestionRequest",
-    "DataIngestionResponse",
-    "FilterRequest",
-    "GroupedMetricsRequest",
-    "GroupedMetricsResponse",
-    "ChatSession",
-    "ChatMessage",
-]
+# Submodules are imported on first attribute access (PEP 562) so importing a
+# single model does not load every other model module
+_LAZY_IMPORTS = {
+    "Account": ".account",
+    "FinanceTransaction": ".finance_transaction",
+    "FinancialMetric": ".financial_metric",
+    "FinancialSummary": ".financial_summary",
+    "QueryRequest": ".query_models",
+    "QueryResponse": ".query_models",
+    "DataIngestionRequest": ".data_ingestion_models",
+    "DataIngestionResponse": ".data_ingestion_models",
+    "FilterRequest": ".filter_and_grouping_models",
+    "GroupedMetricsRequest": ".filter_and_grouping_models",
+    "GroupedMetricsResponse": ".filter_and_grouping_models",
+    "ChatSession": ".chat_session",
+    "ChatMessage": ".chat_message",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -4,7 +4,7 @@ from datetime import datetime
 from ..common.enums import AccountType
 
 
-@dataclass
+@dataclass(slots=True)
 class Account:
     """Represents an account in the accounts table"""
 
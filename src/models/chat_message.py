@@ -3,13 +3,34 @@ Chat Message Model
 Represents a message in the chat_messages table
 """
 
-from dataclasses import dataclass
-from typing import Optional, Dict, Any, List
+from dataclasses import dataclass, fields
+from typing import Callable, Optional, Dict, Any, List, Tuple
 from datetime import datetime
 import json
 
+from ..common.json_codec import json_dumps, json_loads
+from ..common.date_utils import parse_iso_datetime
 
-@dataclass
+# Columns of a full chat_messages row, in table order
+_ROW_COLUMNS = (
+    "id",
+    "chat_id",
+    "message_type",
+    "content",
+    "query_intent",
+    "data_points",
+    "prompt",
+    "llm_response",
+    "summary",
+    "token_count",
+    "timestamp",
+)
+
+# Compiled row readers keyed by result-set column names
+_row_readers: Dict[Tuple[str, ...], Callable[[tuple], "ChatMessage"]] = {}
+
+
+@dataclass(slots=True)
 class ChatMessage:
     """Represents a message in the chat_messages table"""
 
@@ -45,14 +66,14 @@ class ChatMessage:
         """Parse data_points JSON string to list"""
         if self.data_points:
             try:
-                return json.loads(self.data_points)
+                return json_loads(self.data_points)
             except json.JSONDecodeError:
                 return None
         return None
 
     def set_data_points_from_list(self, data_points: List[Dict]):
         """Set data_points from list"""
-        self.data_points = json.dumps(data_points) if data_points else None
+        self.data_points = json_dumps(data_points) if data_points else None
 
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> "ChatMessage":
@@ -69,27 +90,54 @@ class ChatMessage:
             summary=data.get("summary"),
             token_count=data.get("token_count"),
             timestamp=(
-                datetime.fromisoformat(data["timestamp"])
-                if data.get("timestamp")
-                else None
+                parse_iso_datetime(data["timestamp"]) if data.get("timestamp") else None
             ),
         )
 
+    @staticmethod
+    def compile_row_reader(
+        columns: Tuple[str, ...],
+    ) -> Callable[[tuple], "ChatMessage"]:
+        """
+        Get a constructor specialized for rows with the given column order
+
+        The reader is generated once per column tuple; each column is read by
+        a fixed index and timestamp is parsed inline.
+        """
+        columns = tuple(columns)
+        reader = _row_readers.get(columns)
+        if reader is not None:
+            return reader
+
+        known = {f.name for f in fields(ChatMessage) if f.init}
+        unknown = [column for column in columns if column not in known]
+        if unknown:
+            raise ValueError(f"Unknown chat_messages columns: {unknown}")
+
+        arguments = []
+        for index, column in enumerate(columns):
+            if column == "timestamp":
+                value = f"_parse(row[{index}]) if row[{index}] else None"
+            else:
+                value = f"row[{index}]"
+            arguments.append(f"{column}={value}")
+
+        source = f"def _read_row(row):\n    return _cls({', '.join(arguments)})\n"
+        namespace = {"_cls": ChatMessage, "_parse": parse_iso_datetime}
+        exec(compile(source, f"<chat_message_reader {columns}>", "exec"), namespace)
+        reader = _row_readers[columns] = namespace["_read_row"]
+        return reader
+
     @staticmethod
     def from_row(row: tuple) -> "ChatMessage":
-        """Create from database row"""
-        return ChatMessage(
-            id=row[0] if len(row) > 0 else None,
-            chat_id=row[1] if len(row) > 1 else None,
-            message_type=row[2] if len(row) > 2 else None,
-            content=row[3] if len(row) > 3 else None,
-            query_intent=row[4] if len(row) > 4 else None,
-            data_points=row[5] if len(row) > 5 else None,
-            prompt=row[6] if len(row) > 6 else None,
-            llm_response=row[7] if len(row) > 7 else None,
-            summary=row[8] if len(row) > 8 else None,
-            token_count=row[9] if len(row) > 9 else None,
-            timestamp=(
-                datetime.fromisoformat(row[10]) if len(row) > 10 and row[10] else None
-            ),
-        )
+        """Create from a full chat_messages row"""
+        if len(row) != len(_ROW_COLUMNS):
+            raise ValueError(
+                f"Expected {len(_ROW_COLUMNS)} columns in chat_messages row, got {len(row)}"
+            )
+        return ChatMessage.compile_row_reader(_ROW_COLUMNS)(row)
+
+    @staticmethod
+    def from_partial_row(row: tuple) -> "ChatMessage":
+        """Create from a row that may omit trailing columns"""
+        return ChatMessage.compile_row_reader(_ROW_COLUMNS[: len(row)])(row)
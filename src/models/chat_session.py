@@ -7,8 +7,10 @@ from dataclasses import dataclass
 from typing import Optional, Dict, Any
 from datetime import datetime
 
+from ..common.date_utils import parse_iso_datetime
 
-@dataclass
+
+@dataclass(slots=True)
 class ChatSession:
     """Represents a chat session in the chat_sessions table"""
 
@@ -39,12 +41,12 @@ class ChatSession:
             chat_id=data["chat_id"],
             user_id=data.get("user_id"),
             created_at=(
-                datetime.fromisoformat(data["created_at"])
+                parse_iso_datetime(data["created_at"])
                 if data.get("created_at")
                 else None
             ),
             last_activity=(
-                datetime.fromisoformat(data["last_activity"])
+                parse_iso_datetime(data["last_activity"])
                 if data.get("last_activity")
                 else None
             ),
@@ -54,16 +56,20 @@ class ChatSession:
 
     @staticmethod
     def from_row(row: tuple) -> "ChatSession":
-        """Create from database row"""
+        """Create from a full chat_sessions row"""
+        chat_id, user_id, created_at, last_activity, context_summary, metadata = row
         return ChatSession(
-            chat_id=row[0],
-            user_id=row[1] if len(row) > 1 else None,
-            created_at=(
-                datetime.fromisoformat(row[2]) if len(row) > 2 and row[2] else None
-            ),
+            chat_id=chat_id,
+            user_id=user_id,
+            created_at=parse_iso_datetime(created_at) if created_at else None,
             last_activity=(
-                datetime.fromisoformat(row[3]) if len(row) > 3 and row[3] else None
+                parse_iso_datetime(last_activity) if last_activity else None
             ),
-            context_summary=row[4] if len(row) > 4 else None,
-            metadata=row[5] if len(row) > 5 else None,
+            context_summary=context_summary,
+            metadata=metadata,
         )
+
+    @staticmethod
+    def from_partial_row(row: tuple) -> "ChatSession":
+        """Create from a row that may omit trailing columns"""
+        return ChatSession.from_row(tuple(row) + (None,) * (6 - len(row)))
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Optional, Dict, Any, List
 
 
-@dataclass
+@dataclass(slots=True)
 class DataIngestionRequest:
     """Request model for data ingestion"""
 
@@ -14,7 +14,7 @@ class DataIngestionRequest:
         return {"source": self.source, "data": self.data}
 
 
-@dataclass
+@dataclass(slots=True)
 class DataIngestionResponse:
     """Response model for data ingestion"""
 
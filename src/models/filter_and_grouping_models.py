@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Optional, Any, List, Dict
 
 
-@dataclass
+@dataclass(slots=True)
 class FilterRequest:
     """Request model for filter conditions"""
 
@@ -12,7 +12,7 @@ class FilterRequest:
     value_list: Optional[List[Any]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class GroupedMetricsRequest:
     """Request model for grouped metrics query"""
 
@@ -22,7 +22,7 @@ class GroupedMetricsRequest:
     limit: int = 100
 
 
-@dataclass
+@dataclass(slots=True)
 class GroupedMetricsResponse:
     """Response model for grouped metrics"""
 
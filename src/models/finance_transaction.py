@@ -5,7 +5,7 @@ from decimal import Decimal
 from ..common.enums import DerivedSubType, DataSource, Currency
 
 
-@dataclass
+@dataclass(slots=True)
 class FinanceTransaction:
     """Represents a transaction in the finance_transactions table"""
 
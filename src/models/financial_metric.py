@@ -1,12 +1,50 @@
 from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Optional, Dict, Any
 from decimal import Decimal
+
 from ..common.enums import AccountType, DataSource, Currency
 from .account import Account
 from .finance_transaction import FinanceTransaction
 
+# String to enum lookups keyed by the canonical case; callers try the raw
+# string first so already-canonical values skip the case conversion
+_ACCOUNT_TYPE_MAP = MappingProxyType(
+    {
+        "revenue": AccountType.REVENUE,
+        "cogs": AccountType.COGS,
+        "expense": AccountType.EXPENSE,
+        "tax": AccountType.TAX,
+        "derived": AccountType.DERIVED,
+    }
+)
+_CURRENCY_MAP = MappingProxyType(
+    {
+        "USD": Currency.USD,
+        "EUR": Currency.EUR,
+        "GBP": Currency.GBP,
+        "CAD": Currency.CAD,
+        "AUD": Currency.AUD,
+        "JPY": Currency.JPY,
+        "INR": Currency.INR,
+    }
+)
+_SOURCE_MAP = MappingProxyType(
+    {
+        "pl_report": DataSource.PL_REPORT,
+        "rootfi_report": DataSource.ROOTFI_REPORT,
+    }
+)
+
+
+@lru_cache(maxsize=4096, typed=True)
+def _to_decimal(value: float) -> Decimal:
+    """Exact Decimal of the value's shortest string form, cached for repeated amounts"""
+    return Decimal(str(value))
+
 
-@dataclass
+@dataclass(slots=True)
 class FinancialMetric:
     """Legacy class for backward compatibility - maps to new schema"""
 
@@ -60,16 +98,9 @@ class FinancialMetric:
 
     def to_account(self) -> Account:
         """Convert to new Account model"""
-        # Map account type string to enum
-        type_mapping = {
-            "revenue": AccountType.REVENUE,
-            "cogs": AccountType.COGS,
-            "expense": AccountType.EXPENSE,
-            "tax": AccountType.TAX,
-            "derived": AccountType.DERIVED,
-        }
-
-        account_type = type_mapping.get(self.account_type.lower(), AccountType.REVENUE)
+        account_type = _ACCOUNT_TYPE_MAP.get(
+            self.account_type
+        ) or _ACCOUNT_TYPE_MAP.get(self.account_type.lower(), AccountType.REVENUE)
 
         return Account(
             name=self.account_name,
@@ -81,32 +112,18 @@ class FinancialMetric:
 
     def to_transaction(self, account_id: int) -> FinanceTransaction:
         """Convert to new FinanceTransaction model"""
-        # Map currency string to enum
-        currency_mapping = {
-            "USD": Currency.USD,
-            "EUR": Currency.EUR,
-            "GBP": Currency.GBP,
-            "CAD": Currency.CAD,
-            "AUD": Currency.AUD,
-            "JPY": Currency.JPY,
-            "INR": Currency.INR,
-        }
-
-        currency = currency_mapping.get(self.currency.upper(), Currency.USD)
-
-        # Map source string to enum
-        source_mapping = {
-            "pl_report": DataSource.PL_REPORT,
-            "rootfi_report": DataSource.ROOTFI_REPORT,
-        }
-
-        source_id = source_mapping.get(self.source_id.lower(), DataSource.PL_REPORT)
+        currency = _CURRENCY_MAP.get(self.currency) or _CURRENCY_MAP.get(
+            self.currency.upper(), Currency.USD
+        )
+        source_id = _SOURCE_MAP.get(self.source_id) or _SOURCE_MAP.get(
+            self.source_id.lower(), DataSource.PL_REPORT
+        )
 
         return FinanceTransaction(
             account_id=account_id,
             period_start=self.period_start,
             period_end=self.period_end,
-            value=Decimal(str(self.value)),
+            value=_to_decimal(self.value),
             currency=currency,
             source_id=source_id,
             notes=self.description,
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from typing import Optional, Dict, Any, List, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from enum import Enum, auto
 
 
@@ -38,14 +38,15 @@ class AIQueryRequest(BaseModel):
     )
     user_id: Optional[str] = Field(None, description="User ID for personalization")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "query": "What is the total revenue for this quarter?",
                 "chat_id": "chat_20250119_123456_user123",
                 "user_id": "user123",
             }
         }
+    )
 
 
 class AIQueryResponse(BaseModel):
@@ -96,6 +97,11 @@ class TransactionResponse(BaseModel):
     source_id: int
     source_id_localized: Optional[str] = None
 
+    @classmethod
+    def from_trusted_row(cls, row: Dict[str, Any]) -> "TransactionResponse":
+        """Create from a transaction store row without validation (row types are already correct)"""
+        return cls.model_construct(**row)
+
 
 class TransactionListResponse(BaseModel):
     """Transaction list response model"""
@@ -298,7 +304,7 @@ class PeriodQueryResponse(BaseModel):
 
 
 # Legacy Query Models (keeping for backward compatibility)
-@dataclass
+@dataclass(slots=True)
 class QueryRequest:
     """Request model for natural language queries"""
 
@@ -310,7 +316,7 @@ class QueryRequest:
         return {"query": self.query, "context": self.context}
 
 
-@dataclass
+@dataclass(slots=True)
 class QueryResponse:
     """Response model for natural language queries"""
 
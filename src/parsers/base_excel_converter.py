@@ -3,36 +3,167 @@ Base Excel Converter
 Shared functionality for JSON to Excel converters
 """
 
-import json
-from typing import Dict, List, Any, Set
+import csv
+import os
+from contextlib import suppress
+from functools import cached_property
+from json.encoder import encode_basestring
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 from abc import ABC, abstractmethod
 
-# openpyxl is required at runtime for Excel output. We import it lazily-friendly,
-# but fail fast with a clear error the moment Excel creation is attempted.
+from ..common.json_codec import json_dumps, json_loads
+from .fast_xlsx_writer import FastXlsxWorkbook
+
+# ijson is optional; without it JSON inputs are loaded whole with the json module
 try:
-    from openpyxl import Workbook  # type: ignore
+    import ijson  # type: ignore
 except ImportError:  # pragma: no cover - environment specific
-    Workbook = None  # type: ignore[assignment]
+    ijson = None  # type: ignore[assignment]
+
+# Output formats accepted by BaseJsonToExcelConverter.convert
+_OUTPUT_FORMATS = ("xlsx", "csv")
+
+# CSV file buffer; rows are written in many small chunks
+_SAVE_BUFFER_BYTES = 1 << 20
+
+# Below this size a whole-document parse is faster than ijson and memory is no concern
+_STREAM_MIN_BYTES = 10 * 1024 * 1024
 
 
-def _require_openpyxl():
-    """Ensure openpyxl is available before attempting Excel operations."""
-    if Workbook is None:
-        raise ImportError(
-            "openpyxl is required to export Excel files. Please install openpyxl."
+class _CsvSheet:
+    """Append-only CSV file for one sheet"""
+
+    __slots__ = ("append", "_file", "_path")
+
+    def __init__(self, path: str):
+        self._path = path
+        self._file = open(
+            path, "w", newline="", encoding="utf-8", buffering=_SAVE_BUFFER_BYTES
         )
+        # csv.writer's writerow is the row writer; no per-row wrapper call
+        self.append = csv.writer(self._file).writerow
+
+    def _close(self) -> None:
+        self._file.close()
+
+
+class _CsvWorkbook:
+    """
+    Directory of CSV files, one "<sheet title>.csv" per sheet, behind the
+    subset of the write-only openpyxl API the converters use: create_sheet(),
+    append(), save(). Used as a context manager, the sheet files are
+    discarded on exit unless the workbook was saved.
+    """
+
+    def __init__(self, output_dir: str):
+        self._output_dir = output_dir
+        self._sheets: List[_CsvSheet] = []
+        os.makedirs(output_dir, exist_ok=True)
+
+    def __enter__(self) -> "_CsvWorkbook":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.discard()
+
+    def create_sheet(self, title: str) -> _CsvSheet:
+        """Start the CSV file for a sheet and return its row writer"""
+        if not title or os.sep in title or (os.altsep and os.altsep in title):
+            raise ValueError(f"Invalid sheet title for a CSV file name: {title!r}")
+        sheet = _CsvSheet(os.path.join(self._output_dir, f"{title}.csv"))
+        self._sheets.append(sheet)
+        return sheet
+
+    def save(self, output_dir: str) -> None:
+        """Close every sheet's file; the workbook writes only to the directory it was created for"""
+        if output_dir != self._output_dir:
+            raise ValueError(
+                f"Workbook was created for '{self._output_dir}', not '{output_dir}'"
+            )
+        for sheet in self._sheets:
+            sheet._close()
+        self._sheets = []
 
+    def discard(self) -> None:
+        """Close and delete the sheet files written so far; no-op once saved"""
+        for sheet in self._sheets:
+            sheet._close()
+            with suppress(FileNotFoundError):
+                os.remove(sheet._path)
+        self._sheets = []
 
-def _create_workbook():
-    """Create and return a new openpyxl Workbook instance."""
-    _require_openpyxl()
-    return Workbook()
+
+def _create_workbook(output_path: str, output_format: str = "xlsx"):
+    """
+    Create and return a new write-only workbook.
+
+    Write-only workbooks stream rows to disk: sheets are created with
+    create_sheet() and filled strictly in order with sheet.append().
+    xlsx output is written by FastXlsxWorkbook at output_path; output_format
+    "csv" writes a directory of per-sheet CSV files at output_path. Use the
+    workbook as a context manager so a failed conversion leaves no partial
+    output behind.
+    """
+    if output_format == "csv":
+        return _CsvWorkbook(output_path)
+    return FastXlsxWorkbook(output_path)
 
 
 def _write_headers(sheet, headers: List[str]) -> None:
     """Write a header row (row=1) with the provided column names."""
-    for i, header in enumerate(headers, start=1):
-        sheet.cell(row=1, column=i, value=header)
+    sheet.append(headers)
+
+
+# Metadata for an empty path as (category fields, hierarchy items, depth); see
+# _extend_metadata
+_ROOT_METADATA: Tuple[str, str, int] = ("", "", 0)
+
+
+def _extend_metadata(
+    parent: Tuple[str, str, int], category: Any
+) -> Tuple[str, str, int]:
+    """
+    Metadata parts for a path one category deeper than parent
+
+    Children build on their parent's already-encoded parts, so each category
+    is JSON-encoded once per row instead of once per row per ancestor.
+    Empty categories count towards the depth but are otherwise skipped.
+    """
+    fields, hierarchy, depth = parent
+    depth += 1
+    if category:
+        encoded = (
+            encode_basestring(category)
+            if category.__class__ is str
+            else json_dumps(category)
+        )
+        fields = f'{fields}"category{depth}":{encoded},'
+        hierarchy = f"{hierarchy},{encoded}" if hierarchy else encoded
+    return fields, hierarchy, depth
+
+
+def _metadata_parts(path: Sequence[Any]) -> Tuple[str, str, int]:
+    """_extend_metadata parts for a whole path"""
+    parts = _ROOT_METADATA
+    for category in path:
+        parts = _extend_metadata(parts, category)
+    return parts
+
+
+def _render_metadata(parts: Tuple[str, str, int]) -> str:
+    """Compact metadata JSON, as json_dumps would produce, from _extend_metadata parts"""
+    fields, hierarchy, depth = parts
+    return f'{{{fields}"hierarchy":[{hierarchy}],"hierarchy_level":{depth}}}'
 
 
 class BaseJsonToExcelConverter(ABC):
@@ -42,14 +173,103 @@ class BaseJsonToExcelConverter(ABC):
     """
 
     def __init__(self):
+        # Unique category paths collected for the current sheet
         self.category_paths: Set[str] = set()
+        # Every proper " > " prefix of a collected path, i.e. paths with children
+        self._parent_paths: Set[str] = set()
+        # Per-converter memo tables; results depend only on the arguments and
+        # the converter's fixed type maps
+        self._sub_type_cache: Dict[Tuple[str, Optional[str]], Optional[str]] = {}
+        self._is_derived_valid_cache: Dict[Tuple[str, str], bool] = {}
 
-    @abstractmethod
     def convert_to_excel(self, input_json_path: str, output_excel_path: str) -> str:
-        """Convert JSON file to Excel format"""
+        """
+        Convert JSON file to Excel format
+
+        Args:
+            input_json_path: Path to input JSON file
+            output_excel_path: Path to output Excel file
+
+        Returns:
+            Path to created Excel file
+        """
+        return self.convert(input_json_path, output_excel_path)
+
+    def convert(
+        self, input_json_path: str, output_path: str, output_format: str = "xlsx"
+    ) -> str:
+        """
+        Convert JSON file to an xlsx workbook or to CSV
+
+        CSV skips the XML and zip work of xlsx for consumers that only need
+        the tables; it is written as a directory at output_path holding one
+        "<sheet title>.csv" file per sheet.
+
+        Args:
+            input_json_path: Path to input JSON file
+            output_path: Path to output xlsx file, or output directory for CSV
+            output_format: "xlsx" or "csv"
+
+        Returns:
+            output_path
+        """
+        if output_format not in _OUTPUT_FORMATS:
+            raise ValueError(
+                f"Unsupported output format '{output_format}'. "
+                f"Expected one of: {', '.join(_OUTPUT_FORMATS)}"
+            )
+        return self._write_output(input_json_path, output_path, output_format)
+
+    @abstractmethod
+    def _write_output(
+        self, input_json_path: str, output_path: str, output_format: str
+    ) -> str:
+        """
+        Write the converted sheets to a workbook from
+        _create_workbook(output_path, output_format), entered as a context
+        manager, and save it to output_path
+
+        Converters whose input is a list of independent records should read it
+        with _iter_json_items so rows are emitted without loading the whole file
+        """
         pass
 
+    def _iter_json_items(self, input_json_path: str, array_path: str) -> Iterator[Any]:
+        """
+        Iterate the elements of a JSON array, streaming with ijson when installed
+        and the file is at least _STREAM_MIN_BYTES
+
+        Args:
+            input_json_path: Path to input JSON file
+            array_path: Dotted key path to the array (e.g., "data")
+
+        Yields:
+            Array elements, decoded as by json_loads
+        """
+        with open(input_json_path, "rb") as f:
+            if ijson is not None and os.fstat(f.fileno()).st_size >= _STREAM_MIN_BYTES:
+                yield from ijson.items(f, f"{array_path}.item", use_float=True)
+                return
+
+            node = json_loads(f.read())
+            for key in array_path.split("."):
+                node = node[key]
+            yield from node
+
     def _get_sub_type(self, group: str, sub_category: str = None) -> str:
+        """
+        Determine sub_type based on group and subCategory, memoized per converter
+        """
+        cache_key = (group, sub_category)
+        try:
+            return self._sub_type_cache[cache_key]
+        except KeyError:
+            sub_type = self._sub_type_cache[cache_key] = self._compute_sub_type(
+                group, sub_category
+            )
+            return sub_type
+
+    def _compute_sub_type(self, group: str, sub_category: str = None) -> str:
         """
         Determine sub_type based on group and subCategory
         Override in subclasses for specific logic
@@ -80,6 +300,17 @@ class BaseJsonToExcelConverter(ABC):
         return None
 
     def _validate_is_derived(self, group: str, type_str: str) -> bool:
+        """Validate if is_derived is correct based on group and type, memoized per converter"""
+        cache_key = (group, type_str)
+        try:
+            return self._is_derived_valid_cache[cache_key]
+        except KeyError:
+            is_valid = self._is_derived_valid_cache[cache_key] = (
+                self._compute_is_derived_valid(group, type_str)
+            )
+            return is_valid
+
+    def _compute_is_derived_valid(self, group: str, type_str: str) -> bool:
         """Validate if is_derived is correct based on group and type"""
         should_be_derived = (
             type_str == "derived" or group.lower() in self.derived_subtype_map
@@ -87,24 +318,40 @@ class BaseJsonToExcelConverter(ABC):
         is_derived = type_str == "derived" or group.lower() in self.derived_subtype_map
         return should_be_derived == is_derived
 
+    @cached_property
+    def _non_derived_keys(self) -> FrozenSet[str]:
+        """
+        Lowercase groups whose rows are not derived: groups missing from
+        account_type_map default to "derived", so is_derived for a group is
+        just group.lower() not in this set
+        """
+        return frozenset(
+            key
+            for key, type_str in self.account_type_map.items()
+            if type_str != "derived"
+        ) - frozenset(self.derived_subtype_map)
+
+    def _add_category_path(self, category_path: str) -> None:
+        """Record a category path and each of its parent paths"""
+        self.category_paths.add(category_path)
+        parents = self._parent_paths
+        index = category_path.find(" > ")
+        while index != -1:
+            parents.add(category_path[:index])
+            index = category_path.find(" > ", index + 1)
+
+    def _clear_category_paths(self) -> None:
+        """Forget collected category paths before the next sheet"""
+        self.category_paths.clear()
+        self._parent_paths.clear()
+
     def _has_child_paths(self, category_path: str) -> bool:
         """Check if the category_path has child paths"""
-        for path in self.category_paths:
-            if path.startswith(category_path + " > ") and path != category_path:
-                return True
-        return False
+        return category_path in self._parent_paths
 
-    def _create_metadata(self, path: List[str]) -> str:
+    def _create_metadata(self, path: Sequence[str]) -> str:
         """Create metadata as a JSON object with category1, category2, etc., and hierarchy_level"""
-        metadata = {}
-        hierarchy = []
-        for i, category in enumerate(path):
-            if category:
-                metadata[f"category{i+1}"] = category
-                hierarchy.append(category)
-        metadata["hierarchy"] = hierarchy
-        metadata["hierarchy_level"] = len(path)
-        return json.dumps(metadata)
+        return _render_metadata(_metadata_parts(path))
 
     @property
     @abstractmethod
@@ -5,23 +5,231 @@ Handles unique account creation and transaction assignment based on is_summary f
 """
 
 # Required imports
-from typing import Dict, List, Any, Optional, Tuple
-from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Any, Optional, Sequence, Tuple
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime
+from sys import intern
+import calendar
+import logging
+import os
 import re
+import sqlite3
+import threading
 
 # Required dependencies - fail fast if not available
 try:
-    from openpyxl import load_workbook
+    from openpyxl import Workbook, load_workbook
 except ImportError:
     raise ImportError(
         "openpyxl is required for Excel operations. Please install it with: pip install openpyxl"
     )
 
-from ..stores.database_manager import get_account_store, get_transaction_store
+# python-calamine is optional; it reads workbooks much faster than openpyxl
+try:
+    from python_calamine import CalamineWorkbook
+
+    CALAMINE_AVAILABLE = True
+except ImportError:  # pragma: no cover - environment specific
+    CALAMINE_AVAILABLE = False
+
+from ..stores.database_manager import (
+    get_account_store,
+    get_transaction_store,
+    get_database_manager,
+)
 from ..common.enums import DataSource, AccountType, RevenueSubType, DerivedSubType
 
+logger = logging.getLogger(__name__)
+
+# Monthly value column headers, e.g. 'Jan 2020'
+_MONTH_YEAR_RE = re.compile(
+    r"^(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{4})$"
+)
+_MONTH_MAP = {
+    "Jan": 1,
+    "Feb": 2,
+    "Mar": 3,
+    "Apr": 4,
+    "May": 5,
+    "Jun": 6,
+    "Jul": 7,
+    "Aug": 8,
+    "Sep": 9,
+    "Oct": 10,
+    "Nov": 11,
+    "Dec": 12,
+}
+
+# Headers of account and computed columns; every other column holds monthly values
+_NON_VALUE_HEADERS = frozenset(
+    [
+        "name",
+        "category_path",
+        "sub_category",
+        "type",
+        "sub_type",
+        "is_summary",
+        "is_derived",
+        "is_derived_correct",
+        "metadata",
+        "Computed Total",
+        "Total",
+        "Difference",
+    ]
+)
+
+# Last day of each month in a non-leap year
+_MONTH_LAST_DAY = {
+    1: 31,
+    2: 28,
+    3: 31,
+    4: 30,
+    5: 31,
+    6: 30,
+    7: 31,
+    8: 31,
+    9: 30,
+    10: 31,
+    11: 30,
+    12: 31,
+}
+
+# Serializes account get-or-create across importers running in parallel threads
+_account_creation_lock = threading.Lock()
+
+# Bumped under _account_creation_lock whenever an importer creates accounts,
+# so a manager can tell whether its warmed cache still covers every account
+_account_generation = 0
+
+# Connection settings for an import session: WAL lets readers run during the
+# import and NORMAL skips the per-commit fsync that WAL does not need. Sync
+# workers importing into a file database queue on BEGIN IMMEDIATE, so each
+# waits up to a whole import for the write lock instead of the default 5 s
+_IMPORT_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=120000",
+)
+
+# Most accounts an AccountManager keeps cached before evicting the least recent
+_ACCOUNT_CACHE_SIZE = 4096
+
+# Composite account key used by the store: (name, category_path, type, sub_type)
+_AccountKey = Tuple[str, str, int, Optional[int]]
+
+
+@dataclass(slots=True, frozen=True)
+class _AccountColumns:
+    """0-based row tuple indices of the account columns; -1 when a header is missing"""
+
+    name: int
+    category_path: int
+    sub_category: int
+    type: int
+    sub_type: int
+    is_summary: int
+    is_derived: int
+    metadata: int
+
+    @classmethod
+    def from_header_map(cls, header_map: Dict[str, int]) -> "_AccountColumns":
+        """Resolve column indices once per sheet from the header mapping"""
+        return cls(
+            name=header_map.get("name", 0) - 1,
+            category_path=header_map.get("category_path", 0) - 1,
+            sub_category=header_map.get("sub_category", 0) - 1,
+            type=header_map.get("type", 0) - 1,
+            sub_type=header_map.get("sub_type", 0) - 1,
+            is_summary=header_map.get("is_summary", 0) - 1,
+            is_derived=header_map.get("is_derived", 0) - 1,
+            metadata=header_map.get("metadata", 0) - 1,
+        )
+
+    @property
+    def complete(self) -> bool:
+        """Whether every account column is present"""
+        return (
+            min(
+                self.name,
+                self.category_path,
+                self.sub_category,
+                self.type,
+                self.sub_type,
+                self.is_summary,
+                self.is_derived,
+                self.metadata,
+            )
+            >= 0
+        )
+
+    @property
+    def width(self) -> int:
+        """Number of values a row needs to cover every account column"""
+        return (
+            max(
+                self.name,
+                self.category_path,
+                self.sub_category,
+                self.type,
+                self.sub_type,
+                self.is_summary,
+                self.is_derived,
+                self.metadata,
+            )
+            + 1
+        )
+
+    def compile_parser(self) -> Callable[[Sequence[Any]], Optional[Dict[str, Any]]]:
+        """
+        Get a row parser specialized for these column positions
+
+        The parser is generated once per column layout and reads each account
+        field by a fixed index, returning the same dict as _extract_account_data.
+        """
+        parser = _account_parsers.get(self)
+        if parser is not None:
+            return parser
+
+        if not self.complete:
+            # Rows without all account columns cannot describe an account
+            source = "def _parse_account(row):\n    return None\n"
+        else:
+            width = self.width
+            source = (
+                "def _parse_account(row):\n"
+                # Read-only rows can be shorter than the header when trailing cells are empty
+                f"    if len(row) < {width}:\n"
+                f"        row = tuple(row) + (None,) * ({width} - len(row))\n"
+                f"    name = row[{self.name}]\n"
+                "    if not name:\n"
+                "        return None\n"
+                "    return {\n"
+                '        "name": _intern(str(name)),\n'
+                f'        "category_path": _intern(str(row[{self.category_path}] or "")),\n'
+                f'        "sub_category": _intern(str(row[{self.sub_category}] or "")),\n'
+                f'        "type_str": str(row[{self.type}] or "derived"),\n'
+                f'        "sub_type_str": row[{self.sub_type}],\n'
+                f'        "is_summary": bool(row[{self.is_summary}]),\n'
+                f'        "is_derived": bool(row[{self.is_derived}]),\n'
+                f'        "metadata": _intern(str(row[{self.metadata}] or "")),\n'
+                "    }\n"
+            )
+
+        namespace = {"_intern": intern}
+        exec(compile(source, f"<account_parser {self}>", "exec"), namespace)
+        parser = _account_parsers[self] = namespace["_parse_account"]
+        return parser
+
+
+# Generated row parsers, one per account column layout
+_account_parsers: Dict[
+    _AccountColumns, Callable[[Sequence[Any]], Optional[Dict[str, Any]]]
+] = {}
+
 
 class AccountManager:
     """
@@ -33,8 +241,26 @@ class AccountManager:
         self.account_store = get_account_store()
         self.transaction_store = get_transaction_store()
 
-        # Cache for account lookups to avoid repeated database queries
-        self._account_cache: Dict[str, int] = {}  # name -> account_id mapping
+        # LRU cache for account lookups to avoid repeated database queries,
+        # keyed like the store's composite key
+        self._account_cache: "OrderedDict[_AccountKey, int]" = OrderedDict()
+        # Account generation the cache holds every account for, None when partial
+        self._cache_generation: Optional[int] = None
+
+        # Transactions waiting to be inserted in one batch
+        self._tx_buffer: List[Dict[str, Any]] = []
+
+        # Accounts waiting to be inserted in one batch; until then they are
+        # known by temporary negative IDs (-1 is the first queued account)
+        self._pending_accounts: List[Dict[str, Any]] = []
+        self._pending_ids: Dict[_AccountKey, int] = {}
+        # Account generation when the first pending account was looked up
+        self._pending_generation: Optional[int] = None
+
+        # Whether flushes run inside import_session's transaction, and whether
+        # they created accounts that become visible when it commits
+        self._in_session = False
+        self._session_created_accounts = False
 
     def get_or_create_account(
         self,
@@ -61,27 +287,43 @@ class AccountManager:
             description: Account description/metadata
 
         Returns:
-            Account ID (None if is_summary is True)
+            Account ID (None if is_summary is True); new accounts get a temporary
+            negative ID that queue_transaction accepts until flush_accounts
         """
         # Don't create accounts if is_summary is True
         if is_summary:
             return None
 
         # Check cache first
-        cache_key = f"{name}_{category_path}_{account_type}_{sub_type}"
-        if cache_key in self._account_cache:
-            return self._account_cache[cache_key]
+        cache_key = (name, category_path, account_type, sub_type)
+        account_id = self._account_cache.get(cache_key)
+        if account_id is not None:
+            self._account_cache.move_to_end(cache_key)
+            return account_id
+
+        # Accounts queued by this manager are not in the database yet
+        account_id = self._pending_ids.get(cache_key)
+        if account_id is not None:
+            self._cache_account(cache_key, account_id)
+            return account_id
+
+        # Lookups must not interleave with another importer's account flush
+        with _account_creation_lock:
+            # A complete, current cache already answers "does it exist"
+            if self._cache_generation != _account_generation:
+                # Check if account exists in database using composite key
+                existing_account = self.account_store.get_account_by_composite_key(
+                    name, category_path, account_type, sub_type
+                )
 
-        # Check if account exists in database using composite key
-        existing_account = self.account_store.get_account_by_composite_key(
-            name, category_path, account_type, sub_type
-        )
+                if existing_account:
+                    self._cache_account(cache_key, existing_account["account_id"])
+                    return existing_account["account_id"]
 
-        if existing_account:
-            self._account_cache[cache_key] = existing_account["account_id"]
-            return existing_account["account_id"]
+            if not self._pending_accounts:
+                self._pending_generation = _account_generation
 
-        # Create new account
+        # Create new account with the next batch
         account_data = {
             "name": name,
             "category_path": category_path,
@@ -94,11 +336,133 @@ class AccountManager:
             "is_active": True,
         }
 
-        account_id = self.account_store.create_account(account_data)
-        self._account_cache[cache_key] = account_id
+        return self.queue_account(cache_key, account_data)
+
+    def queue_account(
+        self, cache_key: _AccountKey, account_data: Dict[str, Any]
+    ) -> int:
+        """
+        Queue an account for creation; inserted on flush_accounts
+
+        Args:
+            cache_key: Composite key (name, category_path, type, sub_type)
+            account_data: Account fields as accepted by the account store
 
+        Returns:
+            Temporary negative account ID
+        """
+        self._pending_accounts.append(account_data)
+        account_id = -len(self._pending_accounts)
+        self._pending_ids[cache_key] = account_id
+        self._cache_account(cache_key, account_id)
         return account_id
 
+    def flush_accounts(self) -> int:
+        """
+        Insert all queued accounts in a single batch and give queued
+        transactions their real account IDs
+
+        Returns:
+            Number of accounts inserted
+        """
+        if not self._pending_accounts:
+            return 0
+
+        with _account_creation_lock:
+            account_ids: List[Optional[int]] = [None] * len(self._pending_accounts)
+
+            # Another importer may have created some of them since they were
+            # looked up. A session holds the write lock, so every other
+            # importer's accounts are committed and visible now; their
+            # generation bump may still be pending, so always check then
+            if self._in_session or self._pending_generation != _account_generation:
+                # One query for every key; the oldest account wins a duplicate
+                existing_ids: Dict[_AccountKey, int] = {}
+                for (
+                    name,
+                    category_path,
+                    account_type,
+                    sub_type,
+                    account_id,
+                ) in self.account_store.get_account_composite_keys():
+                    existing_ids.setdefault(
+                        (name, category_path, account_type, sub_type), account_id
+                    )
+                for cache_key, temp_id in self._pending_ids.items():
+                    account_ids[-temp_id - 1] = existing_ids.get(cache_key)
+
+            new_indexes = [
+                index
+                for index, account_id in enumerate(account_ids)
+                if account_id is None
+            ]
+            created_ids = self.account_store.create_accounts_bulk(
+                [self._pending_accounts[index] for index in new_indexes],
+                commit=not self._in_session,
+            )
+            for index, account_id in zip(new_indexes, created_ids):
+                account_ids[index] = account_id
+
+            if created_ids:
+                if self._in_session:
+                    # Other importers must not see a new generation before
+                    # the accounts are committed
+                    self._session_created_accounts = True
+                else:
+                    self._bump_account_generation()
+
+        for cache_key, temp_id in self._pending_ids.items():
+            if cache_key in self._account_cache:
+                self._account_cache[cache_key] = account_ids[-temp_id - 1]
+        for transaction_data in self._tx_buffer:
+            if transaction_data["account_id"] < 0:
+                transaction_data["account_id"] = account_ids[
+                    -transaction_data["account_id"] - 1
+                ]
+
+        self._reset_pending_accounts()
+        return len(created_ids)
+
+    def _bump_account_generation(self) -> None:
+        """Announce new accounts; call under _account_creation_lock"""
+        global _account_generation
+
+        cache_was_current = self._cache_generation == _account_generation
+        _account_generation += 1
+        if cache_was_current:
+            self._cache_generation = _account_generation
+
+    def _reset_pending_accounts(self) -> None:
+        """Forget queued accounts"""
+        self._pending_accounts = []
+        self._pending_ids = {}
+        self._pending_generation = None
+
+    def warm_cache(self) -> None:
+        """Load every existing account into the cache with a single query"""
+        with _account_creation_lock:
+            self._account_cache.clear()
+            self._cache_generation = _account_generation
+            for (
+                name,
+                category_path,
+                account_type,
+                sub_type,
+                account_id,
+            ) in self.account_store.get_account_composite_keys():
+                cache_key = (name, category_path, account_type, sub_type)
+                # Keep the oldest account when a key is duplicated
+                if cache_key not in self._account_cache:
+                    self._cache_account(cache_key, account_id)
+
+    def _cache_account(self, cache_key: _AccountKey, account_id: int) -> None:
+        """Remember an account ID, evicting the least recently used beyond the limit"""
+        self._account_cache[cache_key] = account_id
+        if len(self._account_cache) > _ACCOUNT_CACHE_SIZE:
+            self._account_cache.popitem(last=False)
+            # Misses may now be evicted accounts, so they must hit the database
+            self._cache_generation = None
+
     def create_transaction(
         self,
         account_id: int,
@@ -140,9 +504,115 @@ class AccountManager:
         transaction_id = self.transaction_store.create_transaction(transaction_data)
         return transaction_id
 
+    def queue_transaction(
+        self,
+        account_id: int,
+        period_start: str,
+        period_end: str,
+        value: float,
+        currency: int = 1,
+        derived_sub_type: Optional[int] = None,
+        source_id: int = 1,
+        notes: str = "",
+    ) -> None:
+        """
+        Queue a transaction for the given account; inserted on flush_transactions
+
+        Args:
+            account_id: Account ID
+            period_start: Period start date
+            period_end: Period end date
+            value: Transaction value
+            currency: Currency code
+            derived_sub_type: Derived sub type
+            source_id: Source ID
+            notes: Transaction notes
+        """
+        self._tx_buffer.append(
+            {
+                "account_id": account_id,
+                "period_start": period_start,
+                "period_end": period_end,
+                "value": value,
+                "currency": currency,
+                "derived_sub_type": derived_sub_type,
+                "source_id": source_id,
+                "notes": notes,
+            }
+        )
+
+    def flush_transactions(self) -> int:
+        """
+        Insert all queued transactions in a single batch
+
+        Returns:
+            Number of transactions inserted
+        """
+        # Pending accounts go first so the transactions carry real IDs
+        self.flush_accounts()
+        if not self._tx_buffer:
+            return 0
+        try:
+            return self.transaction_store.create_transactions_bulk(
+                self._tx_buffer, commit=not self._in_session
+            )
+        finally:
+            self._tx_buffer = []
+
+    @contextmanager
+    def import_session(self) -> Iterator[None]:
+        """
+        Run the enclosed flushes as a single SQLite transaction
+
+        Applies the bulk-write pragmas, opens the transaction with BEGIN
+        IMMEDIATE, commits on exit and rolls back if the block raises.
+        """
+        connection = self.transaction_store.get_connection()
+        if self._in_session or connection.in_transaction:
+            # Someone else owns the open transaction and its commit
+            yield
+            return
+
+        for pragma in _IMPORT_PRAGMAS:
+            try:
+                connection.execute(pragma)
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Could not apply '{pragma}': {e}")
+
+        connection.execute("BEGIN IMMEDIATE")
+        self._in_session = True
+        try:
+            yield
+        except BaseException:
+            connection.rollback()
+            # Cached IDs of the rolled back accounts are no longer valid
+            self.clear_cache()
+            raise
+        else:
+            connection.commit()
+            if self._session_created_accounts:
+                with _account_creation_lock:
+                    # Lookups during the session may have cached the accounts
+                    # as missing; they exist now
+                    self.account_store.clear_cache()
+                    self._bump_account_generation()
+            # Results cached while the writes were uncommitted are stale
+            get_database_manager().bump_data_version()
+        finally:
+            self._in_session = False
+            self._session_created_accounts = False
+
+    def discard_transactions(self) -> None:
+        """Drop queued transactions and accounts without inserting them"""
+        self._tx_buffer = []
+        for cache_key in self._pending_ids:
+            self._account_cache.pop(cache_key, None)
+        self._reset_pending_accounts()
+
     def clear_cache(self):
         """Clear the account cache"""
         self._account_cache.clear()
+        self._cache_generation = None
 
 
 class BaseExcelImporter(ABC):
@@ -175,56 +645,133 @@ class BaseExcelImporter(ABC):
             "other": DerivedSubType.OTHER,
         }
 
-    def import_excel_file(self, excel_file_path: str) -> Tuple[int, int]:
+        # Enum values resolved once so the row path is a single dict lookup
+        self._account_type_int = {
+            key: account_type.value
+            for key, account_type in self.account_type_map.items()
+        }
+        self._default_account_type_int = AccountType.DERIVED.value
+        self._sub_type_int = {
+            key: sub_type.value for key, sub_type in self.sub_type_map.items()
+        }
+
+        # Date columns per header row, shared by sheets with the same layout
+        self._date_columns_cache: Dict[Tuple[Any, ...], Dict[int, Tuple[str, str]]] = {}
+
+    def import_excel_file(
+        self, excel_file_path: str, workbook: Optional[Workbook] = None
+    ) -> Tuple[int, int]:
         """
         Import Excel file to database
 
         Args:
             excel_file_path: Path to Excel file
+            workbook: Optional read-only workbook already opened for this file;
+                it is used instead of reopening the file and closed afterwards
 
         Returns:
             Tuple of (accounts_created, transactions_created)
         """
-        try:
-            workbook = load_workbook(excel_file_path)
-            accounts_created = 0
-            transactions_created = 0
+        with closing(self._open_sheets(excel_file_path, workbook)) as sheets:
+            try:
+                # Existing accounts are resolved from memory instead of per-row lookups
+                self.account_manager.warm_cache()
 
-            for sheet_name in workbook.sheetnames:
-                sheet = workbook[sheet_name]
-                sheet_accounts, sheet_transactions = self._import_sheet(
-                    sheet, sheet_name
-                )
-                accounts_created += sheet_accounts
-                transactions_created += sheet_transactions
+                accounts_created = 0
+                transactions_created = 0
 
-            return accounts_created, transactions_created
+                for sheet_name, rows in sheets:
+                    sheet_accounts, sheet_transactions = self._import_sheet(
+                        rows, sheet_name
+                    )
+                    accounts_created += sheet_accounts
+                    transactions_created += sheet_transactions
+
+                # All of the file's accounts and transactions go in with one commit
+                with self.account_manager.import_session():
+                    self.account_manager.flush_transactions()
+                return accounts_created, transactions_created
+            finally:
+                self.account_manager.discard_transactions()
+
+    def _open_sheets(
+        self, excel_file_path: str, workbook: Optional[Workbook] = None
+    ) -> Iterator[Tuple[str, Iterator[Sequence[Any]]]]:
+        """
+        Yield (sheet_name, rows) for every sheet, header row first
 
-        except Exception as e:
-            raise
+        A pre-opened workbook is streamed as is. Otherwise uses python-calamine
+        when it is installed, unless USE_CALAMINE is set to something other than
+        "true"; otherwise openpyxl in read-only mode.
+        """
+        if workbook is not None:
+            return self._open_with_openpyxl(excel_file_path, workbook)
+        if CALAMINE_AVAILABLE and os.getenv("USE_CALAMINE", "true").lower() == "true":
+            return self._open_with_calamine(excel_file_path)
+        return self._open_with_openpyxl(excel_file_path)
+
+    @staticmethod
+    def _open_with_openpyxl(
+        excel_file_path: str, workbook: Optional[Workbook] = None
+    ) -> Iterator[Tuple[str, Iterator[Sequence[Any]]]]:
+        """Stream sheets with openpyxl read-only mode instead of building cells"""
+        if workbook is None:
+            workbook = load_workbook(excel_file_path, read_only=True, data_only=True)
+        try:
+            for sheet_name in workbook.sheetnames:
+                yield sheet_name, workbook[sheet_name].iter_rows(values_only=True)
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _open_with_calamine(
+        excel_file_path: str,
+    ) -> Iterator[Tuple[str, Iterator[Sequence[Any]]]]:
+        """Read sheets with python-calamine; empty cells come back as ''"""
+        workbook = CalamineWorkbook.from_path(excel_file_path)
+        try:
+            for sheet_name in workbook.sheet_names:
+                sheet = workbook.get_sheet_by_name(sheet_name)
+                # Keep the range anchored at A1 so column numbers match the header
+                yield sheet_name, iter(sheet.to_python(skip_empty_area=False))
+        finally:
+            close = getattr(workbook, "close", None)
+            if close is not None:
+                close()
 
     @abstractmethod
-    def _import_sheet(self, sheet, sheet_name: str) -> Tuple[int, int]:
-        """Import a single sheet - to be implemented by subclasses"""
+    def _import_sheet(
+        self, rows: Iterator[Sequence[Any]], sheet_name: str
+    ) -> Tuple[int, int]:
+        """Import a single sheet from its rows (header first) - to be implemented by subclasses"""
         pass
 
+    @staticmethod
+    def _row_value(row_values: Tuple, col: int) -> Any:
+        """Get a cell value from a row tuple by 1-based column number"""
+        if col < 1:
+            raise ValueError(f"Row or column values must be at least 1, got {col}")
+        # Read-only rows can be shorter than the header when trailing cells are empty
+        return row_values[col - 1] if col <= len(row_values) else None
+
     def _map_account_type(self, type_str: str) -> int:
         """Map account type string to enum value"""
-        return self.account_type_map.get(type_str.lower(), AccountType.DERIVED).value
+        return self._account_type_int.get(
+            type_str.lower(), self._default_account_type_int
+        )
 
     def _map_sub_type(self, sub_type_str: str) -> Optional[int]:
         """Map sub type string to enum value"""
         if not sub_type_str:
             return None
-        mapped_type = self.sub_type_map.get(sub_type_str.lower())
-        return mapped_type.value if mapped_type else None
+        return self._sub_type_int.get(sub_type_str.lower())
 
-    def _parse_headers(self, sheet) -> Dict[str, int]:
-        """Parse headers from sheet and return column mapping"""
+    def _parse_headers(self, header_row: Tuple) -> Dict[str, int]:
+        """Parse headers from the header row values and return column mapping"""
         headers = []
-        for cell in sheet[1]:
-            if cell.value:
-                headers.append(str(cell.value))
+        for value in header_row:
+            if value:
+                headers.append(str(value))
 
         header_map = {}
         for i, header in enumerate(headers):
@@ -233,120 +780,53 @@ class BaseExcelImporter(ABC):
         return header_map
 
     def _extract_account_data(
-        self, sheet, row_num: int, header_map: Dict[str, int]
+        self, row_values: Tuple, columns: _AccountColumns
     ) -> Optional[Dict[str, Any]]:
         """Extract account data from a row"""
-        try:
-            name = sheet.cell(row=row_num, column=header_map.get("name", 0)).value
-            if not name:
-                return None
-
-            return {
-                "name": str(name),
-                "category_path": str(
-                    sheet.cell(
-                        row=row_num, column=header_map.get("category_path", 0)
-                    ).value
-                    or ""
-                ),
-                "sub_category": str(
-                    sheet.cell(
-                        row=row_num, column=header_map.get("sub_category", 0)
-                    ).value
-                    or ""
-                ),
-                "type_str": str(
-                    sheet.cell(row=row_num, column=header_map.get("type", 0)).value
-                    or "derived"
-                ),
-                "sub_type_str": sheet.cell(
-                    row=row_num, column=header_map.get("sub_type", 0)
-                ).value,
-                "is_summary": bool(
-                    sheet.cell(
-                        row=row_num, column=header_map.get("is_summary", 0)
-                    ).value
-                ),
-                "is_derived": bool(
-                    sheet.cell(
-                        row=row_num, column=header_map.get("is_derived", 0)
-                    ).value
-                ),
-                "metadata": str(
-                    sheet.cell(row=row_num, column=header_map.get("metadata", 0)).value
-                    or ""
-                ),
-            }
-        except Exception as e:
-            pass
+        # The text fields repeat across rows and sheets, so the parser interns
+        # them; account cache key comparisons then become identity checks
+        return columns.compile_parser()(row_values)
 
     def _extract_date_from_header(self, header: str) -> Optional[datetime]:
         """Extract date from header string like 'Jan 2020', 'Feb 2021', etc."""
+        match = _MONTH_YEAR_RE.match(header.strip())
+        if not match:
+            return None
+
+        month_str, year_str = match.groups()
         try:
-            # Pattern to match month abbreviations and years
-            pattern = r"^(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{4})$"
-            match = re.match(pattern, header.strip())
-
-            if match:
-                month_str, year_str = match.groups()
-                month_map = {
-                    "Jan": 1,
-                    "Feb": 2,
-                    "Mar": 3,
-                    "Apr": 4,
-                    "May": 5,
-                    "Jun": 6,
-                    "Jul": 7,
-                    "Aug": 8,
-                    "Sep": 9,
-                    "Oct": 10,
-                    "Nov": 11,
-                    "Dec": 12,
-                }
-                month = month_map[month_str]
-                year = int(year_str)
-                return datetime(year, month, 1)  # First day of the month
-        except Exception:
-            pass
-        return None
+            return datetime(int(year_str), _MONTH_MAP[month_str], 1)  # First day
+        except ValueError:
+            # Out-of-range year such as 0000
+            return None
 
     def _extract_date_range_from_headers(
-        self, headers: List[str]
-    ) -> Dict[str, Tuple[str, str]]:
-        """Extract date ranges from headers and return column mapping with periods"""
-        date_columns = {}
-
-        # We need to work with actual column numbers, not filtered header indices
-        # So we'll iterate through the actual sheet columns
-        return date_columns
-
-    def _extract_date_range_from_sheet(self, sheet) -> Dict[int, Tuple[str, str]]:
-        """Extract date ranges from sheet headers and return column mapping with periods"""
-        date_columns = {}
-
-        # Iterate through actual columns in the sheet
-        for col_num in range(1, sheet.max_column + 1):
-            cell = sheet.cell(row=1, column=col_num)
-            if cell.value:
-                header = str(cell.value)
+        self, header_row: Tuple
+    ) -> Dict[int, Tuple[str, str]]:
+        """Extract date ranges from the header row values and return column mapping with periods"""
+        header_key = tuple(header_row)
+        date_columns = self._date_columns_cache.get(header_key)
+        if date_columns is not None:
+            return date_columns
+
+        date_columns = self._date_columns_cache[header_key] = {}
+
+        # Use actual column numbers, including columns with empty headers
+        for col_num, value in enumerate(header_row, start=1):
+            if value:
+                header = str(value)
                 date_obj = self._extract_date_from_header(header)
                 if date_obj:
-                    # Create period start and end dates
-                    period_start = date_obj.strftime(
-                        "%Y-%m-%d"
-                    )  # First day of the month
-
-                    # Calculate last day of the same month
-                    if date_obj.month == 12:
-                        # December -> last day is Dec 31
-                        period_end = datetime(date_obj.year, 12, 31).strftime(
-                            "%Y-%m-%d"
-                        )
-                    else:
-                        # For other months, get the last day by going to first day of next month and subtracting 1 day
-                        next_month = datetime(date_obj.year, date_obj.month + 1, 1)
-                        last_day = (next_month - timedelta(days=1)).strftime("%Y-%m-%d")
-                        period_end = last_day
+                    year, month = date_obj.year, date_obj.month
+
+                    # Period runs from the first to the last day of the month
+                    last_day = (
+                        29
+                        if month == 2 and calendar.isleap(year)
+                        else _MONTH_LAST_DAY[month]
+                    )
+                    period_start = f"{year:04d}-{month:02d}-01"
+                    period_end = f"{year:04d}-{month:02d}-{last_day:02d}"
 
                     date_columns[col_num] = (period_start, period_end)
 
@@ -378,74 +858,75 @@ class PLExcelImporter(BaseExcelImporter):
         super().__init__()
         self.source_id = DataSource.PL_REPORT.value  # 1
 
-    def _import_sheet(self, sheet, sheet_name: str) -> Tuple[int, int]:
+    def _import_sheet(
+        self, rows: Iterator[Sequence[Any]], sheet_name: str
+    ) -> Tuple[int, int]:
         """Import Rootfi Report sheet"""
         accounts_created = 0
         transactions_created = 0
 
+        # Single streamed pass: the first row is the header
+        header_row = next(rows, ())
+
         # Parse headers
-        header_map = self._parse_headers(sheet)
+        header_map = self._parse_headers(header_row)
+        account_columns = _AccountColumns.from_header_map(header_map)
 
         # Extract date ranges from sheet headers (using actual column numbers)
-        date_columns = self._extract_date_range_from_sheet(sheet)
+        date_columns = self._extract_date_range_from_headers(header_row)
 
         # Find value columns (monthly data)
-        value_cols = []
-        for header, col_num in header_map.items():
-            if header not in [
-                "name",
-                "category_path",
-                "sub_category",
-                "type",
-                "sub_type",
-                "is_summary",
-                "is_derived",
-                "is_derived_correct",
-                "metadata",
-                "Computed Total",
-                "Total",
-                "Difference",
-            ]:
-                value_cols.append(col_num)
+        value_cols = [
+            col_num
+            for header, col_num in header_map.items()
+            if header not in _NON_VALUE_HEADERS
+        ]
 
         # Validate that we have date information for value columns
         if not date_columns and value_cols:
             raise ValueError(
-                f"No date columns found in headers. Headers: {headers}. Expected format: 'Jan 2020', 'Feb 2020', etc."
+                f"No date columns found in headers. Headers: {list(header_map)}. Expected format: 'Jan 2020', 'Feb 2020', etc."
             )
 
+        # Resolve each value column once: row tuple index and period (None if undated)
+        value_columns = [(col - 1, col, date_columns.get(col)) for col in value_cols]
+        notes = f"Rootfi Report - {sheet_name}"
+        # Bound once per sheet rather than looked up on every row
+        extract_account_data = account_columns.compile_parser()
+        create_account_from_data = self._create_account_from_data
+        queue_transaction = self.account_manager.queue_transaction
+
         # Process each row
-        for row_num in range(2, sheet.max_row + 1):
-            account_data = self._extract_account_data(sheet, row_num, header_map)
+        for row_values in rows:
+            account_data = extract_account_data(row_values)
             if not account_data:
                 continue
 
                 # Create/get account
-            account_id = self._create_account_from_data(account_data)
+            account_id = create_account_from_data(account_data)
             if account_id:
                 accounts_created += 1
 
             # Create transactions only for non-summary accounts
             if not account_data["is_summary"]:
-                for col in value_cols:
-                    value = sheet.cell(row=row_num, column=col).value
-                    if value is not None and isinstance(value, (int, float)):
+                row_len = len(row_values)
+                for index, col, period in value_columns:
+                    value = row_values[index] if index < row_len else None
+                    if isinstance(value, (int, float)):
                         # Must have date information for the column
-                        if col not in date_columns:
+                        if period is None:
                             raise ValueError(
                                 f"No date information found for column {col}. Available date columns: {list(date_columns.keys())}"
                             )
 
-                        period_start, period_end = date_columns[col]
-
-                        self.account_manager.create_transaction(
+                        queue_transaction(
                             account_id=account_id,
-                            period_start=period_start,
-                            period_end=period_end,
+                            period_start=period[0],
+                            period_end=period[1],
                             value=float(value),
                             currency=1,
                             source_id=self.source_id,
-                            notes=f"Rootfi Report - {sheet_name}",
+                            notes=notes,
                         )
                         transactions_created += 1
 
@@ -467,7 +948,9 @@ class RootfiExcelImporter(BaseExcelImporter):
         super().__init__()
         self.source_id = DataSource.ROOTFI_REPORT.value  # 2
 
-    def _import_sheet(self, sheet, sheet_name: str) -> Tuple[int, int]:
+    def _import_sheet(
+        self, rows: Iterator[Sequence[Any]], sheet_name: str
+    ) -> Tuple[int, int]:
         """Import P&L Report sheet"""
         accounts_created = 0
         transactions_created = 0
@@ -475,32 +958,40 @@ class RootfiExcelImporter(BaseExcelImporter):
         # Extract period from sheet name
         period_start, period_end = self._extract_period_from_sheet_name(sheet_name)
 
-        # Parse headers
-        header_map = self._parse_headers(sheet)
+        # Single streamed pass: the first row is the header
+        header_map = self._parse_headers(next(rows, ()))
+        account_columns = _AccountColumns.from_header_map(header_map)
+        value_col = header_map.get("value", 0)
+        notes = f"P&L Report - {sheet_name}"
+        # Bound once per sheet rather than looked up on every row
+        extract_account_data = account_columns.compile_parser()
+        create_account_from_data = self._create_account_from_data
+        row_value = self._row_value
+        queue_transaction = self.account_manager.queue_transaction
 
         # Process each row
-        for row_num in range(2, sheet.max_row + 1):
-            account_data = self._extract_account_data(sheet, row_num, header_map)
+        for row_values in rows:
+            account_data = extract_account_data(row_values)
             if not account_data:
                 continue
 
             # Create/get account
-            account_id = self._create_account_from_data(account_data)
+            account_id = create_account_from_data(account_data)
             if account_id:
                 accounts_created += 1
 
             # Create transaction only for non-summary accounts and non-null values
             if not account_data["is_summary"]:
-                value = sheet.cell(row=row_num, column=header_map.get("value", 0)).value
+                value = row_value(row_values, value_col)
                 if value is not None and isinstance(value, (int, float)):
-                    self.account_manager.create_transaction(
+                    queue_transaction(
                         account_id=account_id,
                         period_start=period_start,
                         period_end=period_end,
                         value=float(value),
                         currency=1,
                         source_id=self.source_id,
-                        notes=f"P&L Report - {sheet_name}",
+                        notes=notes,
                     )
                     transactions_created += 1
 
@@ -508,25 +999,32 @@ class RootfiExcelImporter(BaseExcelImporter):
 
     def _extract_period_from_sheet_name(self, sheet_name: str) -> Tuple[str, str]:
         """Extract period from sheet name (format: '2022-08-01 to 2022-08-31')"""
-        try:
-            if " to " in sheet_name:
-                start_str, end_str = sheet_name.split(" to ")
-                start_str = start_str.strip()
-                end_str = end_str.strip()
+        expected = (
+            f"Could not extract period from sheet name: '{sheet_name}'. "
+            "Expected format: 'YYYY-MM-DD to YYYY-MM-DD'"
+        )
 
-                # Validate date format
-                from datetime import datetime
+        start_str, separator, end_str = sheet_name.partition(" to ")
+        if not separator:
+            raise ValueError(expected)
 
-                datetime.strptime(start_str, "%Y-%m-%d")
-                datetime.strptime(end_str, "%Y-%m-%d")
+        start_str = start_str.strip()
+        end_str = end_str.strip()
+        try:
+            # Validate date format; fromisoformat avoids strptime's locale path
+            date.fromisoformat(start_str)
+            date.fromisoformat(end_str)
+        except ValueError as e:
+            raise ValueError(f"{expected}. Error: {e}") from e
 
-                return start_str, end_str
-        except Exception as e:
-            pass
+        return start_str, end_str
 
-        raise ValueError(
-            f"Could not extract period from sheet name: '{sheet_name}'. Expected format: 'YYYY-MM-DD to YYYY-MM-DD'. Error: {e}"
-        )
+
+# Filename substrings that identify the importer without opening the file
+_FILENAME_HINTS = (
+    ("dataset1", PLExcelImporter),
+    ("dataset2", RootfiExcelImporter),
+)
 
 
 class ExcelImporterFactory:
@@ -545,34 +1043,65 @@ class ExcelImporterFactory:
         Returns:
             Appropriate importer instance
         """
+        importer, workbook = ExcelImporterFactory.create_importer_with_workbook(
+            excel_file_path
+        )
+        if workbook is not None:
+            workbook.close()
+        return importer
+
+    @staticmethod
+    def create_importer_with_workbook(
+        excel_file_path: str,
+    ) -> Tuple[BaseExcelImporter, Optional[Workbook]]:
+        """
+        Create the importer and hand back the workbook opened for sniffing
+
+        Args:
+            excel_file_path: Path to Excel file
+
+        Returns:
+            Tuple of (importer, workbook); workbook is a read-only handle to pass
+            to import_excel_file, or None when the filename was enough
+        """
         try:
             # First check filename pattern for better detection
-            filename = Path(excel_file_path).name.lower()
-            if "dataset1" in filename:
-                return PLExcelImporter()
-            elif "dataset2" in filename:
-                return RootfiExcelImporter()
+            filename = os.path.basename(excel_file_path).lower()
+            for hint, importer_class in _FILENAME_HINTS:
+                if hint in filename:
+                    return importer_class(), None
+
+            # Fallback to content-based detection; read-only mode only parses
+            # the header rows we look at
+            workbook = load_workbook(excel_file_path, read_only=True, data_only=True)
+            try:
+                return _detect_importer(workbook), workbook
+            except Exception:
+                workbook.close()
+                raise
 
-            # Fallback to content-based detection
-            workbook = load_workbook(excel_file_path)
+        except Exception as e:
+            raise Exception(f"Failed to determine Excel importer type: {e}")
 
-            # Check sheet names and content to determine type
-            for sheet_name in workbook.sheetnames:
-                sheet = workbook[sheet_name]
 
-                # Check if it's a period-based format (data_set_2)
-                if " to " in sheet_name and "account_id" in str(sheet[1]):
-                    return RootfiExcelImporter()
+def _detect_importer(workbook: Workbook) -> BaseExcelImporter:
+    """Pick the importer from sheet names and header rows"""
+    for sheet_name in workbook.sheetnames:
+        # Check if it's Rootfi format (data_set_1); the name alone decides
+        if "P&L Report" in sheet_name:
+            return PLExcelImporter()
+
+        header = next(workbook[sheet_name].iter_rows(max_row=1, values_only=True), ())
 
-                # Check if it's Rootfi format (data_set_1)
-                if "P&L Report" in sheet_name or "name" in str(sheet[1]):
-                    return PLExcelImporter()
+        # Check if it's a period-based format (data_set_2)
+        if " to " in sheet_name and "account_id" in header:
+            return RootfiExcelImporter()
 
-            # If no pattern matches, default to PLExcelImporter
+        if "name" in header:
             return PLExcelImporter()
 
-        except Exception as e:
-            raise Exception(f"Failed to determine Excel importer type: {e}")
+    # If no pattern matches, default to PLExcelImporter
+    return PLExcelImporter()
 
 
 # Convenience functions
@@ -586,8 +1115,12 @@ def import_excel_to_database(excel_file_path: str) -> Tuple[int, int]:
     Returns:
         Tuple of (accounts_created, transactions_created)
     """
-    importer = ExcelImporterFactory.create_importer(excel_file_path)
-    return importer.import_excel_file(excel_file_path)
+    importer, workbook = ExcelImporterFactory.create_importer_with_workbook(
+        excel_file_path
+    )
+    result = importer.import_excel_file(excel_file_path, workbook)
+    get_database_manager().bump_data_version()
+    return result
 
 
 def convert_and_import_json(
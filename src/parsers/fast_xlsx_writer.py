@@ -0,0 +1,277 @@
+"""
+Fast XLSX Writer
+Minimal streaming xlsx writer for converter output
+
+Rows are serialized straight to SpreadsheetML text and streamed into the zip
+as they are appended, without per-cell objects. Only what the converters write
+is supported: one or more sheets of str, int, float, bool and None cells,
+unstyled, with strings stored inline.
+"""
+
+import os
+import re
+import uuid
+import zipfile
+from contextlib import suppress
+from functools import lru_cache
+from math import isfinite
+from typing import Any, List, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+# Characters that are not allowed anywhere in an XML 1.0 document
+_ILLEGAL_XML_CHARS_RE = re.compile(r"[\000-\010\013\014\016-\037]")
+# Characters Excel rejects in sheet titles
+_INVALID_TITLE_CHARS_RE = re.compile(r"[\\*?:/\[\]]")
+_MAX_TITLE_LENGTH = 31
+
+# Output file buffer; sheet XML is written in many small chunks
+_FILE_BUFFER_BYTES = 1 << 20
+
+_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PACKAGE_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_CONTENT_TYPES_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+_SHEET_CONTENT_TYPE = (
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"
+)
+
+_SHEET_START = f'{_XML_DECLARATION}<worksheet xmlns="{_MAIN_NS}"><sheetData>'
+_SHEET_END = "</sheetData></worksheet>"
+
+_STYLES_XML = (
+    f'{_XML_DECLARATION}<styleSheet xmlns="{_MAIN_NS}">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border>'
+    "</borders>"
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/>'
+    "</cellStyleXfs>"
+    '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    "</cellXfs>"
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/>'
+    "</cellStyles></styleSheet>"
+)
+
+
+@lru_cache(maxsize=None)
+def _column_letter(index: int) -> str:
+    """Excel column letters for a 0-based column index (0 -> "A")"""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _escape_text(value: str) -> str:
+    """Escape a cell string for XML, rejecting characters XML cannot hold"""
+    if _ILLEGAL_XML_CHARS_RE.search(value):
+        raise ValueError(f"Cell text contains characters not allowed in XML: {value!r}")
+    return escape(value)
+
+
+def _row_xml(row_number: int, values: List[Any]) -> str:
+    """SpreadsheetML for one row; None and empty strings leave the cell out"""
+    row_suffix = str(row_number)
+    cells = []
+    append = cells.append
+    for index, value in enumerate(values):
+        if value is None:
+            continue
+        ref = _column_letter(index) + row_suffix
+        value_type = value.__class__
+        if value_type is str:
+            if not value:
+                continue
+            text = _escape_text(value)
+            if value[0].isspace() or value[-1].isspace():
+                append(
+                    f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">'
+                    f"{text}</t></is></c>"
+                )
+            else:
+                append(f'<c r="{ref}" t="inlineStr"><is><t>{text}</t></is></c>')
+        elif value_type is bool:
+            append(f'<c r="{ref}" t="b"><v>{int(value)}</v></c>')
+        elif value_type is float:
+            if not isfinite(value):
+                # nan and inf have no SpreadsheetML number form
+                raise ValueError(
+                    f"Cell value {value!r} in row {row_number} is not a finite number"
+                )
+            # Same 16 significant digits openpyxl and xlsxwriter write
+            append(f'<c r="{ref}" t="n"><v>{value:.16g}</v></c>')
+        elif value_type is int:
+            append(f'<c r="{ref}" t="n"><v>{value}</v></c>')
+        else:
+            raise TypeError(
+                f"Unsupported cell value type {value_type.__name__} in row {row_number}"
+            )
+    return f'<row r="{row_number}">{"".join(cells)}</row>'
+
+
+class _FastXlsxSheet:
+    """Append-only sheet; rows are written as soon as they are appended"""
+
+    __slots__ = ("_stream", "_row")
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._row = 0
+
+    def append(self, values) -> None:
+        """Write the values as the next row"""
+        if self._stream is None:
+            raise ValueError("Rows can only be appended to the newest open sheet")
+        self._row += 1
+        self._stream.write(_row_xml(self._row, values).encode("utf-8"))
+
+    def _close(self) -> None:
+        """Finish the sheet XML"""
+        if self._stream is not None:
+            self._stream.write(_SHEET_END.encode("utf-8"))
+            self._stream.close()
+            self._stream = None
+
+
+class FastXlsxWorkbook:
+    """
+    Streaming xlsx workbook with the subset of the write-only openpyxl API the
+    converters use: create_sheet(), append(), save()
+
+    Sheets are filled strictly in order: creating a sheet finishes the
+    previous one. Rows are streamed to a temporary file next to the output,
+    which replaces the output once save() succeeds. Used as a context
+    manager, the workbook is discarded on exit unless it was saved.
+    """
+
+    def __init__(self, output_path: str):
+        self._output_path = output_path
+        self._temp_path: Optional[str] = f"{output_path}.{uuid.uuid4().hex}.tmp"
+        self._file = open(self._temp_path, "xb", buffering=_FILE_BUFFER_BYTES)
+        self._zip = zipfile.ZipFile(self._file, "w", zipfile.ZIP_DEFLATED)
+        self._titles: List[str] = []
+        self._sheet: Optional[_FastXlsxSheet] = None
+
+    def __enter__(self) -> "FastXlsxWorkbook":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.discard()
+
+    def create_sheet(self, title: str) -> _FastXlsxSheet:
+        """Add a worksheet and return its row writer"""
+        if len(title) > _MAX_TITLE_LENGTH or _INVALID_TITLE_CHARS_RE.search(title):
+            raise ValueError(f"Invalid sheet title: {title!r}")
+        if title in self._titles:
+            raise ValueError(f"Duplicate sheet title: {title!r}")
+
+        if self._sheet is not None:
+            self._sheet._close()
+        self._titles.append(title)
+        stream = self._zip.open(
+            f"xl/worksheets/sheet{len(self._titles)}.xml", "w", force_zip64=True
+        )
+        stream.write(_SHEET_START.encode("utf-8"))
+        self._sheet = _FastXlsxSheet(stream)
+        return self._sheet
+
+    def save(self, output_path: str) -> None:
+        """Finish the file; the workbook can only write to the path it was created with"""
+        if output_path != self._output_path:
+            raise ValueError(
+                f"Workbook was created for '{self._output_path}', not '{output_path}'"
+            )
+        if self._temp_path is None:
+            raise ValueError("Workbook was already saved or discarded")
+
+        try:
+            if self._sheet is not None:
+                self._sheet._close()
+                self._sheet = None
+
+            writestr = self._zip.writestr
+            writestr("[Content_Types].xml", self._content_types_xml())
+            writestr("_rels/.rels", self._package_rels_xml())
+            writestr("xl/workbook.xml", self._workbook_xml())
+            writestr("xl/_rels/workbook.xml.rels", self._workbook_rels_xml())
+            writestr("xl/styles.xml", _STYLES_XML)
+            self._zip.close()
+            self._file.close()
+            os.replace(self._temp_path, output_path)
+        except BaseException:
+            self.discard()
+            raise
+        self._temp_path = None
+
+    def discard(self) -> None:
+        """Close the streams and delete the temporary file; no-op once saved"""
+        if self._temp_path is None:
+            return
+
+        # Best effort: the workbook is abandoned, often after a write failed
+        with suppress(Exception):
+            if self._sheet is not None:
+                self._sheet._close()
+        self._sheet = None
+        with suppress(Exception):
+            self._zip.close()
+        with suppress(OSError):
+            self._file.close()
+        with suppress(FileNotFoundError):
+            os.unlink(self._temp_path)
+        self._temp_path = None
+
+    def _content_types_xml(self) -> str:
+        overrides = "".join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+            f'ContentType="{_SHEET_CONTENT_TYPE}"/>'
+            for i in range(1, len(self._titles) + 1)
+        )
+        return (
+            f'{_XML_DECLARATION}<Types xmlns="{_CONTENT_TYPES_NS}">'
+            '<Default Extension="rels" '
+            'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            f"{overrides}</Types>"
+        )
+
+    @staticmethod
+    def _package_rels_xml() -> str:
+        return (
+            f'{_XML_DECLARATION}<Relationships xmlns="{_PACKAGE_REL_NS}">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/'
+            'officeDocument/2006/relationships/officeDocument" '
+            'Target="xl/workbook.xml"/></Relationships>'
+        )
+
+    def _workbook_xml(self) -> str:
+        sheets = "".join(
+            f'<sheet name={quoteattr(title)} sheetId="{i}" r:id="rId{i}"/>'
+            for i, title in enumerate(self._titles, start=1)
+        )
+        return (
+            f'{_XML_DECLARATION}<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">'
+            f"<sheets>{sheets}</sheets></workbook>"
+        )
+
+    def _workbook_rels_xml(self) -> str:
+        sheet_rels = "".join(
+            f'<Relationship Id="rId{i}" Type="{_REL_NS}/worksheet" '
+            f'Target="worksheets/sheet{i}.xml"/>'
+            for i in range(1, len(self._titles) + 1)
+        )
+        styles_id = len(self._titles) + 1
+        return (
+            f'{_XML_DECLARATION}<Relationships xmlns="{_PACKAGE_REL_NS}">'
+            f"{sheet_rels}"
+            f'<Relationship Id="rId{styles_id}" Type="{_REL_NS}/styles" '
+            'Target="styles.xml"/></Relationships>'
+        )
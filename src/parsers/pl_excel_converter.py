@@ -4,14 +4,47 @@ Convert data_set_2.json (P&L Report format) to Excel
 Based on Java JsonToExcelConverterPL implementation
 """
 
-import json
-from typing import Dict, List, Any
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from sys import intern
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
 from .base_excel_converter import (
     BaseJsonToExcelConverter,
     _create_workbook,
+    _extend_metadata,
+    _metadata_parts,
+    _render_metadata,
     _write_headers,
 )
 
+_PERIOD_HEADERS = [
+    "account_id",
+    "name",
+    "category_path",
+    "sub_category",
+    "type",
+    "sub_type",
+    "is_summary",
+    "is_derived",
+    "is_derived_correct",
+    "metadata",
+    "value",
+]
+
+# Row positions of the columns filled in after a period's traversal
+_CATEGORY_PATH_INDEX = _PERIOD_HEADERS.index("category_path")
+_IS_SUMMARY_INDEX = _PERIOD_HEADERS.index("is_summary")
+
+_SKIPPED_PERIOD_KEYS = frozenset(
+    ("period_start", "period_end", "rootfi_id", "rootfi_company_id")
+)
+
+# Periods are built in worker processes only for inputs at least this large;
+# below it process start-up costs more than the parallel work saves
+_PARALLEL_MIN_BYTES = 10 * 1024 * 1024
+
 
 class JsonToExcelConverterPL(BaseJsonToExcelConverter):
     """
@@ -51,9 +84,6 @@ class JsonToExcelConverterPL(BaseJsonToExcelConverter):
             "other": "other",
         }
 
-        # Store all category paths for the current period
-        self.period_category_paths: set = set()
-
     @property
     def account_type_map(self) -> Dict[str, str]:
         return self._account_type_map
@@ -62,239 +92,272 @@ class JsonToExcelConverterPL(BaseJsonToExcelConverter):
     def derived_subtype_map(self) -> Dict[str, str]:
         return self._derived_subtype_map
 
-    def convert_to_excel(self, input_json_path: str, output_excel_path: str) -> str:
+    def _write_output(
+        self, input_json_path: str, output_path: str, output_format: str
+    ) -> str:
         """
-        Convert data_set_2.json to Excel format
+        Convert data_set_2.json to output_format at output_path
 
         Args:
             input_json_path: Path to input JSON file
-            output_excel_path: Path to output Excel file
+            output_path: Path to output Excel file, or directory for CSV
+            output_format: "xlsx" or "csv"
 
         Returns:
-            Path to created Excel file
+            output_path
         """
-        try:
-            with open(input_json_path, "r") as f:
-                data = json.load(f)
-
-            data_array = data["data"]
-
-            # Create workbook
-            workbook = _create_workbook()
-
-            for period_data in data_array:
-                period_start = period_data["period_start"]
-                period_end = period_data["period_end"]
-                period_name = f"{period_start} to {period_end}"
+        # Create workbook
+        with _create_workbook(output_path, output_format) as workbook:
+            # Periods are independent, so stream them one at a time
+            periods = self._iter_json_items(input_json_path, "data")
+            workers = os.cpu_count() or 1
+            if workers > 1 and os.path.getsize(input_json_path) >= _PARALLEL_MIN_BYTES:
+                period_rows = self._build_periods_in_workers(periods, workers)
+            else:
+                period_rows = map(self._build_period_rows, periods)
 
+            for period_name, rows in period_rows:
                 # Create sheet for this period
                 sheet = workbook.create_sheet(period_name)
-
-                # Header row
-                headers = [
-                    "account_id",
-                    "name",
-                    "category_path",
-                    "sub_category",
-                    "type",
-                    "sub_type",
-                    "is_summary",
-                    "is_derived",
-                    "is_derived_correct",
-                    "metadata",
-                    "value",
-                ]
-                _write_headers(sheet, headers)
-
-                # Clear category paths for the current period
-                self.period_category_paths.clear()
-
-                # First pass: collect all category paths
-                self._collect_category_paths(period_data)
-
-                # Second pass: process fields for Excel output
-                current_row = 2
-                for key, value in period_data.items():
-                    if key in [
-                        "period_start",
-                        "period_end",
-                        "rootfi_id",
-                        "rootfi_company_id",
-                    ]:
-                        continue
-
-                    if isinstance(value, list):
-                        current_row = self._flatten_section(
-                            value, sheet, current_row, key, [key]
-                        )
-                    elif isinstance(value, (int, float)):
-                        current_row = self._add_summary_row(
-                            sheet, current_row, key, value, [key]
-                        )
-
-            # Remove default sheet
-            if "Sheet" in workbook.sheetnames:
-                workbook.remove(workbook["Sheet"])
+                _write_headers(sheet, _PERIOD_HEADERS)
+                for row in rows:
+                    sheet.append(row)
 
             # Save workbook
-            workbook.save(output_excel_path)
+            workbook.save(output_path)
+
+        return output_path
 
-            return output_excel_path
+    def _build_period_rows(self, period_data: Dict) -> Tuple[str, List[list]]:
+        """
+        Build one period's sheet
+
+        Args:
+            period_data: One element of the input "data" array
+
+        Returns:
+            Tuple of (sheet_name, rows) with rows in sheet order, header excluded
+        """
+        period_name = f"{period_data['period_start']} to {period_data['period_end']}"
 
-        except Exception as e:
-            raise
+        # Clear category paths for the current period
+        self._clear_category_paths()
 
-    def _collect_category_paths(self, period_data: Dict):
-        """Collect all category paths for the current period"""
+        # Single pass: rows are emitted while their category paths are
+        # recorded; is_summary needs every path, so it is filled in afterwards
+        rows: List[list] = []
         for key, value in period_data.items():
-            if key in ["period_start", "period_end", "rootfi_id", "rootfi_company_id"]:
+            if key in _SKIPPED_PERIOD_KEYS:
                 continue
 
             if isinstance(value, list):
-                self._collect_section_paths(value, key, [key])
+                self._flatten_section(value, rows, key, (key,))
             elif isinstance(value, (int, float)):
-                self.period_category_paths.add(key)
-
-    def _collect_section_paths(
-        self, section: List[Dict], main_category: str, path: List[str]
-    ):
-        """Collect category paths from a section"""
-        for category in section:
-            cat_name = category["name"]
-            new_path = path + [cat_name]
-            category_path = " > ".join(new_path)
-            self.period_category_paths.add(category_path)
-
-            if "line_items" in category and category["line_items"]:
-                self._collect_line_item_paths(
-                    category["line_items"], main_category, new_path
-                )
-
-    def _collect_line_item_paths(
-        self, line_items: List[Dict], main_category: str, path: List[str]
-    ):
-        """Collect category paths from line_items"""
-        for item in line_items:
-            sub_name = item["name"]
-            new_path = path + [sub_name]
-            category_path = " > ".join(new_path)
-            self.period_category_paths.add(category_path)
-
-            if "line_items" in item and item["line_items"]:
-                self._collect_line_item_paths(
-                    item["line_items"], main_category, new_path
+                self._add_summary_row(rows, key, value, (key,))
+
+        has_child_paths = self._has_child_paths
+        for row in rows:
+            row[_IS_SUMMARY_INDEX] = has_child_paths(row[_CATEGORY_PATH_INDEX])
+
+        return period_name, rows
+
+    def _build_periods_in_workers(
+        self, periods: Iterable[Dict], workers: int
+    ) -> Iterator[Tuple[str, List[list]]]:
+        """Build period sheets in worker processes, yielding them in input order"""
+        # spawn rather than fork: the API process may already be running threads
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            # Only a bounded window of periods is in flight, so streamed input
+            # is not read ahead of what the workbook has consumed
+            pending = deque()
+            for period_data in periods:
+                pending.append(
+                    executor.submit(_build_period_rows, type(self), period_data)
                 )
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
 
     def _flatten_section(
         self,
         section: List[Dict],
-        sheet,
-        start_row: int,
+        rows: List[list],
         main_category: str,
-        path: List[str],
-    ) -> int:
-        """Process a section (array of categories with line_items)"""
+        path: Tuple[str, ...],
+    ) -> None:
+        """Process a section (array of categories with line_items); rows get is_summary later"""
+        # Everything derived from main_category is shared by the whole section
+        section_attributes = self._section_attributes(main_category)
+        path_str = " > ".join(path)
+        section_metadata = _metadata_parts(path)
         for category in section:
-            cat_name = category["name"]
-            new_path = path + [cat_name]
+            # Names repeat across periods; interning shares one string object
+            cat_name = intern(category["name"])
+            new_path = path + (cat_name,)
+            cat_metadata = _extend_metadata(section_metadata, cat_name)
+            line_items = category.get("line_items")
 
-            if "line_items" not in category or not category["line_items"]:
+            if not line_items:
                 # No line_items: treat as summary if it has child paths
-                start_row = self._add_summary_row(
-                    sheet, start_row, main_category, category["value"], new_path
+                self._add_summary_row(
+                    rows,
+                    main_category,
+                    category["value"],
+                    new_path,
+                    section_attributes,
+                    _render_metadata(cat_metadata),
                 )
             else:
-                # Has line_items: process children only
-                start_row = self._flatten_line_items(
-                    category["line_items"], sheet, start_row, main_category, new_path
+                # Has line_items: process children only, but the category's
+                # path still marks it as a parent
+                cat_path_str = path_str + " > " + cat_name
+                self._add_category_path(cat_path_str)
+                self._flatten_line_items(
+                    line_items,
+                    rows,
+                    main_category,
+                    new_path,
+                    section_attributes,
+                    cat_path_str,
+                    cat_metadata,
                 )
 
-        return start_row
-
     def _flatten_line_items(
         self,
         line_items: List[Dict],
-        sheet,
-        start_row: int,
+        rows: List[list],
         main_category: str,
-        path: List[str],
-    ) -> int:
-        """Flatten line_items recursively, adding rows for child items"""
-        for item in line_items:
-            sub_name = item["name"]
+        path: Tuple[str, ...],
+        section_attributes: Tuple[str, bool, bool],
+        path_str: str,
+        metadata_parts: Tuple[str, str, int],
+    ) -> None:
+        """
+        Flatten line_items and their descendants in order, recording their
+        category paths; path_str is " > ".join(path) and metadata_parts is
+        _metadata_parts(path). is_summary is left False for _build_period_rows
+        to fill in.
+        """
+        type_str, is_derived, is_derived_correct = section_attributes
+        append = rows.append
+        add_category_path = self._add_category_path
+        get_sub_type = self._get_sub_type
+
+        # Pre-order walk with an explicit stack; children are pushed reversed
+        # so they pop in document order
+        # Every row below the category is named after it, the second path
+        # element, so the walk carries only the path string and metadata
+        name = path[1]
+        stack = [(item, path_str, metadata_parts) for item in reversed(line_items)]
+        while stack:
+            item, parent_path_str, parent_metadata = stack.pop()
+            sub_name = intern(item["name"])
             sub_value = item["value"]
             account_id = item.get("account_id", "")
-            new_path = path + [sub_name]
 
             # Add row for this line_item
-            category_path = " > ".join(new_path)
-            name = path[1] if len(path) >= 1 else sub_name
-            type_str = self.account_type_map.get(main_category.lower(), "derived")
-            sub_type = self._get_sub_type(main_category, sub_name)
-            is_summary = self._has_child_paths(category_path)
-            is_derived = (
-                type_str == "derived"
-                or main_category.lower() in self.derived_subtype_map
-            )
-            is_derived_correct = self._validate_is_derived(main_category, type_str)
-            metadata = self._create_metadata(new_path)
+            category_path = parent_path_str + " > " + sub_name
+            sub_type = get_sub_type(main_category, sub_name)
+            item_metadata = _extend_metadata(parent_metadata, sub_name)
+            metadata = _render_metadata(item_metadata)
+            add_category_path(category_path)
 
             # Add row data
-            sheet.cell(row=start_row, column=1, value=account_id)
-            sheet.cell(row=start_row, column=2, value=name)
-            sheet.cell(row=start_row, column=3, value=category_path)
-            sheet.cell(row=start_row, column=4, value=sub_name)
-            sheet.cell(row=start_row, column=5, value=type_str)
-            sheet.cell(row=start_row, column=6, value=sub_type)
-            sheet.cell(row=start_row, column=7, value=is_summary)
-            sheet.cell(row=start_row, column=8, value=is_derived)
-            sheet.cell(row=start_row, column=9, value=is_derived_correct)
-            sheet.cell(row=start_row, column=10, value=metadata)
-            sheet.cell(row=start_row, column=11, value=sub_value)
-
-            start_row += 1
-
-            # Recurse deeper if needed
-            if "line_items" in item and item["line_items"]:
-                start_row = self._flatten_line_items(
-                    item["line_items"], sheet, start_row, main_category, new_path
+            append(
+                [
+                    account_id,
+                    name,
+                    category_path,
+                    sub_name,
+                    type_str,
+                    sub_type,
+                    False,  # is_summary
+                    is_derived,
+                    is_derived_correct,
+                    metadata,
+                    sub_value,
+                ]
+            )
+
+            # Descend into child line_items next
+            children = item.get("line_items")
+            if children:
+                stack.extend(
+                    (child, category_path, item_metadata)
+                    for child in reversed(children)
                 )
 
-        return start_row
+    def _section_attributes(self, main_category: str) -> Tuple[str, bool, bool]:
+        """Get (type_str, is_derived, is_derived_correct) for a main category"""
+        main_category_lower = main_category.lower()
+        type_str = self.account_type_map.get(main_category_lower, "derived")
+        is_derived = main_category_lower not in self._non_derived_keys
+        is_derived_correct = self._validate_is_derived(main_category, type_str)
+        return type_str, is_derived, is_derived_correct
 
     def _add_summary_row(
-        self, sheet, row_index: int, main_category: str, value: float, path: List[str]
-    ) -> int:
-        """Add a summary row for top-level numeric fields or categories without line_items"""
+        self,
+        rows: List[list],
+        main_category: str,
+        value: float,
+        path: Tuple[str, ...],
+        section_attributes: Optional[Tuple[str, bool, bool]] = None,
+        metadata: Optional[str] = None,
+    ) -> None:
+        """
+        Append a summary row for a top-level numeric field or a category
+        without line_items and record its category path; is_summary is left
+        False for _build_period_rows to fill in
+
+        Args:
+            rows: Period rows to append to
+            main_category: Top-level key the row belongs to
+            value: Row value
+            path: Category path of the row
+            section_attributes: Precomputed _section_attributes(main_category)
+            metadata: Precomputed metadata string, rendered from path if omitted
+        """
+        if section_attributes is None:
+            section_attributes = self._section_attributes(main_category)
+        type_str, is_derived, is_derived_correct = section_attributes
+
         category_path = " > ".join(path)
         name = path[1] if len(path) >= 2 else path[0]
-        type_str = self.account_type_map.get(main_category.lower(), "derived")
         sub_type = self._get_sub_type(main_category, None)
-        is_summary = self._has_child_paths(category_path)
-        is_derived = (
-            type_str == "derived" or main_category.lower() in self.derived_subtype_map
-        )
-        is_derived_correct = self._validate_is_derived(main_category, type_str)
-        metadata = self._create_metadata(path)
+        if metadata is None:
+            metadata = self._create_metadata(path)
+        self._add_category_path(category_path)
 
         # Add row data
-        sheet.cell(row=row_index, column=1, value="")  # No account_id
-        sheet.cell(row=row_index, column=2, value=name)
-        sheet.cell(row=row_index, column=3, value=category_path)
-        sheet.cell(row=row_index, column=4, value="")  # No sub_category
-        sheet.cell(row=row_index, column=5, value=type_str)
-        sheet.cell(row=row_index, column=6, value=sub_type)
-        sheet.cell(row=row_index, column=7, value=is_summary)
-        sheet.cell(row=row_index, column=8, value=is_derived)
-        sheet.cell(row=row_index, column=9, value=is_derived_correct)
-        sheet.cell(row=row_index, column=10, value=metadata)
-        sheet.cell(row=row_index, column=11, value=value)
-
-        return row_index + 1
-
-    def _has_child_paths(self, category_path: str) -> bool:
-        """Check if the category_path has child paths in the period"""
-        for path in self.period_category_paths:
-            if path.startswith(category_path + " > ") and path != category_path:
-                return True
-        return False
+        rows.append(
+            [
+                "",  # No account_id
+                name,
+                category_path,
+                "",  # No sub_category
+                type_str,
+                sub_type,
+                False,  # is_summary
+                is_derived,
+                is_derived_correct,
+                metadata,
+                value,
+            ]
+        )
+
+
+# One converter per worker process and converter class, reused across periods
+_worker_converters: Dict[type, JsonToExcelConverterPL] = {}
+
+
+def _build_period_rows(
+    converter_class: type, period_data: Dict
+) -> Tuple[str, List[list]]:
+    """Worker process entry point for JsonToExcelConverterPL._build_period_rows"""
+    converter = _worker_converters.get(converter_class)
+    if converter is None:
+        converter = _worker_converters[converter_class] = converter_class()
+    return converter._build_period_rows(period_data)
@@ -4,13 +4,28 @@ Convert data_set_1.json (Rootfi Report format) to Excel
 Based on Java JsonToExcelConverterRootfi implementation
 """
 
-import json
+from sys import intern
 from typing import Dict, List, Any
 from .base_excel_converter import (
     BaseJsonToExcelConverter,
     _create_workbook,
+    _extend_metadata,
+    _metadata_parts,
+    _render_metadata,
     _write_headers,
 )
+from ..common.json_codec import json_loads
+
+
+def _parse_cell(val: Any) -> Any:
+    """Return a cell value as float when it parses as a number, else unchanged"""
+    # Blank cells are the most common non-numeric value; skip the raise
+    if val == "":
+        return val
+    try:
+        return float(val)
+    except ValueError:
+        return val
 
 
 class JsonToExcelConverterRootfi(BaseJsonToExcelConverter):
@@ -130,31 +145,32 @@ class JsonToExcelConverterRootfi(BaseJsonToExcelConverter):
     def derived_subtype_map(self) -> Dict[str, str]:
         return self._derived_subtype_map
 
-    def convert_to_excel(self, input_json_path: str, output_excel_path: str) -> str:
+    def _write_output(
+        self, input_json_path: str, output_path: str, output_format: str
+    ) -> str:
         """
-        Convert data_set_1.json to Excel format
+        Convert data_set_1.json to output_format at output_path
 
         Args:
             input_json_path: Path to input JSON file
-            output_excel_path: Path to output Excel file
+            output_path: Path to output Excel file, or directory for CSV
+            output_format: "xlsx" or "csv"
 
         Returns:
-            Path to created Excel file
+            output_path
         """
-        try:
-            with open(input_json_path, "r") as f:
-                data = json.load(f)
+        with open(input_json_path, "rb") as f:
+            data = json_loads(f.read())
 
-            data_section = data["data"]
-            columns = data_section["Columns"]["Column"]
-            rows = data_section["Rows"]["Row"]
+        data_section = data["data"]
+        columns = data_section["Columns"]["Column"]
+        rows = data_section["Rows"]["Row"]
 
-            original_num_cols = len(columns)
+        original_num_cols = len(columns)
 
-            # Create workbook and sheet
-            workbook = _create_workbook()
-            sheet = workbook.active
-            sheet.title = "Rootfi Report"
+        # Create workbook and sheet
+        with _create_workbook(output_path, output_format) as workbook:
+            sheet = workbook.create_sheet("Rootfi Report")
 
             # Create header row
             fixed_headers = [
@@ -168,22 +184,16 @@ class JsonToExcelConverterRootfi(BaseJsonToExcelConverter):
                 "is_derived_correct",
                 "metadata",
             ]
-            _write_headers(sheet, fixed_headers)
-            col_index = len(fixed_headers)
-
-            # Add monthly columns
-            for i, col in enumerate(columns):
-                title = col["ColTitle"]
-                sheet.cell(row=1, column=col_index + 1, value=title)
-                col_index += 1
-
-            # Add computed columns
-            sheet.cell(row=1, column=col_index + 1, value="Computed Total")
-            col_index += 1
-            sheet.cell(row=1, column=col_index + 1, value="Difference")
+            # Monthly columns followed by the computed columns
+            _write_headers(
+                sheet,
+                fixed_headers
+                + [col["ColTitle"] for col in columns]
+                + ["Computed Total", "Difference"],
+            )
 
             # First pass: collect all category paths
-            self.category_paths.clear()
+            self._clear_category_paths()
             self._collect_category_paths(rows, [])
 
             # Second pass: flatten rows and populate data
@@ -193,25 +203,32 @@ class JsonToExcelConverterRootfi(BaseJsonToExcelConverter):
             )
 
             # Save workbook
-            workbook.save(output_excel_path)
-
-            return output_excel_path
-
-        except Exception as e:
-            raise
-
-    def _collect_category_paths(self, rows_node: List[Dict], path: List[str]):
-        """Collect all category paths for determining is_summary"""
-        for row_node in rows_node:
+            workbook.save(output_path)
+
+        return output_path
+
+    def _collect_category_paths(
+        self, rows_node: List[Dict], path: List[str], path_str: str = ""
+    ):
+        """Collect all category paths for determining is_summary; path_str is " > ".join(path)"""
+        # Pre-order walk with an explicit stack; children are pushed reversed
+        # so they pop in document order
+        account_type_get = self.account_type_map.get
+        add_category_path = self._add_category_path
+        stack = [(row_node, bool(path), path_str) for row_node in reversed(rows_node)]
+        while stack:
+            row_node, has_parent, parent_path_str = stack.pop()
             group = row_node.get("group", "")
-            type_str = self.account_type_map.get(group.lower(), "derived")
-            new_path = path + [group]
-            category_path = type_str + (" > " + " > ".join(new_path) if group else "")
+            new_path_str = parent_path_str + " > " + group if has_parent else group
             if group:
-                self.category_paths.add(category_path)
+                type_str = account_type_get(group.lower(), "derived")
+                add_category_path(type_str + " > " + new_path_str)
 
-            if "Rows" in row_node:
-                self._collect_category_paths(row_node["Rows"]["Row"], new_path)
+            sub_rows = row_node.get("Rows")
+            if sub_rows:
+                stack.extend(
+                    (child, True, new_path_str) for child in reversed(sub_rows["Row"])
+                )
 
     def _flatten_rows(
         self,
@@ -220,67 +237,67 @@ class JsonToExcelConverterRootfi(BaseJsonToExcelConverter):
         current_row_index: int,
         original_num_cols: int,
         path: List[str],
+        path_str: str = "",
     ) -> int:
-        """Recursively flatten the nested Rows, including Header, Summary, and ColData rows"""
-        for row_node in rows_node:
+        """Flatten the nested Rows in order, including Header, Summary, and ColData rows"""
+        # Pre-order walk with an explicit stack; children are pushed reversed
+        # so they pop in document order
+        metadata_parts = _metadata_parts(path)
+        non_derived_keys = self._non_derived_keys
+        account_type_get = self.account_type_map.get
+        add_row = self._add_row
+        stack = [
+            (row_node, bool(path), path_str, metadata_parts)
+            for row_node in reversed(rows_node)
+        ]
+        while stack:
+            row_node, has_parent, parent_path_str, parent_metadata = stack.pop()
             group = row_node.get("group", "")
-            new_path = path + [group]
-            type_str = self.account_type_map.get(group.lower(), "derived")
-            category_path = type_str + (" > " + " > ".join(new_path) if group else "")
+            new_path_str = parent_path_str + " > " + group if has_parent else group
+
+            header = row_node.get("Header")
+            summary = row_node.get("Summary")
+            sub_rows = row_node.get("Rows")
 
-            if "Header" in row_node or "Summary" in row_node:
+            if header is not None or summary is not None:
                 # Handle Header or Summary row
-                col_data = (
-                    row_node.get("Header", {}).get("ColData", [])
-                    if "Header" in row_node
-                    else row_node.get("Summary", {}).get("ColData", [])
-                )
-                if col_data:
-                    group = col_data[0]["value"]
-                    new_path[-1] = group
-                    type_str = self.account_type_map.get(group.lower(), "derived")
-                    category_path = type_str + (
-                        " > " + " > ".join(new_path) if group else ""
-                    )
-                    current_row_index = self._add_row(
-                        sheet,
-                        current_row_index,
-                        original_num_cols,
-                        group,
-                        new_path,
-                        category_path,
-                        col_data,
-                        True,
-                    )
-            elif "ColData" in row_node:
+                col_data = (header if header is not None else summary).get("ColData")
+                is_header_or_summary = True
+            else:
                 # Handle ColData (detail) row
-                col_data = row_node["ColData"]
-                if col_data:
-                    group = col_data[0]["value"]
-                    new_path[-1] = group
-                    type_str = self.account_type_map.get(group.lower(), "derived")
-                    category_path = type_str + (
-                        " > " + " > ".join(new_path) if group else ""
-                    )
-                    current_row_index = self._add_row(
-                        sheet,
-                        current_row_index,
-                        original_num_cols,
-                        group,
-                        new_path,
-                        category_path,
-                        col_data,
-                        False,
-                    )
-
-            # Recurse into sub-rows if present
-            if "Rows" in row_node:
-                current_row_index = self._flatten_rows(
-                    row_node["Rows"]["Row"],
+                col_data = row_node.get("ColData")
+                is_header_or_summary = False
+
+            if col_data:
+                # The row's first cell names it, replacing the group
+                group = intern(col_data[0]["value"])
+                new_path_str = parent_path_str + " > " + group if has_parent else group
+                item_metadata = _extend_metadata(parent_metadata, group)
+                # Map keys are lowercase, so lower the group once per row
+                group_lower = group.lower()
+                type_str = account_type_get(group_lower, "derived")
+                is_derived = group_lower not in non_derived_keys
+                category_path = type_str + (" > " + new_path_str if group else "")
+                current_row_index = add_row(
                     sheet,
                     current_row_index,
                     original_num_cols,
-                    new_path,
+                    group,
+                    _render_metadata(item_metadata),
+                    category_path,
+                    col_data,
+                    is_header_or_summary,
+                    type_str,
+                    is_derived,
+                )
+            else:
+                item_metadata = _extend_metadata(parent_metadata, group)
+
+            # Sub-rows come next, before this row's later siblings
+            if sub_rows:
+                stack.extend(
+                    (child, True, new_path_str, item_metadata)
+                    for child in reversed(sub_rows["Row"])
                 )
 
         return current_row_index
@@ -291,57 +308,58 @@ class JsonToExcelConverterRootfi(BaseJsonToExcelConverter):
         row_index: int,
         original_num_cols: int,
         group: str,
-        path: List[str],
+        metadata: str,
         category_path: str,
         col_data: List[Dict],
         is_header_or_summary: bool,
+        type_str: str,
+        is_derived: bool,
     ) -> int:
-        """Add a row to the sheet with all columns"""
+        """
+        Add a row to the sheet with all columns; type_str and is_derived come
+        from the group and metadata is the rendered metadata of the row's path
+        """
         name = group
         sub_category = "" if is_header_or_summary else group
-        type_str = self.account_type_map.get(group.lower(), "derived")
         sub_type = self._get_sub_type(group, sub_category)
         is_summary = is_header_or_summary or self._has_child_paths(category_path)
-        is_derived = type_str == "derived" or group.lower() in self.derived_subtype_map
         is_derived_correct = self._validate_is_derived(group, type_str)
-        metadata = self._create_metadata(path)
-
-        # Fixed columns
-        sheet.cell(row=row_index, column=1, value=name)
-        sheet.cell(row=row_index, column=2, value=category_path)
-        sheet.cell(row=row_index, column=3, value=sub_category)
-        sheet.cell(row=row_index, column=4, value=type_str)
-        sheet.cell(row=row_index, column=5, value=sub_type)
-        sheet.cell(row=row_index, column=6, value=is_summary)
-        sheet.cell(row=row_index, column=7, value=is_derived)
-        sheet.cell(row=row_index, column=8, value=is_derived_correct)
-        sheet.cell(row=row_index, column=9, value=metadata)
-
-        # Monthly columns, Computed Total, Difference
-        sum_val = 0.0
-        for i in range(min(original_num_cols, len(col_data))):
-            cell_node = col_data[i]
-            val = cell_node["value"]
-            try:
-                num_val = float(val)
-                sheet.cell(row=row_index, column=10 + i, value=num_val)
-                if 1 <= i < original_num_cols - 1:
-                    sum_val += num_val
-            except ValueError:
-                sheet.cell(row=row_index, column=10 + i, value=val)
-
-        # Computed Total
-        sheet.cell(row=row_index, column=10 + original_num_cols, value=sum_val)
-
-        # Difference
-        total_cell = sheet.cell(row=row_index, column=10 + original_num_cols - 1)
-        existing_total = 0.0
-        if total_cell.value is not None and isinstance(total_cell.value, (int, float)):
-            existing_total = total_cell.value
-        sheet.cell(
-            row=row_index,
-            column=10 + original_num_cols + 1,
-            value=existing_total - sum_val,
+
+        # Monthly cells as floats where numeric, padded to the column count
+        values = [_parse_cell(cell["value"]) for cell in col_data[:original_num_cols]]
+        values.extend([None] * (original_num_cols - len(values)))
+
+        # Computed Total sums the numeric cells between the label and total columns
+        sum_val = sum(
+            [
+                val
+                for val in values[1 : original_num_cols - 1]
+                if val.__class__ is float
+            ],
+            0.0,
+        )
+
+        # Existing total is the last monthly column when it is numeric
+        existing_total = values[-1] if values else None
+        if not isinstance(existing_total, (int, float)):
+            existing_total = 0.0
+
+        # Fixed columns, then monthly columns, Computed Total, Difference
+        sheet.append(
+            [
+                name,
+                category_path,
+                sub_category,
+                type_str,
+                sub_type,
+                is_summary,
+                is_derived,
+                is_derived_correct,
+                metadata,
+                *values,
+                sum_val,
+                existing_total - sum_val,
+            ]
         )
 
         return row_index + 1
@@ -6,11 +6,97 @@ Handles all account-related database operations
 import sqlite3
 import logging
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import Callable, List, Dict, Any, FrozenSet, Optional, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Entries per single-account lookup cache (by ID, name and composite key)
+_LOOKUP_CACHE_SIZE = 512
+
+# Composite-key lookups back account de-duplication in imports; fixed SQL text
+# lets the connection's statement cache reuse the prepared statements
+_SQL_SELECT_BY_COMPOSITE_KEY_BASE = """
+    SELECT account_id, name, category_path, sub_category, type, sub_type,
+           is_summary, is_derived, description, is_active,
+           created_at, updated_at
+    FROM accounts
+    WHERE name = ? AND category_path = ? AND type = ? AND sub_type {sub_type_test}
+"""
+_SQL_SELECT_BY_COMPOSITE_KEY = _SQL_SELECT_BY_COMPOSITE_KEY_BASE.format(
+    sub_type_test="= ?"
+)
+_SQL_SELECT_BY_COMPOSITE_KEY_NULL_SUB_TYPE = _SQL_SELECT_BY_COMPOSITE_KEY_BASE.format(
+    sub_type_test="IS NULL"
+)
+# Substring search through the accounts_fts trigram index; the term is an FTS5
+# phrase of at least 3 characters
+_SQL_SEARCH_ACCOUNTS_FTS = """
+    SELECT a.account_id, a.name, a.category_path, a.sub_category, a.type,
+           a.sub_type, a.is_summary, a.is_derived, a.description, a.is_active,
+           a.created_at, a.updated_at
+    FROM accounts_fts
+    JOIN accounts a ON a.account_id = accounts_fts.rowid
+    WHERE accounts_fts MATCH ?
+    ORDER BY a.name
+    LIMIT 50
+"""
+_SQL_SEARCH_ACCOUNTS_LIKE = """
+    SELECT account_id, name, category_path, sub_category, type, sub_type,
+           is_summary, is_derived, description, is_active,
+           created_at, updated_at
+    FROM accounts
+    WHERE name LIKE ? OR description LIKE ?
+    ORDER BY name
+    LIMIT 50
+"""
+# Trigram indexes cannot match shorter terms
+_MIN_FTS_TERM_LENGTH = 3
+
+# Columns update_account may change, in the order they appear in its SET clause
+_UPDATABLE_FIELDS = (
+    "name",
+    "category_path",
+    "sub_category",
+    "type",
+    "sub_type",
+    "is_summary",
+    "is_derived",
+    "description",
+    "is_active",
+)
+_UPDATABLE_FIELD_SET = frozenset(_UPDATABLE_FIELDS)
+
+
+@lru_cache(maxsize=64)
+def _update_statement(fields: FrozenSet[str]) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Build the UPDATE statement for a set of account fields
+
+    Returns:
+        (sql, ordered fields); the parameters are the field values in that
+        order followed by the account ID
+    """
+    ordered = tuple(field for field in _UPDATABLE_FIELDS if field in fields)
+    assignments = "".join(f"{field} = ?, " for field in ordered)
+    sql = (
+        f"UPDATE accounts SET {assignments}updated_at = CURRENT_TIMESTAMP "
+        "WHERE account_id = ?"
+    )
+    return sql, ordered
+
+
+def _dict_rows(cursor: sqlite3.Cursor) -> List[Dict[str, Any]]:
+    """
+    Fetch the remaining rows of an executed cursor as dicts keyed by column
+
+    The cursor should return plain tuples (row_factory None): the column names
+    are read once from cursor.description instead of per sqlite3.Row.
+    """
+    keys = [column[0] for column in cursor.description]
+    return [dict(zip(keys, row)) for row in cursor.fetchall()]
+
 
 class AccountStoreInterface(ABC):
     """Abstract interface for account store operations"""
@@ -20,6 +106,13 @@ class AccountStoreInterface(ABC):
         """Create a new account and return account_id"""
         pass
 
+    @abstractmethod
+    def create_accounts_bulk(
+        self, accounts: List[Dict[str, Any]], commit: bool = True
+    ) -> List[int]:
+        """Create many accounts in one database transaction and return their IDs in order"""
+        pass
+
     @abstractmethod
     def get_account_by_id(self, account_id: int) -> Optional[Dict[str, Any]]:
         """Get account by ID"""
@@ -37,6 +130,13 @@ class AccountStoreInterface(ABC):
         """Get account by composite key (name, category_path, type, sub_type)"""
         pass
 
+    @abstractmethod
+    def get_account_composite_keys(
+        self,
+    ) -> List[Tuple[str, str, int, Optional[int], int]]:
+        """Get (name, category_path, type, sub_type, account_id) for every account"""
+        pass
+
     @abstractmethod
     def get_accounts_by_type(
         self, account_type: int, limit: int = 100
@@ -69,20 +169,74 @@ class AccountStoreInterface(ABC):
         """Get total count of accounts"""
         pass
 
+    def clear_cache(self) -> None:
+        """Drop cached lookups after accounts were changed outside the store"""
+        pass
+
 
 class SQLiteAccountStore(AccountStoreInterface):
     """SQLite implementation of account store"""
 
-    def __init__(self, connection_factory):
+    def __init__(
+        self, connection_factory, on_change: Optional[Callable[[], Any]] = None
+    ):
         """
         Initialize with a connection factory function
 
         Args:
-            connection_factory: Function that returns a database connection
+            connection_factory: Function that returns a database connection;
+                called per operation, so it should return a cached (e.g.
+                thread-local) connection rather than open a new one
+            on_change: Called after every write, e.g. to invalidate caches
         """
         self.get_connection = connection_factory
+        self._on_change = on_change
+
+        # Single-account lookups are memoized per store. Entries are keyed on
+        # the cache generation, which every write through the store bumps, so
+        # a lookup racing a write can never be served again afterwards.
+        # Accounts written by other processes are not seen until clear_cache().
+        self._cache_generation = 0
+        self._get_by_id_cached = lru_cache(maxsize=_LOOKUP_CACHE_SIZE)(
+            self._fetch_account_by_id
+        )
+        self._get_by_name_cached = lru_cache(maxsize=_LOOKUP_CACHE_SIZE)(
+            self._fetch_account_by_name
+        )
+        self._get_by_composite_cached = lru_cache(maxsize=_LOOKUP_CACHE_SIZE)(
+            self._fetch_account_by_composite_key
+        )
+        self._accounts_count: Optional[Tuple[int, int]] = None  # (generation, count)
+        self._has_search_index: Optional[bool] = None
         logger.info("Initialized SQLiteAccountStore")
 
+    def clear_cache(self) -> None:
+        """Drop cached lookups after accounts were changed outside the store"""
+        self._cache_generation += 1
+        self._get_by_id_cached.cache_clear()
+        self._get_by_name_cached.cache_clear()
+        self._get_by_composite_cached.cache_clear()
+        self._accounts_count = None
+
+    def _notify_change(self) -> None:
+        """Drop cached lookups and tell the owner that accounts were written"""
+        self.clear_cache()
+        if self._on_change is not None:
+            self._on_change()
+
+    def _cached_lookup(self, cached_fetch, *key) -> Optional[Dict[str, Any]]:
+        """
+        Run a single-account lookup through its cache
+
+        Inside an open transaction the database is queried directly, since
+        uncommitted writes may still be rolled back. Callers get a copy so the
+        cached dict cannot be modified.
+        """
+        if self.get_connection().in_transaction:
+            return cached_fetch.__wrapped__(self._cache_generation, *key)
+        account = cached_fetch(self._cache_generation, *key)
+        return dict(account) if account is not None else None
+
     def create_account(self, account_data: Dict[str, Any]) -> int:
         """Create a new account and return account_id"""
         connection = self.get_connection()
@@ -122,9 +276,70 @@ class SQLiteAccountStore(AccountStoreInterface):
             connection.rollback()
             logger.error(f"Error creating account: {e}")
             raise
+        finally:
+            self._notify_change()
+
+    def create_accounts_bulk(
+        self, accounts: List[Dict[str, Any]], commit: bool = True
+    ) -> List[int]:
+        """
+        Create many accounts with a single commit and return their IDs in order
+
+        With commit=False the inserts are left in the open transaction for the
+        caller to commit or roll back
+        """
+        if not accounts:
+            return []
+
+        connection = self.get_connection()
+        cursor = connection.cursor()
+
+        try:
+            # executemany() cannot report row IDs, but the inserts still share
+            # one transaction and one commit
+            account_ids = []
+            for account_data in accounts:
+                cursor.execute(
+                    """
+                    INSERT INTO accounts 
+                    (name, category_path, sub_category, type, sub_type, is_summary, 
+                     is_derived, description, is_active)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                    (
+                        account_data.get("name"),
+                        account_data.get("category_path"),
+                        account_data.get("sub_category"),
+                        account_data.get("type"),
+                        account_data.get("sub_type"),
+                        account_data.get("is_summary", False),
+                        account_data.get("is_derived", False),
+                        account_data.get("description", ""),
+                        account_data.get("is_active", True),
+                    ),
+                )
+                account_ids.append(cursor.lastrowid)
+
+            if commit:
+                connection.commit()
+            logger.info(f"Created {len(account_ids)} accounts in bulk")
+            return account_ids
+
+        except Exception as e:
+            connection.rollback()
+            logger.error(f"Error creating accounts in bulk: {e}")
+            raise
+        finally:
+            self._notify_change()
 
     def get_account_by_id(self, account_id: int) -> Optional[Dict[str, Any]]:
         """Get account by ID"""
+        return self._cached_lookup(self._get_by_id_cached, account_id)
+
+    def _fetch_account_by_id(
+        self, generation: int, account_id: int
+    ) -> Optional[Dict[str, Any]]:
+        """Query an account by ID; generation only keys the lookup cache"""
         connection = self.get_connection()
         cursor = connection.cursor()
 
@@ -146,6 +361,12 @@ class SQLiteAccountStore(AccountStoreInterface):
 
     def get_account_by_name(self, name: str) -> Optional[Dict[str, Any]]:
         """Get account by name"""
+        return self._cached_lookup(self._get_by_name_cached, name)
+
+    def _fetch_account_by_name(
+        self, generation: int, name: str
+    ) -> Optional[Dict[str, Any]]:
+        """Query an account by name; generation only keys the lookup cache"""
         connection = self.get_connection()
         cursor = connection.cursor()
 
@@ -169,30 +390,31 @@ class SQLiteAccountStore(AccountStoreInterface):
         self, name: str, category_path: str, account_type: int, sub_type: Optional[int]
     ) -> Optional[Dict[str, Any]]:
         """Get account by composite key (name, category_path, type, sub_type)"""
+        return self._cached_lookup(
+            self._get_by_composite_cached, name, category_path, account_type, sub_type
+        )
+
+    def _fetch_account_by_composite_key(
+        self,
+        generation: int,
+        name: str,
+        category_path: str,
+        account_type: int,
+        sub_type: Optional[int],
+    ) -> Optional[Dict[str, Any]]:
+        """Query an account by composite key; generation only keys the lookup cache"""
         connection = self.get_connection()
         cursor = connection.cursor()
 
         # Handle NULL sub_type properly
         if sub_type is None:
             cursor.execute(
-                """
-                SELECT account_id, name, category_path, sub_category, type, sub_type,
-                       is_summary, is_derived, description, is_active,
-                       created_at, updated_at
-                FROM accounts
-                WHERE name = ? AND category_path = ? AND type = ? AND sub_type IS NULL
-            """,
+                _SQL_SELECT_BY_COMPOSITE_KEY_NULL_SUB_TYPE,
                 (name, category_path, account_type),
             )
         else:
             cursor.execute(
-                """
-                SELECT account_id, name, category_path, sub_category, type, sub_type,
-                       is_summary, is_derived, description, is_active,
-                       created_at, updated_at
-                FROM accounts
-                WHERE name = ? AND category_path = ? AND type = ? AND sub_type = ?
-            """,
+                _SQL_SELECT_BY_COMPOSITE_KEY,
                 (name, category_path, account_type, sub_type),
             )
 
@@ -201,12 +423,28 @@ class SQLiteAccountStore(AccountStoreInterface):
             return dict(row)
         return None
 
+    def get_account_composite_keys(
+        self,
+    ) -> List[Tuple[str, str, int, Optional[int], int]]:
+        """Get (name, category_path, type, sub_type, account_id) for every account"""
+        connection = self.get_connection()
+        cursor = connection.cursor()
+
+        cursor.execute("""
+            SELECT name, category_path, type, sub_type, account_id
+            FROM accounts
+            ORDER BY account_id
+        """)
+
+        return [tuple(row) for row in cursor.fetchall()]
+
     def get_accounts_by_type(
         self, account_type: int, limit: int = 100
     ) -> List[Dict[str, Any]]:
         """Get accounts filtered by type"""
         connection = self.get_connection()
         cursor = connection.cursor()
+        cursor.row_factory = None  # plain tuples; _dict_rows names the columns
 
         cursor.execute(
             """
@@ -221,40 +459,35 @@ class SQLiteAccountStore(AccountStoreInterface):
             (account_type, limit),
         )
 
-        results = []
-        for row in cursor.fetchall():
-            results.append(dict(row))
-
-        return results
+        return _dict_rows(cursor)
 
     def search_accounts(self, search_term: str) -> List[Dict[str, Any]]:
         """Search accounts by name or description"""
         connection = self.get_connection()
         cursor = connection.cursor()
+        cursor.row_factory = None  # plain tuples; _dict_rows names the columns
 
-        cursor.execute(
-            """
-            SELECT account_id, name, category_path, sub_category, type, sub_type,
-                   is_summary, is_derived, description, is_active,
-                   created_at, updated_at
-            FROM accounts
-            WHERE name LIKE ? OR description LIKE ?
-            ORDER BY name
-            LIMIT 50
-        """,
-            (f"%{search_term}%", f"%{search_term}%"),
-        )
+        if self._has_search_index is None:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='accounts_fts'"
+            )
+            self._has_search_index = cursor.fetchone() is not None
 
-        results = []
-        for row in cursor.fetchall():
-            results.append(dict(row))
+        if self._has_search_index and len(search_term) >= _MIN_FTS_TERM_LENGTH:
+            # Quoted as one phrase so the term is matched literally
+            phrase = '"' + search_term.replace('"', '""') + '"'
+            cursor.execute(_SQL_SEARCH_ACCOUNTS_FTS, (phrase,))
+        else:
+            pattern = f"%{search_term}%"
+            cursor.execute(_SQL_SEARCH_ACCOUNTS_LIKE, (pattern, pattern))
 
-        return results
+        return _dict_rows(cursor)
 
     def get_all_accounts(self, limit: int = None) -> List[Dict[str, Any]]:
         """Get all accounts"""
         connection = self.get_connection()
         cursor = connection.cursor()
+        cursor.row_factory = None  # plain tuples; _dict_rows names the columns
 
         query = """
             SELECT account_id, name, category_path, sub_category, type, sub_type,
@@ -269,11 +502,7 @@ class SQLiteAccountStore(AccountStoreInterface):
 
         cursor.execute(query)
 
-        results = []
-        for row in cursor.fetchall():
-            results.append(dict(row))
-
-        return results
+        return _dict_rows(cursor)
 
     def update_account(self, account_id: int, account_data: Dict[str, Any]) -> bool:
         """Update account"""
@@ -281,36 +510,15 @@ class SQLiteAccountStore(AccountStoreInterface):
         cursor = connection.cursor()
 
         try:
-            # Build dynamic update query based on provided fields
-            update_fields = []
-            params = []
-
-            for field in [
-                "name",
-                "category_path",
-                "sub_category",
-                "type",
-                "sub_type",
-                "is_summary",
-                "is_derived",
-                "description",
-                "is_active",
-            ]:
-                if field in account_data:
-                    update_fields.append(f"{field} = ?")
-                    params.append(account_data[field])
-
-            if not update_fields:
+            # One statement per set of provided fields, built once
+            fields = _UPDATABLE_FIELD_SET.intersection(account_data)
+            if not fields:
                 logger.warning("No fields to update")
                 return False
 
-            # Add updated_at timestamp
-            update_fields.append("updated_at = CURRENT_TIMESTAMP")
+            query, ordered_fields = _update_statement(fields)
+            params = [account_data[field] for field in ordered_fields]
             params.append(account_id)
-
-            query = (
-                f"UPDATE accounts SET {', '.join(update_fields)} WHERE account_id = ?"
-            )
             cursor.execute(query, params)
 
             connection.commit()
@@ -327,6 +535,8 @@ class SQLiteAccountStore(AccountStoreInterface):
             connection.rollback()
             logger.error(f"Error updating account: {e}")
             raise
+        finally:
+            self._notify_change()
 
     def delete_account(self, account_id: int) -> bool:
         """Delete account"""
@@ -353,21 +563,31 @@ class SQLiteAccountStore(AccountStoreInterface):
             connection.rollback()
             logger.error(f"Error deleting account: {e}")
             raise
+        finally:
+            self._notify_change()
 
     def get_accounts_count(self) -> int:
         """Get total count of accounts"""
         connection = self.get_connection()
+        in_transaction = connection.in_transaction
+        generation = self._cache_generation
+        cached = self._accounts_count
+        if not in_transaction and cached is not None and cached[0] == generation:
+            return cached[1]
+
         cursor = connection.cursor()
 
         cursor.execute("SELECT COUNT(*) FROM accounts")
         count = cursor.fetchone()[0]
 
+        if not in_transaction:
+            self._accounts_count = (generation, count)
         return count
 
 
 class InMemoryAccountStore(SQLiteAccountStore):
     """In-memory implementation of account store (inherits from SQLiteAccountStore)"""
 
-    def __init__(self, connection_factory):
-        super().__init__(connection_factory)
+    def __init__(self, connection_factory, on_change=None):
+        super().__init__(connection_factory, on_change)
         logger.info("Initialized InMemoryAccountStore")
@@ -4,14 +4,118 @@ Handles all database operations for chat-related functionality
 """
 
 import sqlite3
-import json
 import logging
-from typing import Dict, List, Optional, Any
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Any
 from datetime import datetime
 from dataclasses import dataclass
 
+from ..common.date_utils import parse_iso_datetime
+from ..common.json_codec import json_dumps, json_loads
+from .database_schema import DatabaseSchema
+
 logger = logging.getLogger(__name__)
 
+# Applied to the store's own long-lived connection: WAL lets readers run
+# alongside a writer, and a larger page cache keeps hot chat pages in memory
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA wal_autocheckpoint=1000",
+)
+
+# Prepared statements kept per connection; sqlite3 keys its cache by SQL text,
+# so hot queries are fixed strings rather than built per call
+_CACHED_STATEMENTS = 256
+
+_SQL_INSERT_MESSAGE = """
+    INSERT INTO chat_messages
+    (chat_id, message_type, content, query_intent, data_points,
+     prompt, llm_response, summary, token_count)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Re-creating an existing session only touches it; REPLACE would delete the
+# row (and with foreign keys on, its messages) and reset its summary
+_SQL_UPSERT_SESSION = """
+    INSERT INTO chat_sessions
+    (chat_id, user_id, created_at, last_activity, context_summary)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (chat_id) DO UPDATE SET last_activity = excluded.last_activity
+"""
+
+_SQL_TOUCH_SESSION = """
+    UPDATE chat_sessions
+    SET last_activity = CURRENT_TIMESTAMP
+    WHERE chat_id = ?
+"""
+
+_SQL_SELECT_MESSAGES = """
+    SELECT id, chat_id, message_type, content, query_intent, data_points,
+           prompt, llm_response, summary, token_count, timestamp
+    FROM chat_messages
+    WHERE chat_id = ?
+    ORDER BY timestamp {order}
+    LIMIT ?
+"""
+_SQL_SELECT_MESSAGES_DESC = _SQL_SELECT_MESSAGES.format(order="DESC")
+_SQL_SELECT_MESSAGES_ASC = _SQL_SELECT_MESSAGES.format(order="ASC")
+
+# The newest messages whose running token estimate (1 token per 4 characters,
+# as in _estimate_token_count) fits the budget, oldest first.
+# Parameters: chat_id, limit, max_tokens
+_SQL_SELECT_MESSAGES_WITHIN_TOKENS = f"""
+    SELECT id, chat_id, message_type, content, query_intent, data_points,
+           prompt, llm_response, summary, token_count, timestamp
+    FROM (
+        SELECT *, SUM(LENGTH(COALESCE(content, '')) / 4) OVER (
+            ORDER BY timestamp DESC, id DESC ROWS UNBOUNDED PRECEDING
+        ) AS running_tokens
+        FROM ({_SQL_SELECT_MESSAGES_DESC})
+    )
+    WHERE running_tokens <= ?
+    ORDER BY timestamp, id
+"""
+
+_SQL_SELECT_SUMMARIES = """
+    SELECT summary FROM chat_messages
+    WHERE chat_id = ? AND summary IS NOT NULL AND summary != ''
+    ORDER BY timestamp DESC
+    LIMIT ?
+"""
+
+# Always one row: the aggregate covers chats with no messages and the
+# subqueries leave session fields NULL when the session row is missing
+_SQL_CHAT_STATISTICS = """
+    SELECT COUNT(*), COALESCE(SUM(token_count), 0),
+           (SELECT created_at FROM chat_sessions WHERE chat_id = ?1),
+           (SELECT last_activity FROM chat_sessions WHERE chat_id = ?1)
+    FROM chat_messages
+    WHERE chat_id = ?1
+"""
+
+_SQL_UPDATE_CONTEXT_SUMMARY = """
+    UPDATE chat_sessions
+    SET context_summary = ?
+    WHERE chat_id = ?
+"""
+
+
+def _tuple_cursor(connection: sqlite3.Connection) -> sqlite3.Cursor:
+    """
+    Cursor returning plain tuples, whatever the connection's row_factory
+
+    Rows are read by position, so a factory connection's sqlite3.Row
+    objects would only add per-row overhead.
+    """
+    cursor = connection.cursor()
+    cursor.row_factory = None
+    return cursor
+
 
 @dataclass
 class ChatSession:
@@ -41,22 +145,97 @@ class ChatMessage:
     token_count: Optional[int] = None
     timestamp: Optional[datetime] = None
 
+    @classmethod
+    def from_row(cls, row) -> "ChatMessage":
+        """
+        Create from a chat_messages row selected in field order (id, chat_id,
+        ..., token_count, timestamp), passing fields positionally
+        """
+        return cls(
+            row[0],
+            row[1],
+            row[2],
+            row[3],
+            row[4],
+            json_loads(row[5]) if row[5] else [],
+            row[6],
+            row[7],
+            row[8],
+            row[9],
+            parse_iso_datetime(row[10]) if row[10] else None,
+        )
+
 
 class ChatStore:
     """Store for managing chat sessions and messages"""
 
-    def __init__(self, db_path: str = "financial_data.db"):
+    def __init__(
+        self,
+        db_path: str = "financial_data.db",
+        connection_factory: Optional[Callable[[], sqlite3.Connection]] = None,
+    ):
+        """
+        Initialize the store
+
+        Args:
+            db_path: SQLite database path, used when no connection_factory is given
+            connection_factory: Function returning a long-lived (e.g. thread-local
+                or shared) connection to reuse; it must not open a new
+                connection per call. Without it the store keeps one connection
+                to db_path for its lifetime.
+        """
         self.db_path = db_path
+        self._connection_factory = connection_factory
+        self._connection: Optional[sqlite3.Connection] = None
+        # Serializes use of the connection; a shared connection is not safe
+        # for concurrent statements from several threads
+        self._lock = threading.RLock()
         self.init_tables()
 
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get the connection to use, opening the store's own on first use"""
+        if self._connection_factory is not None:
+            return self._connection_factory()
+
+        if self._connection is None:
+            connection = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                cached_statements=_CACHED_STATEMENTS,
+            )
+            for pragma in _CONNECTION_PRAGMAS:
+                try:
+                    connection.execute(pragma)
+                except sqlite3.OperationalError as e:
+                    logger.warning(f"Could not apply '{pragma}': {e}")
+            self._connection = connection
+        return self._connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Use the connection under the store lock; commits on success and rolls
+        back on error, like a sqlite3 connection's own context manager
+        """
+        with self._lock:
+            connection = self._get_connection()
+            with connection:
+                yield connection
+
+    def close(self):
+        """Close the store's own connection; factory connections are left open"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
     def init_tables(self):
         """Initialize chat-related tables"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._transaction() as conn:
+            cursor = _tuple_cursor(conn)
 
             # Chat sessions table
-            cursor.execute(
-                """
+            cursor.execute("""
                 CREATE TABLE IF NOT EXISTS chat_sessions (
                     chat_id TEXT PRIMARY KEY,
                     user_id TEXT,
@@ -65,12 +244,10 @@ class ChatStore:
                     context_summary TEXT,
                     metadata TEXT
                 )
-            """
-            )
+            """)
 
             # Chat messages table
-            cursor.execute(
-                """
+            cursor.execute("""
                 CREATE TABLE IF NOT EXISTS chat_messages (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     chat_id TEXT,
@@ -85,36 +262,32 @@ class ChatStore:
                     timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     FOREIGN KEY (chat_id) REFERENCES chat_sessions (chat_id)
                 )
-            """
-            )
+            """)
+
+            for index_sql in DatabaseSchema.get_chat_indexes_sql():
+                cursor.execute(index_sql)
 
             conn.commit()
 
     def create_chat_session(self, chat_id: str, user_id: str = None) -> ChatSession:
-        """Create a new chat session"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO chat_sessions 
-                (chat_id, user_id, created_at, last_activity, context_summary)
-                VALUES (?, ?, ?, ?, ?)
-            """,
-                (chat_id, user_id, datetime.now(), datetime.now(), ""),
-            )
+        """Create a new chat session; an existing one is only marked active"""
+        now = datetime.now()
+        with self._transaction() as conn:
+            cursor = _tuple_cursor(conn)
+            cursor.execute(_SQL_UPSERT_SESSION, (chat_id, user_id, now, now, ""))
             conn.commit()
 
         return ChatSession(
             chat_id=chat_id,
             user_id=user_id,
-            created_at=datetime.now(),
-            last_activity=datetime.now(),
+            created_at=now,
+            last_activity=now,
         )
 
     def get_chat_session(self, chat_id: str) -> Optional[ChatSession]:
         """Get existing chat session"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._transaction() as conn:
+            cursor = _tuple_cursor(conn)
             cursor.execute(
                 """
                 SELECT chat_id, user_id, created_at, last_activity, context_summary
@@ -128,146 +301,116 @@ class ChatStore:
                 return ChatSession(
                     chat_id=row[0],
                     user_id=row[1],
-                    created_at=datetime.fromisoformat(row[2]) if row[2] else None,
-                    last_activity=datetime.fromisoformat(row[3]) if row[3] else None,
+                    created_at=parse_iso_datetime(row[2]) if row[2] else None,
+                    last_activity=parse_iso_datetime(row[3]) if row[3] else None,
                     context_summary=row[4] or "",
                 )
         return None
 
     def add_message(self, message: ChatMessage) -> int:
         """Add a message to chat history"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO chat_messages 
-                (chat_id, message_type, content, query_intent, data_points, 
-                 prompt, llm_response, summary, token_count)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    message.chat_id,
-                    message.message_type,
-                    message.content,
-                    message.query_intent,
-                    json.dumps(message.data_points) if message.data_points else None,
-                    message.prompt,
-                    message.llm_response,
-                    message.summary,
-                    message.token_count,
-                ),
+        return self.add_messages([message])[0]
+
+    def add_messages(self, messages: List[ChatMessage]) -> List[int]:
+        """
+        Add messages to chat history in one transaction
+
+        Args:
+            messages: Messages to insert, in order
+
+        Returns:
+            The new message IDs, in the same order as messages
+        """
+        if not messages:
+            return []
+
+        rows = [
+            (
+                message.chat_id,
+                message.message_type,
+                message.content,
+                message.query_intent,
+                json_dumps(message.data_points) if message.data_points else None,
+                message.prompt,
+                message.llm_response,
+                message.summary,
+                message.token_count,
             )
+            for message in messages
+        ]
 
-            message_id = cursor.lastrowid
+        with self._transaction() as conn:
+            cursor = _tuple_cursor(conn)
+            cursor.executemany(_SQL_INSERT_MESSAGE, rows)
 
-            # Update last activity
-            cursor.execute(
-                """
-                UPDATE chat_sessions 
-                SET last_activity = CURRENT_TIMESTAMP 
-                WHERE chat_id = ?
-            """,
-                (message.chat_id,),
+            # The transaction holds the write lock, so AUTOINCREMENT IDs of
+            # this batch are consecutive and end at the last inserted row
+            last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+
+            # Update last activity once per chat
+            cursor.executemany(
+                _SQL_TOUCH_SESSION,
+                [(chat_id,) for chat_id in dict.fromkeys(row[0] for row in rows)],
             )
 
             conn.commit()
-            return message_id
+
+        first_id = last_id - len(rows) + 1
+        return list(range(first_id, last_id + 1))
 
     def get_messages(
         self, chat_id: str, limit: int = 10, order_desc: bool = True
     ) -> List[ChatMessage]:
         """Get messages for a chat session"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            order_clause = "DESC" if order_desc else "ASC"
+        with self._transaction() as conn:
+            cursor = _tuple_cursor(conn)
             cursor.execute(
-                f"""
-                SELECT id, chat_id, message_type, content, query_intent, data_points, 
-                       prompt, llm_response, summary, token_count, timestamp
-                FROM chat_messages 
-                WHERE chat_id = ? 
-                ORDER BY timestamp {order_clause}
-                LIMIT ?
-            """,
+                _SQL_SELECT_MESSAGES_DESC if order_desc else _SQL_SELECT_MESSAGES_ASC,
                 (chat_id, limit),
             )
 
-            messages = []
-            for row in cursor.fetchall():
-                messages.append(
-                    ChatMessage(
-                        id=row[0],
-                        chat_id=row[1],
-                        message_type=row[2],
-                        content=row[3],
-                        query_intent=row[4],
-                        data_points=json.loads(row[5]) if row[5] else [],
-                        prompt=row[6],
-                        llm_response=row[7],
-                        summary=row[8],
-                        token_count=row[9],
-                        timestamp=datetime.fromisoformat(row[10]) if row[10] else None,
-                    )
-                )
-
-            return messages
+            from_row = ChatMessage.from_row
+            return [from_row(row) for row in cursor]
 
     def get_conversation_summaries(self, chat_id: str, limit: int = 5) -> List[str]:
         """Get recent conversation summaries for context"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT summary FROM chat_messages 
-                WHERE chat_id = ? AND summary IS NOT NULL AND summary != ''
-                ORDER BY timestamp DESC 
-                LIMIT ?
-            """,
-                (chat_id, limit),
-            )
+        with self._transaction() as conn:
+            cursor = _tuple_cursor(conn)
+            cursor.execute(_SQL_SELECT_SUMMARIES, (chat_id, limit))
 
-            summaries = [str(row[0]) for row in cursor.fetchall() if row[0] is not None]
-            return summaries
+            # The query already drops NULL and empty summaries
+            return [row[0] for row in cursor]
 
     def get_messages_with_token_limit(
         self, chat_id: str, max_tokens: int = 2000, limit: int = 20
     ) -> List[ChatMessage]:
-        """Get recent conversation history respecting token limits"""
-        messages = self.get_messages(chat_id, limit, order_desc=True)
-        selected_messages = []
-        total_tokens = 0
-
-        # Start from most recent and work backwards
-        for message in reversed(messages):
-            message_tokens = self._estimate_token_count(message.content)
-            if total_tokens + message_tokens <= max_tokens:
-                selected_messages.insert(
-                    0, message
-                )  # Insert at beginning to maintain order
-                total_tokens += message_tokens
-            else:
-                break
+        """
+        Get recent conversation history respecting token limits
+
+        Starting from the most recent of the last `limit` messages, keeps
+        messages until the next one would exceed max_tokens; returns them
+        oldest first
+        """
+        with self._transaction() as conn:
+            cursor = _tuple_cursor(conn)
+            cursor.execute(
+                _SQL_SELECT_MESSAGES_WITHIN_TOKENS, (chat_id, limit, max_tokens)
+            )
 
-        return selected_messages
+            from_row = ChatMessage.from_row
+            return [from_row(row) for row in cursor]
 
     def update_context_summary(self, chat_id: str, summary: str):
         """Update context summary for the chat"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                UPDATE chat_sessions 
-                SET context_summary = ? 
-                WHERE chat_id = ?
-            """,
-                (summary, chat_id),
-            )
+        with self._transaction() as conn:
+            cursor = _tuple_cursor(conn)
+            cursor.execute(_SQL_UPDATE_CONTEXT_SUMMARY, (summary, chat_id))
             conn.commit()
 
     def clear_chat_messages(self, chat_id: str = None):
         """Clear chat messages for a specific chat or all chats"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._transaction() as conn:
+            cursor = _tuple_cursor(conn)
             if chat_id:
                 cursor.execute(
                     "DELETE FROM chat_messages WHERE chat_id = ?", (chat_id,)
@@ -289,34 +432,14 @@ class ChatStore:
 
     def get_chat_statistics(self, chat_id: str) -> Dict[str, Any]:
         """Get statistics for a chat session"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            # Get message count
-            cursor.execute(
-                "SELECT COUNT(*) FROM chat_messages WHERE chat_id = ?", (chat_id,)
-            )
-            message_count = cursor.fetchone()[0]
-
-            # Get total tokens
-            cursor.execute(
-                "SELECT SUM(token_count) FROM chat_messages WHERE chat_id = ?",
-                (chat_id,),
-            )
-            total_tokens = cursor.fetchone()[0] or 0
-
-            # Get session info
-            cursor.execute(
-                """
-                SELECT created_at, last_activity FROM chat_sessions WHERE chat_id = ?
-            """,
-                (chat_id,),
-            )
-            session_info = cursor.fetchone()
+        with self._transaction() as conn:
+            cursor = _tuple_cursor(conn)
+            cursor.execute(_SQL_CHAT_STATISTICS, (chat_id,))
+            message_count, total_tokens, created_at, last_activity = cursor.fetchone()
 
             return {
                 "message_count": message_count,
                 "total_tokens": total_tokens,
-                "created_at": session_info[0] if session_info else None,
-                "last_activity": session_info[1] if session_info else None,
+                "created_at": created_at,
+                "last_activity": last_activity,
             }
@@ -7,7 +7,8 @@ import sqlite3
 import threading
 import logging
 import os
-from typing import List, Dict, Any, Tuple
+from dataclasses import dataclass
+from typing import List, Dict, Any, Tuple, Iterator
 from enum import Enum
 
 from ..config.settings import config_manager
@@ -26,6 +27,16 @@ from .chat_store import ChatStore
 
 logger = logging.getLogger(__name__)
 
+# Applied to every file-database connection: WAL lets readers run while a
+# chat turn or import is writing, and synchronous=NORMAL only syncs the WAL at
+# checkpoints instead of on every commit
+_FILE_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA wal_autocheckpoint=1000",
+)
+
 
 class FilterOperator(Enum):
     """Filter operators for advanced queries"""
@@ -44,13 +55,13 @@ class FilterOperator(Enum):
     IS_NOT_NULL = "IS NOT NULL"
 
 
+@dataclass(slots=True, frozen=True)
 class FilterCondition:
     """Represents a filter condition for queries"""
 
-    def __init__(self, field: str, operator: FilterOperator, value: Any = None):
-        self.field = field
-        self.operator = operator
-        self.value = value
+    field: str
+    operator: FilterOperator
+    value: Any = None
 
     def to_sql(self) -> Tuple[str, List[Any]]:
         """Convert filter condition to SQL WHERE clause"""
@@ -103,6 +114,9 @@ class DatabaseManager:
             os.getenv("ENVIRONMENT") == "TEST" or self.config.database.type == "memory"
         )
 
+        # Incremented on every bulk data change so callers can invalidate caches
+        self._data_version = 0
+
         # Initialize stores
         self._account_store = None
         self._transaction_store = None
@@ -136,27 +150,44 @@ class DatabaseManager:
     def _get_connection(self):
         """Get thread-safe database connection"""
         if self._is_memory:
-            # For in-memory, use a shared connection
+            # For in-memory, use a shared connection (also used from worker threads)
             if not hasattr(self, "_shared_connection"):
-                self._shared_connection = sqlite3.connect(":memory:")
+                self._shared_connection = sqlite3.connect(
+                    ":memory:", check_same_thread=False
+                )
                 self._shared_connection.row_factory = sqlite3.Row
             return self._shared_connection
         else:
             # For file-based, use thread-local connections
             if not hasattr(self._local, "connection"):
-                self._local.connection = sqlite3.connect(self._db_path)
-                self._local.connection.row_factory = sqlite3.Row
+                connection = sqlite3.connect(self._db_path)
+                connection.row_factory = sqlite3.Row
+                for pragma in _FILE_CONNECTION_PRAGMAS:
+                    try:
+                        connection.execute(pragma)
+                    except sqlite3.OperationalError as e:
+                        logger.warning(f"Could not apply '{pragma}': {e}")
+                self._local.connection = connection
             return self._local.connection
 
+    @property
+    def is_memory(self) -> bool:
+        """Whether all threads share one in-memory connection"""
+        return self._is_memory
+
     @property
     def account_store(self) -> AccountStoreInterface:
         """Get account store singleton"""
         if self._account_store is None:
             connection_factory = self._get_connection
             if self._is_memory:
-                self._account_store = InMemoryAccountStore(connection_factory)
+                self._account_store = InMemoryAccountStore(
+                    connection_factory, self.bump_data_version
+                )
             else:
-                self._account_store = SQLiteAccountStore(connection_factory)
+                self._account_store = SQLiteAccountStore(
+                    connection_factory, self.bump_data_version
+                )
         return self._account_store
 
     @property
@@ -165,16 +196,20 @@ class DatabaseManager:
         if self._transaction_store is None:
             connection_factory = self._get_connection
             if self._is_memory:
-                self._transaction_store = InMemoryTransactionStore(connection_factory)
+                self._transaction_store = InMemoryTransactionStore(
+                    connection_factory, self.bump_data_version
+                )
             else:
-                self._transaction_store = SQLiteTransactionStore(connection_factory)
+                self._transaction_store = SQLiteTransactionStore(
+                    connection_factory, self.bump_data_version
+                )
         return self._transaction_store
 
     @property
     def chat_store(self) -> ChatStore:
         """Get chat store singleton"""
         if self._chat_store is None:
-            self._chat_store = ChatStore(self._db_path)
+            self._chat_store = ChatStore(self._db_path, self._get_connection)
         return self._chat_store
 
     # Legacy compatibility methods for existing code
@@ -234,6 +269,10 @@ class DatabaseManager:
         """Legacy method - delegates to transaction store"""
         return self.transaction_store.get_transactions_by_period(start_date, end_date)
 
+    def iter_metrics_by_period(self, start_date: str, end_date: str) -> Iterator[Dict]:
+        """Stream metrics for a period - delegates to transaction store"""
+        return self.transaction_store.iter_transactions_by_period(start_date, end_date)
+
     def get_financial_summary(
         self, period_start: str, period_end: str
     ) -> Dict[str, Any]:
@@ -241,7 +280,11 @@ class DatabaseManager:
         return self.transaction_store.get_financial_summary(period_start, period_end)
 
     def get_metrics_summary(
-        self, group_by: str, filters: List[FilterCondition] = None
+        self,
+        group_by: str,
+        filters: List[FilterCondition] = None,
+        aggregation: str = "SUM",
+        limit: int = None,
     ) -> List[Dict]:
         """Legacy method - delegates to transaction store"""
         # Convert FilterCondition to dict format
@@ -256,7 +299,9 @@ class DatabaseManager:
                     }
                 )
 
-        return self.transaction_store.get_metrics_summary(group_by, dict_filters)
+        return self.transaction_store.get_metrics_summary(
+            group_by, dict_filters, aggregation, limit
+        )
 
     def store_metrics(self, metrics: List[Dict[str, Any]]) -> None:
         """Legacy method - delegates to transaction store"""
@@ -280,8 +325,34 @@ class DatabaseManager:
         cursor.execute("DELETE FROM chat_sessions")
         cursor.execute("DELETE FROM chat_messages")
         connection.commit()
+        self.account_store.clear_cache()
+        self.bump_data_version()
         logger.info("Cleared all data from database")
 
+    def get_data_version(self) -> int:
+        """
+        Get the current data version
+
+        Writes through the stores bump it in this process. For file databases,
+        commits by other processes are picked up through SQLite's
+        PRAGMA data_version on this thread's connection.
+        """
+        if not self._is_memory:
+            connection = self._get_connection()
+            external_version = connection.execute("PRAGMA data_version").fetchone()[0]
+            # A connection's first reading has nothing to compare with, so it
+            # counts as a change too
+            if external_version != getattr(self._local, "external_version", None):
+                self._local.external_version = external_version
+                self.bump_data_version()
+        return self._data_version
+
+    def bump_data_version(self) -> int:
+        """Mark stored data as changed and return the new data version"""
+        with self._lock:
+            self._data_version += 1
+            return self._data_version
+
     def get_accounts_count(self) -> int:
         """Get total number of accounts"""
         return self.account_store.get_accounts_count()
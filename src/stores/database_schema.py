@@ -99,6 +99,10 @@ class DatabaseSchema:
             "CREATE INDEX IF NOT EXISTS idx_account_type ON accounts (type)",
             "CREATE INDEX IF NOT EXISTS idx_account_sub_type ON accounts (sub_type)",
             "CREATE INDEX IF NOT EXISTS idx_account_name ON accounts (name)",
+            # Covers get_accounts_by_type's filter and its ORDER BY name
+            "CREATE INDEX IF NOT EXISTS idx_account_type_name ON accounts (type, name)",
+            # Composite-key lookups done for every imported row
+            "CREATE INDEX IF NOT EXISTS idx_account_composite_key ON accounts (name, category_path, type, sub_type)",
             "CREATE INDEX IF NOT EXISTS idx_transaction_period ON finance_transactions (period_start, period_end)",
             "CREATE INDEX IF NOT EXISTS idx_transaction_account ON finance_transactions (account_id)",
             "CREATE INDEX IF NOT EXISTS idx_transaction_source ON finance_transactions (source_id)",
@@ -114,8 +118,72 @@ class DatabaseSchema:
             "CREATE INDEX IF NOT EXISTS idx_message_chat ON chat_messages (chat_id)",
             "CREATE INDEX IF NOT EXISTS idx_message_timestamp ON chat_messages (timestamp)",
             "CREATE INDEX IF NOT EXISTS idx_message_type ON chat_messages (message_type)",
+            # A chat's history in time order without a sort
+            "CREATE INDEX IF NOT EXISTS idx_message_chat_timestamp ON chat_messages (chat_id, timestamp)",
+            # Only the messages get_conversation_summaries returns
+            "CREATE INDEX IF NOT EXISTS idx_message_chat_summary ON chat_messages (chat_id, timestamp) WHERE summary IS NOT NULL AND summary != ''",
+        ]
+
+    @staticmethod
+    def get_account_search_sql() -> list:
+        """
+        Get SQL for the accounts_fts full-text index and the triggers that
+        keep it in sync with accounts
+
+        The trigram tokenizer matches any substring of 3+ characters, so the
+        index answers the same questions as LIKE '%term%'.
+        """
+        return [
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS accounts_fts USING fts5(
+                name, description,
+                content='accounts', content_rowid='account_id', tokenize='trigram'
+            )
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS accounts_fts_insert AFTER INSERT ON accounts
+            BEGIN
+                INSERT INTO accounts_fts (rowid, name, description)
+                VALUES (new.account_id, new.name, new.description);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS accounts_fts_delete AFTER DELETE ON accounts
+            BEGIN
+                INSERT INTO accounts_fts (accounts_fts, rowid, name, description)
+                VALUES ('delete', old.account_id, old.name, old.description);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS accounts_fts_update
+            AFTER UPDATE OF name, description ON accounts
+            BEGIN
+                INSERT INTO accounts_fts (accounts_fts, rowid, name, description)
+                VALUES ('delete', old.account_id, old.name, old.description);
+                INSERT INTO accounts_fts (rowid, name, description)
+                VALUES (new.account_id, new.name, new.description);
+            END
+            """,
         ]
 
+    @classmethod
+    def _create_account_search(cls, cursor) -> None:
+        """Create the account search index, indexing existing accounts when new"""
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='accounts_fts'"
+        )
+        exists = cursor.fetchone() is not None
+        try:
+            for sql in cls.get_account_search_sql():
+                cursor.execute(sql)
+            if not exists:
+                cursor.execute(
+                    "INSERT INTO accounts_fts (accounts_fts) VALUES ('rebuild')"
+                )
+        except Exception as e:
+            # SQLite builds without FTS5 or the trigram tokenizer fall back to LIKE
+            logger.warning(f"Error creating account search index: {e}")
+
     @classmethod
     def initialize_schema(cls, cursor, commit_func=None):
         """
@@ -161,6 +229,9 @@ class DatabaseSchema:
             except Exception as e:
                 logger.warning(f"Error creating chat index: {e}")
 
+        # Full-text index behind account search
+        cls._create_account_search(cursor)
+
         # Commit if commit function provided
         if commit_func:
             commit_func()
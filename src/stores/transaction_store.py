@@ -6,11 +6,20 @@ Handles all transaction-related database operations
 import sqlite3
 import logging
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Callable, List, Dict, Any, Optional, Tuple, Iterator
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# get_metrics_summary group fields and the columns they group by
+_SUMMARY_GROUP_COLUMNS = {
+    "account_type": "a.type",
+    "account_name": "a.name",
+    "period_start": "ft.period_start",
+    "period_end": "ft.period_end",
+}
+_SUMMARY_AGGREGATIONS = frozenset(["SUM", "AVG", "COUNT", "MIN", "MAX"])
+
 
 class TransactionStoreInterface(ABC):
     """Abstract interface for transaction store operations"""
@@ -20,6 +29,13 @@ class TransactionStoreInterface(ABC):
         """Create a new transaction and return tx_id"""
         pass
 
+    @abstractmethod
+    def create_transactions_bulk(
+        self, transactions: List[Dict[str, Any]], commit: bool = True
+    ) -> int:
+        """Create many transactions in one database transaction and return the count"""
+        pass
+
     @abstractmethod
     def get_transaction_by_id(self, tx_id: int) -> Optional[Dict[str, Any]]:
         """Get transaction by ID"""
@@ -51,6 +67,17 @@ class TransactionStoreInterface(ABC):
         """Query transactions with aggregation and grouping"""
         pass
 
+    @abstractmethod
+    def get_metrics_summary(
+        self,
+        group_by: str,
+        filters: List[Dict[str, Any]] = None,
+        aggregation: str = "SUM",
+        limit: int = None,
+    ) -> List[Dict[str, Any]]:
+        """Aggregate transaction values per group in the database"""
+        pass
+
     @abstractmethod
     def get_transactions_by_account(
         self, account_id: int, limit: int = 100
@@ -65,6 +92,13 @@ class TransactionStoreInterface(ABC):
         """Get transactions for a specific period"""
         pass
 
+    @abstractmethod
+    def iter_transactions_by_period(
+        self, start_date: str, end_date: str
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate transactions for a specific period without loading them all"""
+        pass
+
     @abstractmethod
     def update_transaction(self, tx_id: int, transaction_data: Dict[str, Any]) -> bool:
         """Update transaction"""
@@ -96,16 +130,27 @@ class TransactionStoreInterface(ABC):
 class SQLiteTransactionStore(TransactionStoreInterface):
     """SQLite implementation of transaction store"""
 
-    def __init__(self, connection_factory):
+    def __init__(
+        self,
+        connection_factory,
+        on_change: Optional[Callable[[], Any]] = None,
+    ):
         """
         Initialize with a connection factory function
 
         Args:
             connection_factory: Function that returns a database connection
+            on_change: Called after every write, e.g. to invalidate caches
         """
         self.get_connection = connection_factory
+        self._on_change = on_change
         logger.info("Initialized SQLiteTransactionStore")
 
+    def _notify_change(self) -> None:
+        """Tell the owner that transactions were written"""
+        if self._on_change is not None:
+            self._on_change()
+
     def create_transaction(self, transaction_data: Dict[str, Any]) -> int:
         """Create a new transaction and return tx_id"""
         connection = self.get_connection()
@@ -134,6 +179,7 @@ class SQLiteTransactionStore(TransactionStoreInterface):
 
             tx_id = cursor.lastrowid
             connection.commit()
+            self._notify_change()
             logger.info(f"Created transaction with ID: {tx_id}")
             return tx_id
 
@@ -142,6 +188,57 @@ class SQLiteTransactionStore(TransactionStoreInterface):
             logger.error(f"Error creating transaction: {e}")
             raise
 
+    def create_transactions_bulk(
+        self, transactions: List[Dict[str, Any]], commit: bool = True
+    ) -> int:
+        """
+        Create many transactions with one executemany and a single commit
+
+        With commit=False the inserts are left in the open transaction for the
+        caller to commit or roll back
+        """
+        if not transactions:
+            return 0
+
+        connection = self.get_connection()
+        cursor = connection.cursor()
+
+        try:
+            cursor.executemany(
+                """
+                INSERT INTO finance_transactions 
+                (account_id, period_start, period_end, value, currency, 
+                 derived_sub_type, created_by, notes, source_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                [
+                    (
+                        transaction_data.get("account_id"),
+                        transaction_data.get("period_start"),
+                        transaction_data.get("period_end"),
+                        transaction_data.get("value"),
+                        transaction_data.get("currency", 1),
+                        transaction_data.get("derived_sub_type"),
+                        transaction_data.get("created_by"),
+                        transaction_data.get("notes"),
+                        transaction_data.get("source_id", 1),
+                    )
+                    for transaction_data in transactions
+                ],
+            )
+
+            if commit:
+                connection.commit()
+            # Without commit, the caller notifies again once it has committed
+            self._notify_change()
+            logger.info(f"Created {len(transactions)} transactions in bulk")
+            return len(transactions)
+
+        except Exception as e:
+            connection.rollback()
+            logger.error(f"Error creating transactions in bulk: {e}")
+            raise
+
     def get_transaction_by_id(self, tx_id: int) -> Optional[Dict[str, Any]]:
         """Get transaction by ID"""
         connection = self.get_connection()
@@ -521,6 +618,94 @@ class SQLiteTransactionStore(TransactionStoreInterface):
             "params_used": params,
         }
 
+    def get_metrics_summary(
+        self,
+        group_by: str,
+        filters: List[Dict[str, Any]] = None,
+        aggregation: str = "SUM",
+        limit: int = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregate transaction values per group with a single GROUP BY query
+
+        Only one row per group leaves the database, so the cost of the result
+        does not grow with the number of matching transactions.
+
+        Args:
+            group_by: Field to group by (account_name, account_type,
+                period_start, period_end)
+            filters: List of filter conditions
+            aggregation: Aggregate function applied to value (SUM, AVG, COUNT, MIN, MAX)
+            limit: Maximum number of groups to return
+
+        Returns:
+            List of dicts with the group field, total_value and record_count
+
+        Raises:
+            ValueError: If group_by or aggregation is not supported
+        """
+        db_field = _SUMMARY_GROUP_COLUMNS.get(group_by)
+        if db_field is None:
+            raise ValueError(
+                f"Invalid group_by field. Must be one of: {sorted(_SUMMARY_GROUP_COLUMNS)}"
+            )
+        function = aggregation.upper()
+        if function not in _SUMMARY_AGGREGATIONS:
+            raise ValueError(
+                f"Invalid aggregation. Must be one of: {sorted(_SUMMARY_AGGREGATIONS)}"
+            )
+
+        connection = self.get_connection()
+        cursor = connection.cursor()
+        cursor.arraysize = 1000
+
+        aggregate_sql = "COUNT(*)" if function == "COUNT" else f"{function}(ft.value)"
+
+        query = f"""
+            SELECT {db_field} as {group_by},
+                {aggregate_sql} as total_value,
+                COUNT(*) as record_count
+            FROM finance_transactions ft
+            JOIN accounts a ON ft.account_id = a.account_id
+        """
+
+        # Add WHERE conditions
+        params = []
+        if filters:
+            where_conditions = []
+            for filter_item in filters:
+                field = filter_item.get("field")
+                operator = filter_item.get("operator", "=")
+                value = filter_item.get("value")
+
+                if field and value is not None:
+                    condition_sql, condition_params = self._build_filter_condition(
+                        field, operator, value
+                    )
+                    where_conditions.append(condition_sql)
+                    params.extend(condition_params)
+
+            if where_conditions:
+                query += " WHERE " + " AND ".join(where_conditions)
+
+        query += f" GROUP BY {db_field} ORDER BY {db_field}"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+
+        cursor.execute(query, params)
+
+        results = []
+        try:
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                results.extend(dict(row) for row in rows)
+        finally:
+            cursor.close()
+
+        return results
+
     def get_transactions_by_account(
         self, account_id: int, limit: int = 100
     ) -> List[Dict[str, Any]]:
@@ -554,8 +739,15 @@ class SQLiteTransactionStore(TransactionStoreInterface):
         self, start_date: str, end_date: str
     ) -> List[Dict[str, Any]]:
         """Get transactions for a specific period"""
+        return list(self.iter_transactions_by_period(start_date, end_date))
+
+    def iter_transactions_by_period(
+        self, start_date: str, end_date: str
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate transactions for a specific period, fetching rows in batches"""
         connection = self.get_connection()
         cursor = connection.cursor()
+        cursor.arraysize = 1000
 
         cursor.execute(
             """
@@ -572,11 +764,15 @@ class SQLiteTransactionStore(TransactionStoreInterface):
             (start_date, end_date),
         )
 
-        results = []
-        for row in cursor.fetchall():
-            results.append(dict(row))
-
-        return results
+        try:
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+        finally:
+            cursor.close()
 
     def update_transaction(self, tx_id: int, transaction_data: Dict[str, Any]) -> bool:
         """Update transaction"""
@@ -614,6 +810,8 @@ class SQLiteTransactionStore(TransactionStoreInterface):
 
             connection.commit()
             updated = cursor.rowcount > 0
+            if updated:
+                self._notify_change()
 
             if updated:
                 logger.info(f"Updated transaction with ID: {tx_id}")
@@ -636,6 +834,8 @@ class SQLiteTransactionStore(TransactionStoreInterface):
             cursor.execute("DELETE FROM finance_transactions WHERE tx_id = ?", (tx_id,))
             connection.commit()
             deleted = cursor.rowcount > 0
+            if deleted:
+                self._notify_change()
 
             if deleted:
                 logger.info(f"Deleted transaction with ID: {tx_id}")
@@ -715,6 +915,7 @@ class SQLiteTransactionStore(TransactionStoreInterface):
             cursor.execute("DELETE FROM finance_transactions")
             deleted_count = cursor.rowcount
             connection.commit()
+            self._notify_change()
             logger.info(f"Cleared {deleted_count} transactions from database")
             return deleted_count
 
@@ -727,6 +928,6 @@ class SQLiteTransactionStore(TransactionStoreInterface):
 class InMemoryTransactionStore(SQLiteTransactionStore):
     """In-memory implementation of transaction store (inherits from SQLiteTransactionStore)"""
 
-    def __init__(self, connection_factory):
-        super().__init__(connection_factory)
+    def __init__(self, connection_factory, on_change=None):
+        super().__init__(connection_factory, on_change)
         logger.info("Initialized InMemoryTransactionStore")
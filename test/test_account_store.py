@@ -237,6 +237,39 @@ class TestAccountStore(unittest.TestCase):
         )
         self.assertIsNone(retrieved_account)
 
+    def test_create_accounts_bulk(self):
+        """Test bulk insert returns IDs in input order."""
+        account_ids = self.account_store.create_accounts_bulk(self.sample_accounts)
+
+        self.assertEqual(len(account_ids), len(self.sample_accounts))
+        for account_data, account_id in zip(self.sample_accounts, account_ids):
+            account = self.account_store.get_account_by_id(account_id)
+            self.assertEqual(account["name"], account_data["name"])
+        self.assertEqual(self.account_store.create_accounts_bulk([]), [])
+
+    def test_get_account_composite_keys(self):
+        """Test listing composite keys with account IDs in creation order."""
+        account_ids = [
+            self.account_store.create_account(account_data)
+            for account_data in self.sample_accounts
+        ]
+
+        keys = self.account_store.get_account_composite_keys()
+
+        self.assertEqual(
+            keys,
+            [
+                (
+                    account_data["name"],
+                    account_data["category_path"],
+                    account_data["type"],
+                    account_data["sub_type"],
+                    account_id,
+                )
+                for account_data, account_id in zip(self.sample_accounts, account_ids)
+            ],
+        )
+
     def test_get_accounts_by_type(self):
         """Test retrieving accounts filtered by type."""
         # Create accounts of different types
@@ -315,6 +348,26 @@ class TestAccountStore(unittest.TestCase):
                 f"Expected 'Cash' in name or description of {result['name']}",
             )
 
+    def test_search_accounts_substring_index(self):
+        """Test that search matches inside words and follows updates."""
+        account_ids = self.account_store.create_accounts_bulk(self.sample_accounts)
+
+        # Mid-word and case-insensitive, as with LIKE '%term%'
+        results = self.account_store.search_accounts("ECEIV")
+        self.assertEqual([r["name"] for r in results], ["Accounts Receivable"])
+
+        # Terms too short for the trigram index use LIKE
+        self.assertIn(
+            "Cash Account",
+            [r["name"] for r in self.account_store.search_accounts("sh")],
+        )
+
+        self.account_store.update_account(account_ids[0], {"name": "Petty Funds"})
+        self.assertEqual(
+            self.account_store.search_accounts("Petty")[0]["name"], "Petty Funds"
+        )
+        self.assertEqual(self.account_store.search_accounts('"Cash" Acc'), [])
+
     def test_search_accounts_no_matches(self):
         """Test searching accounts with no matches."""
         # Create accounts
@@ -416,6 +469,56 @@ class TestAccountStore(unittest.TestCase):
         # Verify account is deleted
         self.assertIsNone(self.account_store.get_account_by_id(account_id))
 
+    def test_lookup_cache_invalidation(self):
+        """Test that cached lookups and count follow writes through the store."""
+        account_data = self.sample_accounts[4]
+        key = (
+            account_data["name"],
+            account_data["category_path"],
+            account_data["type"],
+            None,
+        )
+
+        # Misses are cached too and must not hide a new account
+        self.assertIsNone(self.account_store.get_account_by_composite_key(*key))
+        self.assertEqual(self.account_store.get_accounts_count(), 0)
+        account_id = self.account_store.create_account(account_data)
+        self.assertEqual(
+            self.account_store.get_account_by_composite_key(*key)["account_id"],
+            account_id,
+        )
+        self.assertEqual(self.account_store.get_accounts_count(), 1)
+
+        # Returned dicts are copies of the cached entry
+        self.account_store.get_account_by_id(account_id)["name"] = "Mutated"
+        self.assertEqual(
+            self.account_store.get_account_by_id(account_id)["name"],
+            account_data["name"],
+        )
+
+        self.account_store.update_account(account_id, {"name": "Renamed"})
+        self.assertEqual(
+            self.account_store.get_account_by_id(account_id)["name"], "Renamed"
+        )
+        self.assertIsNone(self.account_store.get_account_by_name(account_data["name"]))
+
+        self.account_store.delete_account(account_id)
+        self.assertIsNone(self.account_store.get_account_by_name("Renamed"))
+        self.assertEqual(self.account_store.get_accounts_count(), 0)
+
+    def test_lookup_cache_skipped_in_transaction(self):
+        """Test that uncommitted accounts are never cached."""
+        account_data = self.sample_accounts[0]
+        [account_id] = self.account_store.create_accounts_bulk(
+            [account_data], commit=False
+        )
+        self.assertIsNotNone(self.account_store.get_account_by_id(account_id))
+        self.assertEqual(self.account_store.get_accounts_count(), 1)
+
+        self.account_store.get_connection().rollback()
+        self.assertIsNone(self.account_store.get_account_by_id(account_id))
+        self.assertEqual(self.account_store.get_accounts_count(), 0)
+
     def test_delete_account_nonexistent(self):
         """Test deleting non-existent account."""
         success = self.account_store.delete_account(99999)
@@ -0,0 +1,218 @@
+"""
+Test suite for Chat Store functionality.
+
+Standalone stores use a temporary SQLite file; the manager-provided store is
+checked on the shared in-memory test database.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+
+# Add project root directory to Python path for imports
+project_root = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, project_root)
+
+from src.models.chat_message import ChatMessage as ModelChatMessage
+from src.models.chat_session import ChatSession as ModelChatSession
+from src.stores.chat_store import (
+    _SQL_SELECT_MESSAGES_DESC,
+    _SQL_SELECT_SUMMARIES,
+    ChatMessage,
+    ChatStore,
+)
+from src.stores.database_manager import get_chat_store, reset_database_manager
+
+
+class TestChatStore(unittest.TestCase):
+    """Test case for Chat Store message operations"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.chat_store = ChatStore(os.path.join(self.temp_dir.name, "chat.db"))
+        self.chat_store.create_chat_session("chat_a", "user1")
+        self.chat_store.create_chat_session("chat_b", "user1")
+
+    def tearDown(self):
+        self.chat_store.close()
+        self.temp_dir.cleanup()
+
+    def test_add_messages(self):
+        """Test batch insertion returns IDs in order and stores every field"""
+        messages = [
+            ChatMessage(chat_id="chat_a", message_type="user", content="q1"),
+            ChatMessage(
+                chat_id="chat_a",
+                message_type="assistant",
+                content="a1",
+                data_points=[{"value": 1}],
+                token_count=3,
+            ),
+            ChatMessage(chat_id="chat_b", message_type="user", content="q2"),
+        ]
+
+        first_batch = self.chat_store.add_messages(messages)
+        second_id = self.chat_store.add_message(
+            ChatMessage(chat_id="chat_b", message_type="assistant", content="a2")
+        )
+
+        self.assertEqual(len(first_batch), 3)
+        self.assertEqual(first_batch, sorted(first_batch))
+        self.assertEqual(second_id, first_batch[-1] + 1)
+        self.assertEqual(self.chat_store.add_messages([]), [])
+
+        stored = {
+            message.id: message
+            for message in self.chat_store.get_messages("chat_a", limit=10)
+        }
+        self.assertEqual(set(stored), set(first_batch[:2]))
+        self.assertEqual(stored[first_batch[1]].data_points, [{"value": 1}])
+        self.assertEqual(stored[first_batch[1]].token_count, 3)
+        self.assertEqual(
+            self.chat_store.get_chat_statistics("chat_b")["message_count"], 2
+        )
+
+    def test_get_conversation_summaries(self):
+        """Test that only non-empty summaries are returned"""
+        self.chat_store.add_messages(
+            [
+                ChatMessage(chat_id="chat_a", message_type="user", summary="s1"),
+                ChatMessage(chat_id="chat_a", message_type="user", summary=""),
+                ChatMessage(chat_id="chat_a", message_type="assistant"),
+            ]
+        )
+
+        self.assertEqual(self.chat_store.get_conversation_summaries("chat_a"), ["s1"])
+
+    def test_get_messages_with_token_limit(self):
+        """Test that the newest messages within the budget come back oldest first"""
+        self.chat_store.add_messages(
+            [
+                ChatMessage(
+                    chat_id="chat_a",
+                    message_type="user",
+                    content=f"m{i}".ljust(40),  # 10 estimated tokens each
+                )
+                for i in range(5)
+            ]
+        )
+
+        def contents(**kwargs):
+            messages = self.chat_store.get_messages_with_token_limit("chat_a", **kwargs)
+            return [message.content.strip() for message in messages]
+
+        self.assertEqual(contents(max_tokens=25), ["m3", "m4"])
+        self.assertEqual(contents(max_tokens=30), ["m2", "m3", "m4"])
+        self.assertEqual(contents(max_tokens=1000, limit=2), ["m3", "m4"])
+        self.assertEqual(contents(max_tokens=5), [])
+
+    def test_get_chat_statistics(self):
+        """Test message and token totals with and without a session row"""
+        self.chat_store.add_messages(
+            [
+                ChatMessage(chat_id="chat_a", message_type="user", token_count=4),
+                ChatMessage(chat_id="chat_a", message_type="assistant", token_count=6),
+                ChatMessage(chat_id="chat_orphan", message_type="user", token_count=2),
+            ]
+        )
+
+        stats = self.chat_store.get_chat_statistics("chat_a")
+        self.assertEqual((stats["message_count"], stats["total_tokens"]), (2, 10))
+        self.assertIsNotNone(stats["created_at"])
+
+        empty = self.chat_store.get_chat_statistics("chat_b")
+        self.assertEqual((empty["message_count"], empty["total_tokens"]), (0, 0))
+        self.assertIsNotNone(empty["last_activity"])
+
+        orphan = self.chat_store.get_chat_statistics("chat_orphan")
+        self.assertEqual((orphan["message_count"], orphan["total_tokens"]), (1, 2))
+        self.assertIsNone(orphan["created_at"])
+
+    def test_create_existing_chat_session(self):
+        """Test that re-creating a session keeps its row, summary and messages"""
+        self.chat_store.update_context_summary("chat_a", "earlier context")
+        self.chat_store.add_message(
+            ChatMessage(chat_id="chat_a", message_type="user", content="q1")
+        )
+        created_at = self.chat_store.get_chat_session("chat_a").created_at
+
+        self.chat_store.create_chat_session("chat_a", "user2")
+
+        session = self.chat_store.get_chat_session("chat_a")
+        self.assertEqual(session.created_at, created_at)
+        self.assertEqual(session.user_id, "user1")
+        self.assertEqual(session.context_summary, "earlier context")
+        self.assertEqual(len(self.chat_store.get_messages("chat_a")), 1)
+
+    def test_to_dict_reflects_updated_timestamps(self):
+        """Test that to_dict formats the current datetimes, not construction-time ones"""
+        session = ModelChatSession(chat_id="chat_a", created_at=datetime(2024, 1, 1))
+        session.last_activity = datetime(2024, 1, 2, 3, 4, 5)
+        self.assertEqual(session.to_dict()["last_activity"], "2024-01-02T03:04:05")
+
+        message = ModelChatMessage(chat_id="chat_a", message_type="user")
+        self.assertIsNone(message.to_dict()["timestamp"])
+        message.timestamp = datetime(2024, 1, 2)
+        self.assertEqual(message.to_dict()["timestamp"], "2024-01-02T00:00:00")
+
+    def test_message_queries_use_indexes(self):
+        """Test that history and summary queries are served by the chat indexes"""
+        connection = self.chat_store._get_connection()
+        plans = {
+            name: " ".join(
+                row[-1]
+                for row in connection.execute(f"EXPLAIN QUERY PLAN {sql}", ("a", 5))
+            )
+            for name, sql in (
+                ("history", _SQL_SELECT_MESSAGES_DESC),
+                ("summaries", _SQL_SELECT_SUMMARIES),
+            )
+        }
+        self.assertIn("idx_message_chat_timestamp", plans["history"])
+        self.assertIn("idx_message_chat_summary", plans["summaries"])
+        self.assertNotIn("TEMP B-TREE", " ".join(plans.values()))
+
+    def test_file_connection_uses_wal(self):
+        """Test that the store's file connection runs in WAL with NORMAL sync"""
+        connection = self.chat_store._get_connection()
+        self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        # 1 = NORMAL
+        self.assertEqual(connection.execute("PRAGMA synchronous").fetchone()[0], 1)
+
+    def test_connection_is_reused(self):
+        """Test that the store keeps one connection across calls"""
+        connection = self.chat_store._get_connection()
+        self.chat_store.add_message(
+            ChatMessage(chat_id="chat_a", message_type="user", content="q1")
+        )
+        self.chat_store.get_messages("chat_a")
+        self.assertIs(self.chat_store._get_connection(), connection)
+
+
+class TestManagedChatStore(unittest.TestCase):
+    """Test case for the chat store provided by the database manager"""
+
+    def setUp(self):
+        os.environ["ENVIRONMENT"] = "TEST"
+        reset_database_manager()
+        self.chat_store = get_chat_store()
+
+    def tearDown(self):
+        reset_database_manager()
+
+    def test_in_memory_round_trip(self):
+        """Test that messages persist on the manager's shared in-memory connection"""
+        self.chat_store.create_chat_session("chat_mem", "user1")
+        message_id = self.chat_store.add_message(
+            ChatMessage(chat_id="chat_mem", message_type="user", content="hello")
+        )
+
+        messages = self.chat_store.get_messages("chat_mem")
+        self.assertEqual([message.id for message in messages], [message_id])
+        self.assertIsNotNone(self.chat_store.get_chat_session("chat_mem"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Test suite for CSV output of the JSON to Excel converters.
+
+A small Rootfi report is converted with output_format="csv" and the resulting
+per-sheet CSV file is read back with the csv module.
+"""
+
+import csv
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# Add project root directory to Python path for imports
+project_root = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, project_root)
+
+from src.parsers import JsonToExcelConverterRootfi
+
+
+class TestCsvOutput(unittest.TestCase):
+    """CSV output tests for the converters"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.temp_dir.name, "report.json")
+        report = {
+            "data": {
+                "Columns": {
+                    "Column": [
+                        {"ColTitle": "Account"},
+                        {"ColTitle": "Jan 2024"},
+                        {"ColTitle": "Feb 2024"},
+                        {"ColTitle": "Total"},
+                    ]
+                },
+                "Rows": {
+                    "Row": [
+                        {
+                            "group": "Income",
+                            "ColData": [
+                                {"value": "Income"},
+                                {"value": "10.5"},
+                                {"value": ""},
+                                {"value": "12"},
+                            ],
+                        }
+                    ]
+                },
+            }
+        }
+        with open(self.input_path, "w") as f:
+            json.dump(report, f)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_convert_to_csv_directory(self):
+        """Test that each sheet becomes a CSV file in the output directory"""
+        output_dir = os.path.join(self.temp_dir.name, "out")
+        result = JsonToExcelConverterRootfi().convert(
+            self.input_path, output_dir, output_format="csv"
+        )
+
+        self.assertEqual(result, output_dir)
+        self.assertEqual(os.listdir(output_dir), ["Rootfi Report.csv"])
+        with open(
+            os.path.join(output_dir, "Rootfi Report.csv"), newline="", encoding="utf-8"
+        ) as f:
+            rows = list(csv.reader(f))
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0][:2], ["name", "category_path"])
+        self.assertEqual(rows[0][-2:], ["Computed Total", "Difference"])
+        self.assertEqual(rows[1][:2], ["Income", "revenue > Income"])
+        self.assertEqual(rows[1][-6:], ["Income", "10.5", "", "12.0", "10.5", "1.5"])
+
+    def test_unknown_format_is_rejected(self):
+        """Test that an unsupported output format raises ValueError"""
+        with self.assertRaises(ValueError):
+            JsonToExcelConverterRootfi().convert(
+                self.input_path, os.path.join(self.temp_dir.name, "out"), "json"
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,7 +8,10 @@ and that period-specific data can be queried accurately.
 """
 
 import os
+import sqlite3
 import sys
+import tempfile
+import threading
 import unittest
 
 # Add project root directory to Python path for imports
@@ -18,7 +21,19 @@ sys.path.insert(0, project_root)
 # Set environment to TEST for in-memory SQLite database
 os.environ["ENVIRONMENT"] = "TEST"
 
-from src.parsers.excel_to_database_importers import import_excel_to_database
+from src.handler.financial_handler import FinancialDataHandler
+from openpyxl import Workbook
+
+from src.parsers.excel_to_database_importers import (
+    AccountManager,
+    PLExcelImporter,
+    RootfiExcelImporter,
+    _detect_importer,
+    import_excel_to_database,
+)
+from src.stores.account_store import SQLiteAccountStore
+from src.stores.database_schema import DatabaseSchema
+from src.stores.transaction_store import SQLiteTransactionStore
 from src.stores.database_manager import (
     reset_database_manager,
     get_account_store,
@@ -334,6 +349,200 @@ class TestDataIntegration(unittest.TestCase):
             msg=f"Expected May 2022 revenue {expected_may_2022}, got {may_2022_revenue}",
         )
 
+    def test_aggregate_rollup_matches_database(self):
+        """
+        Test a coarser aggregate served from a cached finer result.
+
+        The handler rolls the cached per-(account_type, period_start) groups up
+        to account_type and must return the same groups as the database.
+        """
+        import_excel_to_database(self.test_excel_file)
+        handler = FinancialDataHandler()
+        aggregates = [
+            {"function": "SUM", "field": "value", "alias": "total_value"},
+            {"function": "COUNT", "field": "tx_id", "alias": "transaction_count"},
+            {"function": "MIN", "field": "value", "alias": "min_value"},
+        ]
+
+        fine = handler.query_transactions_aggregate(
+            group_by=["account_type", "period_start"],
+            aggregates=aggregates,
+            limit=1000,
+        )
+        self.assertFalse(fine["has_more"])
+
+        rolled_up = handler.query_transactions_aggregate(
+            group_by=["account_type"], aggregates=aggregates, limit=100
+        )
+        expected = self.transaction_store.query_transactions_aggregate(
+            group_by=["account_type"], aggregates=aggregates, limit=100
+        )
+
+        self.assertEqual(rolled_up["total_groups"], expected["total_groups"])
+        self.assertEqual(len(rolled_up["groups"]), len(expected["groups"]))
+        for group, expected_group in zip(rolled_up["groups"], expected["groups"]):
+            self.assertEqual(group["account_type"], expected_group["account_type"])
+            self.assertAlmostEqual(
+                group["total_value"], expected_group["total_value"], places=2
+            )
+            self.assertEqual(
+                group["transaction_count"], expected_group["transaction_count"]
+            )
+            self.assertEqual(group["min_value"], expected_group["min_value"])
+
+        # The coarser result reports the finer query it was derived from
+        self.assertEqual(rolled_up["query_executed"], fine["query_executed"])
+
+    def test_grouped_metrics_group_fields(self):
+        """
+        Test grouped metrics for every allowed group field.
+        """
+        import_excel_to_database(self.test_excel_file)
+        handler = FinancialDataHandler()
+
+        for group_by in ("account_name", "account_type", "period_start", "period_end"):
+            groups = handler.get_grouped_metrics(group_by, limit=None)
+            self.assertTrue(groups)
+            self.assertEqual(
+                sum(group.record_count for group in groups),
+                self.transaction_store.get_transactions_count(),
+            )
+
+        with self.assertRaises(ValueError):
+            handler.get_grouped_metrics("parent_account_id")
+
+    def test_cached_results_are_not_shared(self):
+        """
+        Test that mutating a returned result does not alter the cached one.
+        """
+        import_excel_to_database(self.test_excel_file)
+        handler = FinancialDataHandler()
+
+        summary = handler.get_enhanced_financial_summary(
+            "2022-08-01", "2022-08-31", group_by="account_type"
+        )
+        summary["summary_stats"]["total_revenue"] = -1
+        next(iter(summary["grouped_data"].values())).clear()
+        again = handler.get_enhanced_financial_summary(
+            "2022-08-01", "2022-08-31", group_by="account_type"
+        )
+        self.assertNotEqual(again["summary_stats"]["total_revenue"], -1)
+        self.assertTrue(all(again["grouped_data"].values()))
+
+        aggregate = handler.query_transactions_aggregate(
+            group_by=["account_type"], limit=100
+        )
+        total_groups = len(aggregate["groups"])
+        aggregate["groups"][0]["account_type"] = "mutated"
+        aggregate["groups"].clear()
+        again = handler.query_transactions_aggregate(
+            group_by=["account_type"], limit=100
+        )
+        self.assertEqual(len(again["groups"]), total_groups)
+        self.assertNotEqual(again["groups"][0]["account_type"], "mutated")
+
+
+class TestImporterDetection(unittest.TestCase):
+    """Test case for content-based importer detection"""
+
+    def _workbook(self, sheet_name, header):
+        workbook = Workbook()
+        workbook.active.title = sheet_name
+        workbook.active.append(header)
+        return workbook
+
+    def test_period_sheet_needs_account_id_header(self):
+        """Test that a ' to ' sheet is Rootfi only when its header has account_id"""
+        rootfi = self._workbook("2022-01-01 to 2022-01-31", ["account_id", "value"])
+        self.assertIsInstance(_detect_importer(rootfi), RootfiExcelImporter)
+
+        pl = self._workbook("Jan to Mar", ["name", "value"])
+        self.assertIsInstance(_detect_importer(pl), PLExcelImporter)
+
+
+class TestImportSession(unittest.TestCase):
+    """Test case for the import session's connection settings and commits"""
+
+    def setUp(self):
+        reset_database_manager()
+
+    def tearDown(self):
+        reset_database_manager()
+
+    def _file_db_managers(self, count):
+        """AccountManagers sharing stores on a file database, one connection per thread"""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        path = os.path.join(temp_dir.name, "financial.db")
+        local = threading.local()
+        connections = []
+
+        def connect():
+            if not hasattr(local, "connection"):
+                local.connection = sqlite3.connect(path, check_same_thread=False)
+                local.connection.row_factory = sqlite3.Row
+                connections.append(local.connection)
+            return local.connection
+
+        def close_connections():
+            for connection in connections:
+                connection.close()
+
+        self.addCleanup(close_connections)
+        DatabaseSchema.initialize_schema(connect().cursor(), connect().commit)
+        account_store = SQLiteAccountStore(connect)
+        transaction_store = SQLiteTransactionStore(connect)
+
+        managers = []
+        for _ in range(count):
+            manager = AccountManager()
+            manager.account_store = account_store
+            manager.transaction_store = transaction_store
+            managers.append(manager)
+        return managers
+
+    def test_concurrent_imports_create_an_account_once(self):
+        """
+        Test that an account looked up while another import's session has
+        inserted but not committed it is not created a second time
+        """
+        first, second = self._file_db_managers(2)
+        key = ("Revenue", "Income > Revenue", "Revenue", 1, None, False, False, "")
+
+        def in_thread(function):
+            thread = threading.Thread(target=function)
+            thread.start()
+            thread.join()
+
+        first.get_or_create_account(*key)
+        with first.import_session():
+            first.flush_transactions()
+            # Runs on its own connection, which cannot see the uncommitted row
+            in_thread(lambda: second.get_or_create_account(*key))
+
+        def second_import():
+            with second.import_session():
+                second.flush_transactions()
+
+        in_thread(second_import)
+
+        keys = [row[:4] for row in first.account_store.get_account_composite_keys()]
+        self.assertEqual(keys, [("Revenue", "Income > Revenue", 1, None)])
+        # The lookup that missed during the session was not left cached
+        self.assertIsNotNone(
+            first.account_store.get_account_by_composite_key(
+                "Revenue", "Income > Revenue", 1, None
+            )
+        )
+
+    def test_session_waits_for_the_write_lock(self):
+        """Test that the session raises the busy timeout above the 5 s default"""
+        manager = AccountManager()
+        connection = manager.transaction_store.get_connection()
+        with manager.import_session():
+            busy_timeout = connection.execute("PRAGMA busy_timeout").fetchone()[0]
+        self.assertEqual(busy_timeout, 120000)
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
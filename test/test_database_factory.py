@@ -157,6 +157,39 @@ class TestDatabaseManager(unittest.TestCase):
         count = manager.get_transactions_count()
         self.assertEqual(count, 0)
 
+    def test_data_version_changes_on_clear(self):
+        """Test that clearing data bumps the data version."""
+        manager = get_database_manager()
+
+        version = manager.get_data_version()
+        manager.clear_data()
+
+        self.assertGreater(manager.get_data_version(), version)
+
+    def test_data_version_changes_on_store_writes(self):
+        """Test that writes through the stores bump the data version."""
+        manager = get_database_manager()
+        account_id = manager.account_store.create_account(
+            {"name": "Cash", "category_path": "Assets", "type": 1}
+        )
+
+        version = manager.get_data_version()
+        manager.store_metrics(
+            [
+                {
+                    "account_id": account_id,
+                    "period_start": "2024-01-01",
+                    "period_end": "2024-01-31",
+                    "value": 10.0,
+                }
+            ]
+        )
+        after_insert = manager.get_data_version()
+        self.assertGreater(after_insert, version)
+
+        manager.transaction_store.clear_all_transactions()
+        self.assertGreater(manager.get_data_version(), after_insert)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,124 @@
+"""
+Test suite for the streaming xlsx writer used by the JSON to Excel converters.
+
+Workbooks are written to a temporary directory and read back with openpyxl to
+check that sheets, cell types and escaping survive the round trip.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+# Add project root directory to Python path for imports
+project_root = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, project_root)
+
+from openpyxl import load_workbook
+
+from src.parsers.fast_xlsx_writer import FastXlsxWorkbook
+
+
+class TestFastXlsxWriter(unittest.TestCase):
+    """Round-trip tests for FastXlsxWorkbook"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_path = os.path.join(self.temp_dir.name, "output.xlsx")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _read_back(self):
+        workbook = load_workbook(self.output_path, read_only=True)
+        try:
+            return {
+                sheet.title: [list(row) for row in sheet.iter_rows(values_only=True)]
+                for sheet in workbook.worksheets
+            }
+        finally:
+            workbook.close()
+
+    def test_round_trip_values(self):
+        """Test that every supported cell type reads back unchanged"""
+        workbook = FastXlsxWorkbook(self.output_path)
+        sheet = workbook.create_sheet("2025-01-01 to 2025-01-31")
+        sheet.append(["name", "value", "is_summary", "note"])
+        sheet.append(["R&D <costs>", 1234.5, None, True])
+        sheet.append([" padded ", -3, False, 'say "hi"'])
+        workbook.save(self.output_path)
+
+        sheets = self._read_back()
+        self.assertEqual(list(sheets), ["2025-01-01 to 2025-01-31"])
+        self.assertEqual(
+            sheets["2025-01-01 to 2025-01-31"],
+            [
+                ["name", "value", "is_summary", "note"],
+                ["R&D <costs>", 1234.5, None, True],
+                [" padded ", -3, False, 'say "hi"'],
+            ],
+        )
+
+    def test_sheets_are_written_in_order(self):
+        """Test that creating a sheet finishes the previous one"""
+        workbook = FastXlsxWorkbook(self.output_path)
+        first = workbook.create_sheet("First")
+        first.append(["a"])
+        workbook.create_sheet("Second").append(["b"])
+        workbook.save(self.output_path)
+
+        self.assertEqual(self._read_back(), {"First": [["a"]], "Second": [["b"]]})
+        with self.assertRaises(ValueError):
+            first.append(["late"])
+
+    def test_invalid_input_is_rejected(self):
+        """Test that invalid titles, control characters and types raise"""
+        workbook = FastXlsxWorkbook(self.output_path)
+        with self.assertRaises(ValueError):
+            workbook.create_sheet("Bad/Title")
+        sheet = workbook.create_sheet("Sheet")
+        with self.assertRaises(ValueError):
+            workbook.create_sheet("Sheet")
+        with self.assertRaises(ValueError):
+            sheet.append(["bell\x07"])
+        with self.assertRaises(TypeError):
+            sheet.append([object()])
+        with self.assertRaises(ValueError):
+            workbook.save(self.output_path + ".other")
+        workbook.save(self.output_path)
+
+    def test_non_finite_floats_are_rejected(self):
+        """Test that nan and inf raise instead of producing invalid XML"""
+        workbook = FastXlsxWorkbook(self.output_path)
+        sheet = workbook.create_sheet("Sheet")
+        for value in (float("nan"), float("inf"), float("-inf")):
+            with self.assertRaises(ValueError):
+                sheet.append([value])
+        workbook.discard()
+
+    def test_failed_write_leaves_no_partial_file(self):
+        """Test that an abandoned workbook removes its temporary file"""
+        with self.assertRaises(RuntimeError):
+            with FastXlsxWorkbook(self.output_path) as workbook:
+                workbook.create_sheet("Sheet").append(["a"])
+                raise RuntimeError("conversion failed")
+
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+    def test_save_replaces_existing_output(self):
+        """Test that the output is replaced only once save() succeeds"""
+        with open(self.output_path, "wb") as f:
+            f.write(b"previous")
+
+        with FastXlsxWorkbook(self.output_path) as workbook:
+            workbook.create_sheet("Sheet").append(["a"])
+            with open(self.output_path, "rb") as f:
+                self.assertEqual(f.read(), b"previous")
+            workbook.save(self.output_path)
+
+        self.assertEqual(self._read_back(), {"Sheet": [["a"]]})
+        self.assertEqual(os.listdir(self.temp_dir.name), ["output.xlsx"])
+
+
+if __name__ == "__main__":
+    unittest.main()
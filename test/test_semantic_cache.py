@@ -0,0 +1,189 @@
+"""
+Test suite for the semantic response cache.
+
+This module tests SemanticCache lookups, partitioning and TTL eviction
+using a deterministic fake embedding function instead of Azure OpenAI.
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add project root directory to Python path for imports
+project_root = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, project_root)
+
+# Set environment to TEST for in-memory SQLite database
+os.environ["ENVIRONMENT"] = "TEST"
+
+from src.handler.ai.semantic_cache import SemanticCache
+from src.handler.ai_handler import AIServiceHandler
+from src.models.financial_models import QueryResponse
+from src.stores.chat_store import ChatMessage
+from src.stores.database_manager import reset_database_manager
+
+
+def fake_embed(text):
+    """Embed text as letter counts so near-identical strings are highly similar"""
+    vector = [0.0] * 26
+    for char in text:
+        if "a" <= char <= "z":
+            vector[ord(char) - ord("a")] += 1.0
+    return vector
+
+
+class TestSemanticCache(unittest.TestCase):
+    """
+    Test case for SemanticCache operations.
+
+    This test verifies:
+    - Hits for identical and normalized queries
+    - Misses below the similarity threshold
+    - Partition isolation between users
+    - TTL and size-based eviction
+    """
+
+    def setUp(self):
+        """Create a cache with the fake embedding function"""
+        self.cache = SemanticCache(fake_embed, similarity_threshold=0.95)
+
+    def test_hit_for_normalized_query(self):
+        """Test that case and whitespace differences still hit"""
+        self.cache.store("What was revenue in 2022?", "answer", partition_key="u1")
+
+        self.assertEqual(
+            self.cache.lookup("  what was   REVENUE in 2022? ", partition_key="u1"),
+            "answer",
+        )
+
+    def test_miss_for_different_query(self):
+        """Test that unrelated queries do not hit"""
+        self.cache.store("What was revenue in 2022?", "answer", partition_key="u1")
+
+        self.assertIsNone(
+            self.cache.lookup("List all expense accounts", partition_key="u1")
+        )
+
+    def test_partitions_are_isolated(self):
+        """Test that entries are only returned within their partition"""
+        self.cache.store("What was revenue in 2022?", "answer", partition_key="u1")
+
+        self.assertIsNone(
+            self.cache.lookup("What was revenue in 2022?", partition_key="u2")
+        )
+
+    def test_expired_entries_are_evicted(self):
+        """Test that entries older than the TTL are not returned"""
+        cache = SemanticCache(fake_embed, ttl_seconds=60)
+        with patch("src.handler.ai.semantic_cache.time.monotonic", return_value=0):
+            cache.store("What was revenue in 2022?", "answer")
+        with patch("src.handler.ai.semantic_cache.time.monotonic", return_value=61):
+            self.assertIsNone(cache.lookup("What was revenue in 2022?"))
+
+    def test_max_entries_drops_oldest(self):
+        """Test that the oldest entry is dropped when a partition is full"""
+        cache = SemanticCache(fake_embed, max_entries_per_partition=1)
+        cache.store("What was revenue in 2022?", "first")
+        cache.store("List all expense accounts", "second")
+
+        self.assertIsNone(cache.lookup("What was revenue in 2022?"))
+        self.assertEqual(cache.lookup("List all expense accounts"), "second")
+
+    def test_embedding_failure_is_a_miss(self):
+        """Test that embedding errors do not propagate"""
+
+        def failing_embed(text):
+            raise RuntimeError("embedding service down")
+
+        cache = SemanticCache(failing_embed)
+        cache.store("What was revenue in 2022?", "answer")
+
+        self.assertIsNone(cache.lookup("What was revenue in 2022?"))
+
+
+class TestAIHandlerSemanticCache(unittest.TestCase):
+    """
+    Test case for the semantic cache in front of AIServiceHandler.
+
+    The AI query service is mocked; only the handler's cache flow runs.
+    """
+
+    def setUp(self):
+        """Create a handler with a counting fake embedding and a mocked AI service"""
+        reset_database_manager()
+        self.embed_calls = 0
+
+        def counting_embed(text):
+            self.embed_calls += 1
+            return fake_embed(text)
+
+        self.handler = AIServiceHandler()
+        self.handler._semantic_cache = SemanticCache(counting_embed)
+        self.handler._semantic_cache_initialized = True
+
+        self.service = MagicMock()
+        self.service.process_natural_language_query.side_effect = (
+            lambda query, chat_id=None, user_id=None: QueryResponse(
+                query=query, answer="42", confidence=0.9, chat_id=chat_id or "new_chat"
+            )
+        )
+        self.service.get_saved_turn.return_value = ChatMessage(
+            message_type="assistant", content="42", query_intent="revenue", summary="s"
+        )
+        self.service.record_turn.side_effect = (
+            lambda *args, chat_id=None, **kwargs: chat_id or "recorded_chat"
+        )
+        self.handler._ai_query_service = self.service
+
+    def tearDown(self):
+        reset_database_manager()
+
+    def test_miss_embeds_once_and_hit_is_recorded(self):
+        """Test that a miss embeds once and a hit is saved to the caller's chat"""
+        self.handler.process_query("What was revenue?", chat_id="c1", user_id="u1")
+        self.assertEqual(self.embed_calls, 1)
+
+        hit = self.handler.process_query(
+            "what was REVENUE?", chat_id="c1", user_id="u1"
+        )
+
+        self.assertEqual(self.service.process_natural_language_query.call_count, 1)
+        self.assertEqual((hit.answer, hit.chat_id), ("42", "c1"))
+        self.service.record_turn.assert_called_once_with(
+            "what was REVENUE?",
+            "42",
+            None,
+            intent="revenue",
+            summary="s",
+            chat_id="c1",
+            user_id="u1",
+        )
+
+    def test_hit_uses_caller_chat_id_only(self):
+        """Test that a hit without a chat_id gets its own session, not the cached one"""
+        self.handler.process_query("What was revenue?", user_id="u1")
+        hit = self.handler.process_query("What was revenue?", user_id="u1")
+
+        self.assertEqual(self.service.process_natural_language_query.call_count, 1)
+        self.assertEqual(hit.chat_id, "recorded_chat")
+
+    def test_anonymous_queries_are_not_cached(self):
+        """Test that calls without user or chat never share answers"""
+        self.handler.process_query("What was revenue?")
+        self.handler.process_query("What was revenue?")
+
+        self.assertEqual(self.service.process_natural_language_query.call_count, 2)
+        self.assertEqual(self.embed_calls, 0)
+
+    def test_data_change_invalidates_answers(self):
+        """Test that answers cached before a data change are not returned after it"""
+        self.handler.process_query("What was revenue?", chat_id="c1", user_id="u1")
+        self.handler.financial_service.db.bump_data_version()
+        self.handler.process_query("What was revenue?", chat_id="c1", user_id="u1")
+
+        self.assertEqual(self.service.process_natural_language_query.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -247,6 +247,31 @@ class TestTransactionStore(unittest.TestCase):
         self.assertIsNotNone(created_transaction)
         self.assertIsNone(created_transaction["derived_sub_type"])
 
+    def test_create_transactions_bulk(self):
+        """Test bulk insert stores every transaction."""
+        created = self.transaction_store.create_transactions_bulk(
+            self.sample_transactions
+        )
+
+        self.assertEqual(created, len(self.sample_transactions))
+        self.assertEqual(
+            self.transaction_store.get_transactions_count(),
+            len(self.sample_transactions),
+        )
+        self.assertEqual(self.transaction_store.create_transactions_bulk([]), 0)
+
+    def test_create_transactions_bulk_without_commit(self):
+        """Test bulk insert with commit=False leaves the rows to the caller."""
+        connection = self.transaction_store.get_connection()
+
+        self.transaction_store.create_transactions_bulk(
+            self.sample_transactions, commit=False
+        )
+        self.assertTrue(connection.in_transaction)
+        connection.rollback()
+
+        self.assertEqual(self.transaction_store.get_transactions_count(), 0)
+
     def test_get_transaction_by_id_existing(self):
         """Test retrieving existing transaction by ID."""
         transaction_data = self.sample_transactions[0]
@@ -418,6 +443,52 @@ class TestTransactionStore(unittest.TestCase):
             self.assertIn("total_value", group)
             self.assertIn("transaction_count", group)
 
+    def test_get_metrics_summary(self):
+        """Test grouped metrics are aggregated in SQL, one row per group."""
+        for transaction_data in self.sample_transactions:
+            self.transaction_store.create_transaction(transaction_data)
+
+        groups = self.transaction_store.get_metrics_summary("account_type")
+
+        self.assertEqual([g["account_type"] for g in groups], [1, 2, 4])
+        self.assertAlmostEqual(groups[0]["total_value"], 3001.25)
+        self.assertEqual(groups[0]["record_count"], 3)
+
+        # Aggregation function, filters and limit are applied by the query
+        groups = self.transaction_store.get_metrics_summary(
+            "period_start",
+            filters=[{"field": "account_type", "operator": "=", "value": 1}],
+            aggregation="MAX",
+            limit=1,
+        )
+
+        self.assertEqual(len(groups), 1)
+        self.assertEqual(groups[0]["period_start"], "2022-01-01")
+        self.assertAlmostEqual(groups[0]["total_value"], 2500.75)
+        self.assertEqual(groups[0]["record_count"], 2)
+
+    def test_get_metrics_summary_group_fields(self):
+        """Test every supported group field and rejection of any other."""
+        for transaction_data in self.sample_transactions:
+            self.transaction_store.create_transaction(transaction_data)
+
+        for group_by in ("account_name", "account_type", "period_start", "period_end"):
+            groups = self.transaction_store.get_metrics_summary(group_by)
+            self.assertTrue(groups)
+            self.assertEqual(
+                sum(group["record_count"] for group in groups),
+                len(self.sample_transactions),
+            )
+            self.assertTrue(all(group[group_by] is not None for group in groups))
+
+        for group_by in ("parent_account_id", "a.name; DROP TABLE accounts"):
+            with self.assertRaises(ValueError):
+                self.transaction_store.get_metrics_summary(group_by)
+        with self.assertRaises(ValueError):
+            self.transaction_store.get_metrics_summary(
+                "account_type", aggregation="TOTAL"
+            )
+
     def test_get_transactions_by_account(self):
         """Test getting transactions for a specific account."""
         # Create transactions for different accounts
@@ -447,6 +518,24 @@ class TestTransactionStore(unittest.TestCase):
             self.assertGreaterEqual(transaction["period_start"], "2022-02-01")
             self.assertLessEqual(transaction["period_end"], "2022-02-28")
 
+    def test_iter_transactions_by_period(self):
+        """Test streaming transactions matches the list-returning query."""
+        for transaction_data in self.sample_transactions:
+            self.transaction_store.create_transaction(transaction_data)
+
+        streamed = list(
+            self.transaction_store.iter_transactions_by_period(
+                "2022-02-01", "2022-02-28"
+            )
+        )
+
+        self.assertEqual(
+            streamed,
+            self.transaction_store.get_transactions_by_period(
+                "2022-02-01", "2022-02-28"
+            ),
+        )
+
     def test_update_transaction_success(self):
         """Test successful transaction update."""
         # Create transaction